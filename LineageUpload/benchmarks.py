@@ -0,0 +1,281 @@
+"""Python Script to Benchmark the Lineage Upload Script."""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def import_time(module: str, budget_ms: float) -> bool:
+    """Measure the import time of a module in a fresh interpreter with python -X importtime.
+
+    Args:
+        module (str): Name of the module to be imported.
+        budget_ms (float): Maximum cumulative import time in milliseconds.
+
+    Returns:
+        bool: True if the import time is within the budget.
+
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             capture_output=True, text=True, check=True)
+
+    # import time: self [us] | cumulative | imported package (indented when nested)
+    imports = [(int(match.group(2)), match.group(3))
+               for match in re.finditer(r'import time:\s+(\d+) \|\s+(\d+) \|(.*)', process.stderr)]
+    total_ms = next(cumulative for cumulative, name in imports if name.strip() == module) / 1000
+
+    print(f'Import time of {module}: {total_ms:.1f} ms (budget {budget_ms:.1f} ms)')
+    for cumulative, name in sorted(imports, reverse=True)[:10]:
+        print(f'    {cumulative / 1000:8.1f} ms {name}')
+
+    heavy_modules = [name.strip() for cumulative, name in imports
+                     if name.strip() in ('pandas', 'requests', 'cryptography')]
+    if heavy_modules:
+        print(f'Heavy modules imported eagerly: {", ".join(heavy_modules)}')
+
+    return total_ms <= budget_ms and not heavy_modules
+
+
+def config_startup(targets: int, repeat: int) -> bool:
+    """Measure the time needed to parse and decrypt a configuration file with many targets.
+
+    Args:
+        targets (int): Number of [Alation:<name>] sections in the generated configuration file.
+        repeat (int): Number of repeated parses measured after the first one.
+
+    Returns:
+        bool: True if the repeated parses were served from the cache.
+
+    """
+    from src.configs import ParseConfigs
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        key_location = os.path.join(temp_dir, '.configs.key')
+        file_location = os.path.join(temp_dir, 'configs.ini')
+
+        start_time = time.perf_counter()
+        config_helper = ParseConfigs(key_location=key_location)
+        secret = config_helper.encrypt_string('secret')
+
+        with open(file_location, 'w') as config_file:
+            for target in range(targets):
+                config_file.write(f'[Alation:target_{target}]\nhost=https://target-{target}.example.com\n'
+                                  f'username={secret}\nuser_id=1\npassword={secret}\n'
+                                  f'refresh_token_name={secret}\nrefresh_token_location=token.txt\n'
+                                  f'https=True\nssl_cert=\n\n')
+            config_file.write('[Features]\ndownload_xml_request_size=500\ndownload_json_request_size=1000\n'
+                              'upload_request_size=500\njob_status_sleep=3\nlog_retention_period=5\n')
+
+        config_helper.generate_target_configs(file_location)
+        cold_ms = (time.perf_counter() - start_time) * 1000
+
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            ParseConfigs(key_location=key_location).generate_target_configs(file_location)
+        warm_ms = (time.perf_counter() - start_time) * 1000 / repeat
+
+    print(f'Configuration with {targets} targets: first parse {cold_ms:.2f} ms, '
+          f'cached parse {warm_ms:.3f} ms')
+
+    return warm_ms < cold_ms
+
+
+def synthetic_mapping_document(rows: int, tables: int = 200):
+    """Build a synthetic mapping document with repeating table names and data types.
+
+    Args:
+        rows (int): Number of mapping rows.
+        tables (int): Number of distinct target and source tables.
+
+    Returns:
+        pandas.DataFrame: Mapping document.
+
+    """
+    import pandas as pd
+
+    return pd.DataFrame({
+        'Target Database / Table Name': [f'TARGET_TABLE_{row % tables}' for row in range(rows)],
+        'Target Field Name': [f'TARGET_FIELD_{row}' for row in range(rows)],
+        'Data Type Conformity': [('VARCHAR', 'NUMBER', 'DATE')[row % 3] for row in range(rows)],
+        'Data Length': [(255, 38, 7)[row % 3] for row in range(rows)],
+        'Nullable': [('Y', 'N')[row % 2] for row in range(rows)],
+        'Object/Source Table Name': [f'SOURCE_TABLE_{row % tables}' for row in range(rows)],
+        'Source Field Name': [f'SOURCE_FIELD_{row}' for row in range(rows)],
+        'Source Data Type': [('VARCHAR2', 'NUMBER', 'TIMESTAMP')[row % 3] for row in range(rows)],
+        'Source Field Length': [(255, 38, 11)[row % 3] for row in range(rows)]})
+
+
+def vds_output(rows: int) -> bool:
+    """Compare the write and read times and file sizes of the VDS output formats.
+
+    Args:
+        rows (int): Number of mapping rows.
+
+    Returns:
+        bool: True once every format has been written and read back.
+
+    """
+    import pandas as pd
+    from src.vds_parser import VDSParser, read_vds_definitions
+
+    pd_df_mapfile_in = synthetic_mapping_document(rows)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        vds_parser = VDSParser({'features_vds_output_directory': temp_dir})
+        vds_parser.output_filename = vds_parser.output_location('parsed')
+        vds_parser.parse_and_create_target(pd_df_mapfile_in)
+        pd_df_out = pd.read_csv(vds_parser.output_filename, keep_default_na=False)
+
+        for output_format in ('csv', 'parquet', 'arrow'):
+            vds_parser = VDSParser({'features_vds_output_format': output_format,
+                                    'features_vds_output_directory': temp_dir})
+            start_time = time.perf_counter()
+            vds_parser.write_output(pd_df_out)
+            write_ms = (time.perf_counter() - start_time) * 1000
+
+            start_time = time.perf_counter()
+            table = read_vds_definitions(vds_parser.output_filename)
+            read_ms = (time.perf_counter() - start_time) * 1000
+
+            print(f'{output_format:8} write {write_ms:8.1f} ms   read {read_ms:8.1f} ms   '
+                  f'{os.path.getsize(vds_parser.output_filename):>12} bytes   {table.num_rows} rows')
+
+    return True
+
+
+def parse_scaling(rows: int, max_workers: int) -> bool:
+    """Measure the parse time of the mapping document from 1 to max_workers worker processes.
+
+    Args:
+        rows (int): Number of mapping rows.
+        max_workers (int): Largest number of worker processes.
+
+    Returns:
+        bool: True if every worker count produced the same VDS definitions and lineage as the serial parser.
+
+    """
+    import filecmp
+    from src.parallel_parser import ParallelVDSParser
+    from src.vds_parser import VDSParser
+
+    pd_df_mapfile_in = synthetic_mapping_document(rows, tables=max(rows // 100, 1))
+    worker_counts = sorted({1, max_workers} | {2 ** power for power in range(max_workers.bit_length())
+                                                if 2 ** power <= max_workers})
+    identical = True
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for workers in worker_counts:
+            configs = {'features_vds_output_directory': temp_dir}
+            vds_parser = VDSParser(configs) if workers == 1 else ParallelVDSParser(configs, workers)
+
+            start_time = time.perf_counter()
+            vds_parser.output_filename = vds_parser.output_location(f'target_{workers}')
+            vds_parser.parse_and_create_target(pd_df_mapfile_in)
+            vds_parser.output_filename = vds_parser.output_location(f'source_{workers}')
+            vds_parser.parse_and_create_source(pd_df_mapfile_in)
+            lineage_paths = sorted(map(str, vds_parser.lineage_paths(pd_df_mapfile_in)))
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+            if workers == 1:
+                serial_ms, serial_paths = elapsed_ms, lineage_paths
+            else:
+                identical &= lineage_paths == serial_paths and all(
+                    filecmp.cmp(vds_parser.output_location(f'{name}_1'),
+                                vds_parser.output_location(f'{name}_{workers}'), shallow=False)
+                    for name in ('target', 'source'))
+
+            print(f'{workers:3} workers {elapsed_ms:10.1f} ms   speed-up {serial_ms / elapsed_ms:5.2f}x')
+
+    print(f'Output identical to the serial parser: {identical}')
+
+    return identical
+
+
+def mapping_load(rows: int, extra_columns: int) -> bool:
+    """Compare loading the whole mapping document with the schema-driven loader.
+
+    Args:
+        rows (int): Number of mapping rows.
+        extra_columns (int): Number of columns not used by the script.
+
+    Returns:
+        bool: True if the schema-driven loader uses less memory.
+
+    """
+    import pandas as pd
+    from src.mapping_schema import MappingDocumentLoader
+
+    pd_df_mapfile_in = synthetic_mapping_document(rows)
+    for column in range(extra_columns):
+        pd_df_mapfile_in[f'Comment {column}'] = [f'Free text comment {row % 50}' for row in range(rows)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_location = os.path.join(temp_dir, 'mapping.xlsx')
+        pd_df_mapfile_in.to_excel(file_location, index=False, engine='openpyxl')
+
+        start_time = time.perf_counter()
+        pd_df_full = pd.read_excel(file_location, engine='openpyxl')
+        full_ms = (time.perf_counter() - start_time) * 1000
+        full_bytes = pd_df_full.memory_usage(deep=True).sum()
+
+        start_time = time.perf_counter()
+        pd_df_schema = MappingDocumentLoader().load(file_location)
+        schema_ms = (time.perf_counter() - start_time) * 1000
+        schema_bytes = pd_df_schema.memory_usage(deep=True).sum()
+
+    print(f'read_excel           {full_ms:9.1f} ms {full_bytes:>12} bytes')
+    print(f'MappingDocumentLoader {schema_ms:8.1f} ms {schema_bytes:>12} bytes '
+          f'({100 * (1 - schema_bytes / full_bytes):.0f}% less memory)')
+
+    return schema_bytes < full_bytes
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Benchmark the Lineage Upload Script')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    import_parser = subparsers.add_parser('import-time', help='check the start-up import time budget')
+    import_parser.add_argument('--module', '-m', default='main', help='module to be imported')
+    import_parser.add_argument('--budget-ms', '-b', type=float, default=50,
+                               help='maximum cumulative import time in milliseconds')
+
+    config_parser = subparsers.add_parser('config-startup', help='measure configuration parsing and decryption')
+    config_parser.add_argument('--targets', '-t', type=int, default=50, help='number of Alation targets')
+    config_parser.add_argument('--repeat', '-r', type=int, default=100, help='number of cached parses')
+
+    vds_parser = subparsers.add_parser('vds-output', help='compare the VDS output formats')
+    vds_parser.add_argument('--rows', '-n', type=int, default=200000, help='number of mapping rows')
+
+    scaling_parser = subparsers.add_parser('parse-scaling', help='measure the parallel parser from 1 to N workers')
+    scaling_parser.add_argument('--rows', '-n', type=int, default=500000, help='number of mapping rows')
+    scaling_parser.add_argument('--workers', '-w', type=int, default=os.cpu_count(),
+                                help='largest number of worker processes')
+
+    mapping_parser = subparsers.add_parser('mapping-load', help='compare the mapping document loaders')
+    mapping_parser.add_argument('--rows', '-n', type=int, default=20000, help='number of mapping rows')
+    mapping_parser.add_argument('--extra-columns', '-e', type=int, default=10,
+                                help='number of columns not used by the script')
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'import-time':
+        within_budget = import_time(args.module, args.budget_ms)
+    elif args.benchmark == 'config-startup':
+        within_budget = config_startup(args.targets, args.repeat)
+    elif args.benchmark == 'vds-output':
+        within_budget = vds_output(args.rows)
+    elif args.benchmark == 'parse-scaling':
+        within_budget = parse_scaling(args.rows, args.workers)
+    elif args.benchmark == 'mapping-load':
+        within_budget = mapping_load(args.rows, args.extra_columns)
+
+    sys.exit(0 if within_budget else 1)
+
+
+if __name__ == '__main__':
+    main()
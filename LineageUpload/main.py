@@ -4,12 +4,18 @@
 # Press Double ⇧ to search everywhere for classes, files, tool windows, actions, and settings.
 
 import argparse
-from src.configs import ParseConfigs
-import pandas as pd
 import logging
+import os
+from typing import TYPE_CHECKING
 
-from src.alation_helpers import AlationHelpers
-from src.models.alation.auth import AlationAuth
+# pandas, requests and cryptography are imported inside the code paths that need them,
+# so --help and argument errors return without paying for the heavy imports.
+if TYPE_CHECKING:
+    import pandas as pd
+    from src.alation_helpers import AlationHelpers
+    from src.fanout import MultiTargetUploader
+    from src.models.alation.auth import AlationAuth
+    from src.progress import ProgressReporter
 
 LOGGER = logging.getLogger()
 
@@ -21,67 +27,276 @@ def main():
 
     # Capture command line arguments
     parser = argparse.ArgumentParser(description='Alation Custom Lineage Updater.')
+    parser.add_argument('command', nargs='?', choices=['upload', 'probe', 'daemon'], default='upload',
+                        help='upload the mapping document (default), probe the connectivity and latency of '
+                             'the Alation targets and recommend configs.ini settings, or run as a daemon '
+                             'uploading the workbooks dropped into the watch directory')
     parser.add_argument('--configs', '-c', required=False,
                         help='Path to the Environment Config File')
 #    parser.add_argument('--fields', '-f', required=False, default=True,
 #                        type=strtobool, help='Catalog Mstr Fields in Alation')
-    parser.add_argument('--input_source', '-i', required=True, default=True,
+    parser.add_argument('--input_source', '-i', required=False,
                         help='Caterpillar mapping document file location.')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Write the request payloads to NDJSON files without calling Alation.')
+    parser.add_argument('--replay-spool', action='store_true',
+                        help='Upload the payloads spooled by a previous run instead of parsing the input source.')
+    parser.add_argument('--watch-directory', '-w', required=False,
+                        help='Drop folder watched in daemon mode, defaults to watch_directory in configs.ini.')
 
     args = parser.parse_args()
+
+    if args.command == 'upload' and not args.input_source and not args.replay_spool:
+        parser.error('the following arguments are required: --input_source/-i')
+
+    from src.configs import ParseConfigs
+    from src.fanout import MultiTargetUploader
+    from src.logs import LogHelper, LogRotater
+    from src.progress import ProgressReporter
+
     config_helper = ParseConfigs()
-    #Add logging
-    #log_helper = LogHelper()
-    #log_helper.log_script_start()
 
     if args.configs:
-        configs = config_helper.generate_configs(args.configs)
+        target_configs = config_helper.generate_target_configs(args.configs)
     else:
-        configs = config_helper.generate_configs('configs/configs.ini')
+        target_configs = config_helper.generate_target_configs('configs/configs.ini')
+
+    configs = next(iter(target_configs.values()))
+
+    #Add logging
+    configure_logging(configs)
+    log_helper = LogHelper()
+    log_helper.log_script_start()
+
+    progress = ProgressReporter(configs['features_progress_status_location'], configs['features_progress_interval'])
 
     #if args.input_source:
     try:
-        pd_df_mapfile_in = pd.read_excel(args.input_source, engine="openpyxl")
-        print(pd_df_mapfile_in)
-        print ('Yes')
-        #pd_df_mapfile_in.
+        uploader = MultiTargetUploader(target_configs, progress)
 
-        LOGGER.log_header('REST API Authentication')
-        #connector.mstr_df_pd = pd_df_mstr_in
-        alation_helper = AlationHelpers(configs)
-        alation_auth = alation_helper.alation_authentication()
+        if args.command == 'probe':
+            log_helper.log_header('Connectivity Probe')
+            uploader.connect(resolve_custom_fields=False)
+            # The probe latencies must not replace the metrics the dry run projection and auto-tuning read
+            uploader.run(probe_target, save_metrics=False)
+            return
+
+        if not args.dry_run:
+            progress.start()
+
+            # Authentication and the custom field lookups overlap with parsing the workbook
+            log_helper.log_header('REST API Authentication')
+            uploader.connect()
+
+        if args.command == 'daemon':
+            from src.daemon import DropFolderDaemon
 
-        process_input_file(pd_df_mapfile_in, alation_auth)
+            log_helper.log_header('Drop Folder Daemon')
+            DropFolderDaemon(args.watch_directory or configs['features_watch_directory'],
+                             lambda file_location: process_dropped_file(file_location, configs, uploader,
+                                                                        progress),
+                             configs['features_watch_poll_interval'],
+                             configs['features_watch_queue_size']).run()
+            return
+
+        if args.replay_spool:
+            payloads = load_spooled_payloads(configs)
+        else:
+            payloads = parse_input_file(args.input_source, configs, progress)
+
+        if args.dry_run:
+            from src.dry_run import PayloadCompiler
+
+            log_helper.log_header('Dry Run')
+            compiler = PayloadCompiler(configs['features_dry_run_directory'])
+            compiler.add_chunked('lineage', 'POST /integration/v2/dataflow/', payloads['lineage'], target_configs)
+            compiler.report(target_configs)
+            return
+
+        log_helper.log_header('Upload')
+        #connector.mstr_df_pd = pd_df_mstr_in
+        # The workbook is parsed once and uploaded to every Alation target in parallel
+        uploader.run(
+            lambda alation_helper, alation_auth: process_input_file(payloads, alation_helper, alation_auth))
 
 
     except Exception as main_error:
         LOGGER.error(main_error, exc_info=True)
 
     finally:
-        LOGGER.log_header('Script Cleanup')
+        if not args.dry_run and args.command != 'probe':
+            progress.stop()
+
+        log_helper.log_header('Script Cleanup')
         # connector.tableau_sign_out(connector.ts_auth)
-        #LOGGER.info('Rotating old Log Files')
-        #LogRotater.rotate_logs(configs['features_log_retention_period'])
+        LOGGER.info('Rotating old Log Files')
+        LogRotater.rotate_logs(configs['features_log_retention_period'], configs['features_log_directory'])
         LOGGER.info('Done!')
 
-def process_input_file(pd_df_in: pd.DataFrame, alation_auth: AlationAuth):
+def configure_logging(configs: dict):
+    """Load the Logging Configurations and silence the insecure request warnings.
+
+    Args:
+        configs (dict): Script Environment Configurations.
+
+    """
+    import logging.config
+    import urllib3
+    from src.logs import LoggingConfigs
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    logging.config.dictConfig(LoggingConfigs.logging_configs(configs['features_log_directory'],
+                                                             configs['features_log_max_bytes']))
+    LoggingConfigs.enable_async_logging(configs['features_log_sample_rate'])
+
+
+def parse_input_file(input_source: str, configs: dict, progress: 'ProgressReporter' = None) -> dict:
+    """Load and validate the mapping document and build its request payloads.
+
+    Args:
+        input_source (str): Mapping document file location.
+        configs (dict): Script Environment Configurations.
+        progress (ProgressReporter): Progress the parsed lineage paths are reported to.
+
+    Returns:
+        dict: Request payloads keyed by upload type.
+
+    """
+    from src.logs import LogHelper
+    from src.mapping_schema import MappingDocumentLoader
+    from src.validation import MappingValidator
+
+    pd_df_mapfile_in = MappingDocumentLoader().load(input_source)
+
+    LogHelper().log_header('Mapping Document Validation')
+    if not MappingValidator().validate_and_report(pd_df_mapfile_in,
+                                                  configs['features_validation_report_location']):
+        raise ValueError('The mapping document failed validation. See the validation report for '
+                         'the failing rows.')
+
+    return prepare_payloads(pd_df_mapfile_in, configs, progress)
+
+
+def process_dropped_file(file_location: str, configs: dict, uploader: 'MultiTargetUploader',
+                         progress: 'ProgressReporter' = None) -> bool:
+    """Parse a workbook dropped into the watch directory and upload it to every Alation target.
+
+    The sessions of the uploader stay connected between workbooks. They are connected again
+    after a failed upload, e.g. because the access token expired.
+
+    Args:
+        file_location (str): Path of the dropped workbook.
+        configs (dict): Script Environment Configurations.
+        uploader (MultiTargetUploader): Connected uploader of the Alation targets.
+        progress (ProgressReporter): Progress the parsed lineage paths are reported to.
+
+    Returns:
+        bool: True if the workbook was uploaded to every target.
+
+    """
+    payloads = parse_input_file(file_location, configs, progress)
+    results = uploader.run(
+        lambda alation_helper, alation_auth: process_input_file(payloads, alation_helper, alation_auth))
+
+    successful = all(result['status'] == 'SUCCESSFUL' for result in results.values())
+    if not successful:
+        uploader.connect()
+
+    return successful
+
+
+def prepare_payloads(pd_df_in: 'pd.DataFrame', configs: dict, progress: 'ProgressReporter' = None) -> dict:
+    """Parse the mapping document and build the request payloads shared by every Alation target.
+
+    The lineage paths are streamed into the on-disk spool and read back in upload sized
+    chunks, so the payloads never live in memory all at once.
+
+    Args:
+        pd_df_in (pd.DataFrame): Mapping document.
+        configs (dict): Script Environment Configurations.
+        progress (ProgressReporter): Progress the parsed lineage paths are reported to.
+
+    Returns:
+        dict: Request payloads keyed by upload type.
+
+    """
+    from src.spool import SpoolWriter
+    from src.vds_parser import VDSParser
+
+    # Starting the worker processes only pays off for large mapping documents
+    if configs['features_parse_workers'] != 1 and len(pd_df_in) >= configs['features_parse_parallel_min_rows']:
+        from src.parallel_parser import ParallelVDSParser
+
+        vds_parser = ParallelVDSParser(configs)
+    else:
+        vds_parser = VDSParser(configs)
+    vds_parser.output_filename = vds_parser.output_location('target_output')
+    vds_parser.parse_and_create_target(pd_df_in)
+    vds_parser.output_filename = vds_parser.output_location('source_output')
+    vds_parser.parse_and_create_source(pd_df_in)
+
+
+    with SpoolWriter(os.path.join(configs['features_spool_directory'], 'lineage')) as spool_writer:
+        vds_parser.spool_lineage_paths(pd_df_in, spool_writer, progress)
+
+    return load_spooled_payloads(configs)
+
+
+def load_spooled_payloads(configs: dict) -> dict:
+    """Load the request payloads from the spool written by prepare_payloads.
+
+    Args:
+        configs (dict): Script Environment Configurations.
+
+    Returns:
+        dict: Request payloads keyed by upload type.
+
+    """
+    from src.spool import SpoolReader, SpooledPayloads
+    from src.vds_parser import VDSParser
+
+    return {'lineage': SpooledPayloads(SpoolReader(os.path.join(configs['features_spool_directory'], 'lineage')),
+                                       configs['features_upload_request_size'],
+                                       VDSParser.build_lineage_payload)}
+
+
+def process_input_file(payloads: dict, alation_helper: 'AlationHelpers', alation_auth: 'AlationAuth'):
+    """Upload the prepared request payloads to a single Alation target.
+
+    The mapping document only yields lineage payloads, Virtual BI Server objects would be
+    uploaded through AlationHelpers.upload_bi_objects once a parser builds them.
+
+    Args:
+        payloads (dict): Request payloads keyed by upload type.
+        alation_helper (AlationHelpers): Alation helper of the target.
+        alation_auth (AlationAuth): Alation REST API Authentication Object of the target.
+
+    Returns:
+        dict: Upload Pipeline statistics.
+
+    """
+    return alation_helper.upload_lineage(alation_auth, payloads['lineage'])
 
 
+def probe_target(alation_helper: 'AlationHelpers', alation_auth: 'AlationAuth') -> dict:
+    """Measure the latency of a single Alation target and print the recommended settings.
 
-    #filter the input file?
+    Args:
+        alation_helper (AlationHelpers): Alation helper of the target.
+        alation_auth (AlationAuth): Alation REST API Authentication Object of the target.
 
+    Returns:
+        dict: Recommended configs.ini settings.
 
-    alation_auth
+    """
+    from src.probe import ConnectionProbe
 
-    pass
+    connection_probe = ConnectionProbe(alation_helper)
 
-def print_hi(name):
-    # Use a breakpoint in the code line below to debug your script.
-    print(f'Hi, {name}')  # Press ⌘F8 to toggle the breakpoint.
+    return connection_probe.report(connection_probe.run(alation_auth))
 
 
-# Press the green button in the gutter to run the script.
 if __name__ == '__main__':
-    print_hi('PyCharm')
+    main()
 
 # See PyCharm help at https://www.jetbrains.com/help/pycharm/
@@ -1,11 +1,18 @@
 """Python Class and Functions for working with Alation Data Objects."""
 
 import logging
+import threading
 from time import sleep
+from urllib.parse import urlsplit
 
 from src.alation_rest import AlationRestAPI
+from src.catalog_index import CatalogIndex
+from src.job_poller import JobPoller
 from src.models.alation.auth import AlationAuth
-from src.models.alation.job import Job
+from src.models.alation.job import Job, JobResultAggregator
+from src.pipeline import UploadPipeline, merge_statistics
+from src.progress import ProgressReporter
+from src.utils import adaptive_chunks, chunk_list
 
 LOGGER = logging.getLogger()
 
@@ -13,34 +20,38 @@ LOGGER = logging.getLogger()
 class AlationHelpers(AlationRestAPI):
     """Python Class for working with Alation Data Objects."""
 
-    def __init__(self, configs: dict):
+    def __init__(self, configs: dict, progress: ProgressReporter = None):
         """Create an instance of AlationHelper.
 
         Args:
             configs (dict): Script Environment Configurations.
+            progress (ProgressReporter): Progress of the run, shared by every target.
 
         """
         super().__init__(configs=configs)
 
         self.configs = configs
 
+        self.job_results = JobResultAggregator()
+        self.progress = progress or ProgressReporter()
+        self.job_poller = JobPoller(self, poll_interval=configs['features_job_status_sleep'],
+                                    max_poll_interval=configs.get('features_job_status_max_sleep', 30),
+                                    polls_per_second=configs.get('features_job_polls_per_second', 0),
+                                    progress=self.progress,
+                                    job_timeout=configs.get('features_job_timeout', 3600),
+                                    max_unknown_polls=configs.get('features_job_max_unknown_polls', 10))
+
     def check_jobs_status(self, alation_auth: AlationAuth, job: Job):
-        """Query the Alation Background Job and Log Status until Job has completed.
+        """Wait for the Alation Background Job to complete, polled by the shared JobPoller.
+
+        A job whose status cannot be read, or which runs past the job timeout, is marked as failed.
 
         Args:
             alation_auth (AlationAuth): Alation REST API Authentication Object.
             job (Job): Alation Background Job.
 
         """
-        while True:
-
-            self.api_query_job(alation_auth.access_token, job)
-            job.log_job()
-
-            if job.completed:
-                break
-            else:
-                sleep(self.configs['features_job_status_sleep'])
+        self.job_poller.wait(alation_auth, job)
 
         sleep(1)
 
@@ -82,4 +93,300 @@ class AlationHelpers(AlationRestAPI):
         else:
             raise Exception("Could not generate the Alation API access token. Exiting script.")
 
+        # Requests rejected with an expired access token are re-authenticated with this object
+        self.alation_auth = api_auth
+
         return api_auth
+
+    def load_catalog_snapshot(self, alation_auth: AlationAuth, object_types: list = None,
+                              database_location: str = None) -> CatalogIndex:
+        """Page through the objects of the Virtual BI Server and build the local Catalog Index.
+
+        Args:
+            alation_auth (AlationAuth): Alation REST API Authentication Object.
+            object_types (list): Object types to be loaded, defaults to folders, reports,
+                report fields and datasource fields.
+            database_location (str): Optional path to the SQLite file persisting the index.
+
+        Returns:
+            CatalogIndex: Index of the catalogued objects.
+
+        Raises:
+            RuntimeError: If a page of the snapshot could not be retrieved. A partial snapshot
+                would skip the upload of objects missing from it.
+
+        """
+        # A persisted index is loaded first, every object type is then replaced by its fresh snapshot
+        catalog_index = CatalogIndex(urlsplit(self.alation_host).hostname, self.bi_server_id, database_location)
+
+        for object_type in object_types or ['FOLDER', 'REPORT', 'REPORT FIELD', 'DATASOURCE FIELD']:
+            snapshot = []
+
+            while True:
+                page_size = self.chunk_size('download', self.configs['features_download_json_request_size'])
+                api_objects = self.api_query_bi_objects(alation_auth.access_token, object_type,
+                                                        limit=page_size, skip=len(snapshot))
+                if api_objects is None:
+                    raise RuntimeError(f"Could not retrieve the BI {object_type.title()}s of the Virtual BI "
+                                       f"Server after {len(snapshot)} objects, aborting the catalog snapshot.")
+
+                snapshot.extend(api_objects)
+
+                if len(api_objects) < page_size:
+                    break
+
+            catalog_index.replace(object_type, snapshot)
+            if self.oid_cache is not None:
+                self.oid_cache.put_many(object_type, {api_object.get('external_id'): api_object.get('id')
+                                                      for api_object in snapshot})
+
+            LOGGER.info(f"Loaded {len(snapshot)} BI {object_type.title()}s from the Virtual BI Server snapshot")
+
+        if database_location:
+            catalog_index.save()
+
+        return catalog_index
+
+    def upload_bi_objects(self, alation_auth: AlationAuth, uploads: list,
+                          catalog_index: CatalogIndex = None, chunk_size: int = None,
+                          attempt: int = 0) -> dict:
+        """Upload the Virtual BI Server Objects through the concurrent Upload Pipeline.
+
+        Each object type streams its batches through the create, job status, OID lookup
+        and custom field stages. An object type only starts once the previous object type
+        has been created, so parent objects always exist before their children.
+
+        The mapping document only produces lineage, which main.py uploads with upload_lineage.
+        No Virtual BI Server objects are built from it yet, so this path is only used by callers
+        which build their own BI objects.
+
+        Args:
+            alation_auth (AlationAuth): Alation REST API Authentication Object.
+            uploads (list): Tuples of object type and Virtual BI Server objects, in upload order.
+            catalog_index (CatalogIndex): Optional index of the catalogued objects. Unchanged
+                objects found in the index are skipped.
+            chunk_size (int): Number of objects per request, defaults to the batch size of the object type.
+            attempt (int): Number of previous re-submissions of the objects.
+
+        Returns:
+            dict: Processing statistics keyed by Pipeline Stage name, summed over the re-submissions.
+
+        """
+        pipeline = UploadPipeline(queue_size=self.configs['features_pipeline_queue_size'],
+                                  workers=self.pipeline_workers(self.configs['features_pipeline_workers']))
+        failed_objects = {}
+        sources = {}
+        previous_stage = None
+
+        for object_type, bi_objects in uploads:
+            registered_type = self.object_types.get(object_type)
+            object_type = registered_type.name
+
+            if catalog_index is not None:
+                partitions = catalog_index.partition(object_type, bi_objects)
+                bi_objects = partitions[CatalogIndex.CREATE] + partitions[CatalogIndex.UPDATE]
+
+                # Objects missing from the catalog are created again and receive new Alation IDs
+                if self.oid_cache is not None:
+                    self.oid_cache.invalidate(object_type, [bi_object.external_id()
+                                                            for bi_object in partitions[CatalogIndex.CREATE]])
+
+            if self.custom_fields.get(object_type) and attempt == 0:
+                self.api_query_custom_fields(alation_auth.access_token, object_type)
+
+            self.progress.add_total('submitted', len(bi_objects))
+            failed_objects[object_type] = []
+            create_stage = self._add_upload_stages(pipeline, alation_auth, object_type, previous_stage,
+                                                   failed_objects[object_type])
+            if chunk_size:
+                sources[create_stage] = chunk_list(bi_objects, chunk_size)
+            else:
+                sources[create_stage] = adaptive_chunks(
+                    bi_objects, lambda batch_size=registered_type.batch_size: self.chunk_size('upload', batch_size))
+            previous_stage = f'{object_type} Job Status'
+
+        statistics = pipeline.run(sources)
+
+        for stage, stage_statistics in statistics.items():
+            LOGGER.info(f"Pipeline stage '{stage}': {stage_statistics}")
+
+        failed_uploads = [(object_type, bi_objects) for object_type, bi_objects in failed_objects.items()
+                          if bi_objects]
+
+        if failed_uploads and attempt < self.configs['features_resubmit_attempts']:
+            # Only the failed objects are submitted again, in smaller chunks
+            chunk_size = max((chunk_size or self.chunk_size('upload', self.upload_request_size)) // 2, 1)
+            LOGGER.warning(f"Re-submitting {sum(len(bi_objects) for _, bi_objects in failed_uploads)} "
+                           f"failed objects in chunks of {chunk_size} (attempt {attempt + 1})")
+            return merge_statistics(statistics, self.upload_bi_objects(alation_auth, failed_uploads,
+                                                                       chunk_size=chunk_size, attempt=attempt + 1))
+
+        self.job_results.log_summary()
+        if self.oid_cache is not None:
+            LOGGER.info(f"OID cache: {self.oid_cache.hits} hits, {self.oid_cache.misses} misses")
+
+        return statistics
+
+    def upload_lineage(self, alation_auth: AlationAuth, payloads: list, attempt: int = 0) -> dict:
+        """Upload the lineage dataflow payloads and wait for their Alation Background Jobs.
+
+        Payloads which could not be submitted or whose job failed are submitted again, up to
+        the configured number of re-submissions.
+
+        Args:
+            alation_auth (AlationAuth): Alation REST API Authentication Object.
+            payloads (list): Alation dataflow payloads.
+            attempt (int): Number of previous re-submissions of the payloads.
+
+        Returns:
+            dict: Processing statistics keyed by Pipeline Stage name, summed over the re-submissions.
+
+        """
+        failed_payloads = []
+        failed_lock = threading.Lock()
+
+        def create_lineage(payload: dict) -> Job:
+            job = self.api_create_lineage(alation_auth.access_token, payload)
+            self.progress.increment('submitted' if job else 'submit_failed', len(payload['paths']))
+            if not job:
+                self.job_results.add_failed_submission('LINEAGE', [payload], 'Lineage request failed')
+                with failed_lock:
+                    failed_payloads.append(payload)
+            return job
+
+        def wait_for_job(job: Job):
+            self.check_jobs_status(alation_auth, job)
+            self.job_results.add(job)
+
+            failed_payload = self.job_results.failed_objects(job)
+            if failed_payload:
+                with failed_lock:
+                    failed_payloads.extend(failed_payload)
+
+        # Spooled payloads know their number of lineage paths without reading the spool
+        if hasattr(payloads, 'records'):
+            self.progress.add_total('submitted', payloads.records)
+        elif attempt:
+            self.progress.add_total('submitted', sum(len(payload['paths']) for payload in payloads))
+
+        # Spooled payloads are rebuilt with the auto-tuned number of lineage paths per request
+        if self.autotune is not None and hasattr(payloads, 'with_chunk_size'):
+            payloads = payloads.with_chunk_size(lambda: self.autotune.chunk_size('upload'))
+
+        pipeline = UploadPipeline(queue_size=self.configs['features_pipeline_queue_size'],
+                                  workers=self.pipeline_workers(self.configs['features_pipeline_workers']))
+        pipeline.add_stage('LINEAGE Create', create_lineage)
+        pipeline.add_stage('LINEAGE Job Status', wait_for_job, upstream='LINEAGE Create')
+
+        statistics = pipeline.run({'LINEAGE Create': payloads})
+
+        if failed_payloads and attempt < self.configs['features_resubmit_attempts']:
+            LOGGER.warning(f"Re-submitting {len(failed_payloads)} failed lineage payloads (attempt {attempt + 1})")
+            return merge_statistics(statistics, self.upload_lineage(alation_auth, failed_payloads,
+                                                                    attempt=attempt + 1))
+
+        self.job_results.log_summary()
+
+        return statistics
+
+    def _add_upload_stages(self, pipeline: UploadPipeline, alation_auth: AlationAuth,
+                           object_type: str, wait_for: str = None, failed_objects: list = None) -> str:
+        """Add the Upload Stages of a single object type to the Upload Pipeline.
+
+        Args:
+            pipeline (UploadPipeline): Upload Pipeline.
+            alation_auth (AlationAuth): Alation REST API Authentication Object.
+            object_type (str): Type of Virtual BI Server Object to be Created.
+            wait_for (str): Name of the Stage which must be complete before the objects are created.
+            failed_objects (list): List collecting the objects which failed to be created.
+
+        Returns:
+            str: Name of the first Stage of the object type.
+
+        """
+        failed_objects = failed_objects if failed_objects is not None else []
+        failed_lock = threading.Lock()
+
+        def create_objects(batch: list) -> tuple:
+            job = self.api_create_bi_objects(alation_auth.access_token, object_type, batch)
+            self.progress.increment('submitted' if job else 'submit_failed', len(batch))
+            if not job:
+                self.job_results.add_failed_submission(object_type, batch, f'{object_type.title()} request failed')
+                with failed_lock:
+                    failed_objects.extend(batch)
+            return (batch, job) if job else None
+
+        def wait_for_job(item: tuple) -> list:
+            batch, job = item
+            self.check_jobs_status(alation_auth, job)
+            self.job_results.add(job)
+
+            failed_batch = self.job_results.failed_objects(job)
+            if not failed_batch:
+                return batch
+
+            with failed_lock:
+                failed_objects.extend(failed_batch)
+
+            failed_ids = {id(bi_object) for bi_object in failed_batch}
+            return [bi_object for bi_object in batch if id(bi_object) not in failed_ids] or None
+
+        def resolve_object_ids(batch: list) -> list:
+            self.api_query_object_ids(alation_auth.access_token, object_type, batch)
+            self.progress.increment('oids_resolved', sum(getattr(bi_object, 'oid', None) is not None
+                                                         for bi_object in batch))
+            return batch
+
+        def update_custom_fields(batch: list):
+            field_values = self._custom_field_values(object_type, batch)
+            if not field_values:
+                return
+
+            # The update fails for Alation IDs which no longer exist, so the cached IDs are dropped
+            if not self.api_update_custom_field_values(alation_auth.access_token, object_type, field_values) \
+                    and self.oid_cache is not None:
+                self.oid_cache.invalidate(object_type, [bi_object.external_id() for bi_object in batch])
+
+        create_stage = f'{object_type} Create'
+        pipeline.add_stage(create_stage, create_objects, wait_for=[wait_for] if wait_for else None)
+        pipeline.add_stage(f'{object_type} Job Status', wait_for_job, upstream=create_stage)
+
+        if self.custom_fields.get(object_type):
+            pipeline.add_stage(f'{object_type} Object IDs', resolve_object_ids,
+                               upstream=f'{object_type} Job Status')
+            pipeline.add_stage(f'{object_type} Custom Fields', update_custom_fields,
+                               upstream=f'{object_type} Object IDs')
+
+        return create_stage
+
+    def _custom_field_values(self, object_type: str, bi_objects: list) -> list:
+        """Build the Custom Field Value payload for a batch of Virtual BI Server objects.
+
+        Args:
+            object_type (str): Type of Virtual BI Server Object.
+            bi_objects (list): Virtual BI Server objects with resolved Alation IDs.
+
+        Returns:
+            list: Custom Field Value JSON objects.
+
+        """
+        field_values = []
+        custom_field_otype = self.object_types.get(object_type).custom_field_otype
+
+        for custom_field in self.custom_fields.get(object_type, []):
+            for properties in [value.get('properties') for value in custom_field.values()]:
+                if not properties.get('f_oid'):
+                    continue
+
+                attribute = properties.get('property').replace('self.', '')
+
+                for bi_object in bi_objects:
+                    if getattr(bi_object, 'oid', None) is None:
+                        continue
+
+                    field_values.append({'field_id': properties.get('f_oid'),
+                                         'otype': custom_field_otype,
+                                         'oid': bi_object.oid,
+                                         'value': getattr(bi_object, attribute, None)})
+
+        return field_values
@@ -1,11 +1,26 @@
 """Alation API Wrapper."""
 
+import copy
 import json
 import logging
+import os
+import threading
+import time
+import zlib
+from concurrent import futures
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
 
+from src.autotune import AimdController
 from src.models.alation.auth import AlationAuth
 from src.models.alation.job import Job
+from src.json_stream import iter_json_array
+from src.metrics import RunMetrics, endpoint_key
+from src.object_types import ObjectTypeRegistry
+from src.oid_cache import OidCache
+from src.utils import RateLimiter
 
 API_LOGGER = logging.getLogger("alation_rest")
 
@@ -13,6 +28,12 @@ API_LOGGER = logging.getLogger("alation_rest")
 class AlationRestAPI(object):
     """Alation REST API Wrapper."""
 
+    # Fields of the BI Servers kept while their response is parsed
+    bi_server_fields = ('id', 'title', 'uri', 'external_id')
+
+    # zlib window bits of the supported Content-Encodings of request bodies
+    compression_wbits = {'gzip': 16 + zlib.MAX_WBITS, 'deflate': zlib.MAX_WBITS}
+
     def __init__(self, configs: dict):
         """Create an instance of the AlationAPI Object.
 
@@ -33,39 +54,52 @@ class AlationRestAPI(object):
         else:
             self.verify_ssl = False
 
+        self.session = requests.Session()
+        self.pool_size = configs.get('alation_pool_size', 10)
+        http_adapter = self._http_adapter(configs)
+        self.session.mount('https://', http_adapter)
+        self.session.mount('http://', http_adapter)
+        self.rate_limiter = RateLimiter(configs.get('alation_max_requests_per_second', 0))
+        self.request_compression = configs.get('alation_request_compression', 'none')
+        self.compression_threshold = configs.get('alation_compression_threshold', 16384)
+        self.upload_bandwidth_mbps = configs.get('alation_upload_bandwidth_mbps', 10)
+        if self.request_compression not in self.compression_wbits and self.request_compression != 'none':
+            raise ValueError(f"Unsupported request compression '{self.request_compression}', "
+                             f"expected one of {list(self.compression_wbits) + ['none']}")
+        # None until the host accepted or rejected a compressed request body
+        self._compression_accepted = None
+        # Authentication the requests rejected with a 401 are re-authenticated with, see reauthenticate
+        self.alation_auth = None
+        self._auth_lock = threading.Lock()
+        self.metrics = RunMetrics(os.path.join(configs.get('features_metrics_directory', 'logs/metrics'),
+                                               f'{urlsplit(self.alation_host).hostname}.json'))
+        self.autotune = self.autotune_controller(configs)
+
+        self.oid_cache_location = configs.get('features_oid_cache_location')
+        self._oid_cache = None
+
         self._bi_server_id = None
         self.api_v2_url = f'{self.alation_host}/integration/v2'
         self.bi_api_url = f'{self.api_v2_url}/bi/server'
 
-        self.acceptable_objects = ['FOLDER', 'CONNECTION', 'DATASOURCE', 'DATASOURCE FIELD',
-                                   'REPORT', 'REPORT FIELD']
+        self.upload_request_size = configs.get('features_upload_request_size', 500)
+        self._object_types = None
 
-        #self.custom_fields = eval(configs['alation_custom_fields'])
-        self.custom_fields = \
-            {"REPORT": [
-                {'Report LPN':  {'properties': {'f_oid': '', 'property': 'self.report_lpn'}}},
-                {'Business Area': {'properties': {'f_oid': '', 'property': 'self.business_area'}}},
-                {'Report Business Owner': {'properties': {'f_oid': '', 'property': 'self.report_business_owner'}}},
-                {'Report Path': {'properties': {'f_oid': '', 'property': 'self.report_location'}}},
-                {'Report Project Name': {'properties': {'f_oid': '', 'property': 'self.project_name'}}}],
-             "REPORT FIELD": [
-                {'Field Project Name': {'properties': {'f_oid': '', 'property': 'self.project_name'}}}]
-            }
-
-
-        #if self.custom_fields in not None:
-        #    self_load_custom_fields()
+        # Custom field names are resolved to their IDs of this host once per run, see resolve_custom_fields
+        self.custom_fields = copy.deepcopy(configs.get('alation_custom_fields', {}))
+        self._custom_field_futures = None
+        self._custom_fields_lock = threading.Lock()
 
     def api_query_custom_field(self, api_token: str, field_singular_name: str):
 
         bi_url = f"{self.alation_host}/integration/v2/custom_field/?name_singular={field_singular_name}"
 
-        api_response = requests.get(bi_url, headers={'Token': api_token},
-                                    verify=self.verify_ssl)
+        api_response = self._request('GET', bi_url, headers={'Token': api_token},
+                                     verify=self.verify_ssl)
         response_data = api_response.json()
 
         if api_response.status_code != 200:
-            error_code, title, detail = self._format_error(response_data)
+            error_code, title, detail, _ = self._format_error(response_data)
             API_LOGGER.error(
                 "Error querying for a Custom field in Alation Environment.",
                 extra={'API Call': 'Get Custom Field',
@@ -92,6 +126,8 @@ class AlationRestAPI(object):
     def api_query_custom_fields(self, api_token: str, object_type: str) -> dict:
         """Retrive custom field IDS from alation that correspond to the object_type, i.e. Report.
 
+        Waits for the background lookups started by resolve_custom_fields, or starts them.
+
         Args:
             api_token (str): Alation REST API Authentication Token.
             object_type (str): Type of Virtual BI Server Object to be Created.
@@ -100,17 +136,47 @@ class AlationRestAPI(object):
             custom_fields: Alatoin Custom Field IDs.
 
         """
-        object_type = object_type.upper()
-        for custom_field in self.custom_fields.get(object_type):
-            #field_id = self.api_query_custom_field(api_token, custom_field)
-            for key, value in custom_field.items():
-                value.get('properties')['f_oid'] = self.api_query_custom_field(api_token, key)
-
-        #field_ids = [self.api_query_custom_field(api_token=api_token, field_singular_name=custom_field)
-            #             for custom_field in self.custom_fields.get(object_type)]
+        for future in self.resolve_custom_fields(api_token):
+            future.result()
 
         return self.custom_fields
 
+    def resolve_custom_fields(self, api_token: str) -> list:
+        """Start resolving the IDs of every configured custom field concurrently in the background.
+
+        Each distinct custom field name is queried once, even when it is configured for several
+        object types. Later calls return the futures of the first call.
+
+        Args:
+            api_token (str): Alation REST API Authentication Token.
+
+        Returns:
+            list: Futures of the custom field lookups.
+
+        """
+        with self._custom_fields_lock:
+            if self._custom_field_futures is not None:
+                return self._custom_field_futures
+
+            field_properties = {}
+            for custom_fields in self.custom_fields.values():
+                for custom_field in custom_fields:
+                    for field_name, value in custom_field.items():
+                        field_properties.setdefault(field_name, []).append(value.get('properties'))
+
+            def resolve_custom_field(field_name: str):
+                field_id = self.api_query_custom_field(api_token, field_name)
+                for properties in field_properties[field_name]:
+                    properties['f_oid'] = field_id
+
+            executor = futures.ThreadPoolExecutor(max_workers=max(min(self.pool_size, len(field_properties)), 1),
+                                                  thread_name_prefix='custom-field')
+            self._custom_field_futures = [executor.submit(resolve_custom_field, field_name)
+                                          for field_name in field_properties]
+            executor.shutdown(wait=False)
+
+            return self._custom_field_futures
+
     def api_update_custom_field_values(self, api_token: str, object_type: str, bi_objects: list):
         """Update custom fields in objects using Alation REST GBMv2 APIs.
 
@@ -123,7 +189,7 @@ class AlationRestAPI(object):
             Job: Alation Background Job Object.
 
         """
-        if object_type.upper() not in self.acceptable_objects:
+        if not self.object_types.accepts(object_type):
             raise ValueError(f'GBMv2 does not accept the object type: {object_type.title()}')
 
         api_url = f'{self.api_v2_url}/custom_field_value/'
@@ -134,12 +200,12 @@ class AlationRestAPI(object):
             "Token": api_token
         }
 
-        api_response = requests.put(api_url, data=payload,
-                                    headers=headers, verify=self.verify_ssl)
+        api_response = self._request('PUT', api_url, data=payload,
+                                     headers=headers, verify=self.verify_ssl)
         response_data = api_response.json()
 
         if api_response.status_code != 200:
-            error_code, title, detail = self._format_error(response_data)
+            error_code, title, detail, _ = self._format_error(response_data)
             API_LOGGER.error(
                 f"Error submitting the request to update custom fields for {len(bi_objects)} BI {object_type.title()}s",
                 extra={'API Call': f'Update custom fields for {object_type.title()}s',
@@ -176,12 +242,12 @@ class AlationRestAPI(object):
         """
         job_url = f'{self.alation_host}/api/v1/bulk_metadata/job/?id={job.id}'
 
-        api_response = requests.get(job_url, headers={'Token': api_token},
-                                    verify=self.verify_ssl)
+        api_response = self._request('GET', job_url, headers={'Token': api_token},
+                                     verify=self.verify_ssl)
         response_data = api_response.json()
 
         if api_response.status_code != 200:
-            error_code, title, detail = self._format_error(response_data)
+            error_code, title, detail, _ = self._format_error(response_data)
             API_LOGGER.error(
                 f"Error querying the Alation Background Job {job.id}",
                 extra={'API Call': 'Query Job',
@@ -211,17 +277,16 @@ class AlationRestAPI(object):
             api_token (str): Alation REST API Authentication Token.
 
         Returns:
-            list: List of BIServer object instances.
+            list: BI Servers with their id, title, uri and external_id.
 
         """
         bi_url = f"{self.bi_api_url}/"
 
-        api_response = requests.get(bi_url, headers={'Token': api_token},
-                                    verify=self.verify_ssl)
-        response_data = api_response.json()
+        api_response = self._request('GET', bi_url, headers={'Token': api_token},
+                                     verify=self.verify_ssl, stream=True)
 
         if api_response.status_code != 200:
-            error_code, title, detail = self._format_error(response_data)
+            error_code, title, detail, _ = self._format_error(api_response.json())
             API_LOGGER.error(
                 "Error querying the BI Servers in the Alation Environment.",
                 extra={'API Call': 'Get BI Servers',
@@ -240,7 +305,7 @@ class AlationRestAPI(object):
                        'Host': self.alation_host,
                        'Response': api_response.status_code})
 
-            return [BIServer(api_response=response) for response in response_data]
+            return list(iter_json_array(api_response, self.bi_server_fields))
 
     def api_create_bi_server(self, api_token: str, bi_server: list) -> int:
         """Create the Virtual BI Server using Alation REST GBMv2 APIs.
@@ -261,12 +326,12 @@ class AlationRestAPI(object):
             "Token": api_token
         }
 
-        api_response = requests.post(bi_url, data=payload, headers=headers,
+        api_response = self._request('POST', bi_url, data=payload, headers=headers,
                                      verify=self.verify_ssl)
         response_data = api_response.json()
 
         if api_response.status_code != 200:
-            error_code, title, detail = self._format_error(response_data)
+            error_code, title, detail, _ = self._format_error(response_data)
             API_LOGGER.error(
                 f"Error creating the Virtual BI Server: {bi_server}",
                 extra={'API Call': 'Create BI Servers',
@@ -301,33 +366,15 @@ class AlationRestAPI(object):
             Job: Alation Background Job Object.
 
         """
-        if object_type.upper() not in self.acceptable_objects:
-            raise ValueError(f'GBMv2 does not accept the object type: {object_type.title()}')
-
-        if not self.bi_server_id:
-            raise ValueError(f'The Virtual BI Server ID is not set. Exiting Request.')
+        registered_type = self.object_types.get(object_type)
+        payload = registered_type.serialize(bi_objects)
 
-        api_urls = {
-            'FOLDER': f'{self.bi_api_url}/{self._bi_server_id}/folder/',
-            'CONNECTION': f'{self.bi_api_url}/{self.bi_server_id}/connection/',
-            'DATASOURCE': f'{self.bi_api_url}/{self.bi_server_id}/datasource/',
-            'DATASOURCE FIELD': f'{self.bi_api_url}/{self.bi_server_id}/datasource/column/',
-            'REPORT': f'{self.bi_api_url}/{self.bi_server_id}/report/',
-            'REPORT FIELD': f'{self.bi_api_url}/{self.bi_server_id}/report/column/'
-        }
-        payload = json.dumps(bi_objects, default=str)
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "Token": api_token
-        }
-
-        api_response = requests.post(api_urls[object_type.upper()], data=payload,
-                                     headers=headers, verify=self.verify_ssl)
+        api_response = self._request('POST', registered_type.url, data=payload,
+                                     headers=registered_type.headers(api_token), verify=self.verify_ssl)
         response_data = api_response.json()
 
         if api_response.status_code != 202:
-            error_code, title, detail = self._format_error(response_data)
+            error_code, title, detail, _ = self._format_error(response_data)
             API_LOGGER.error(
                 f"Error submitting the request to create {len(bi_objects)} BI {object_type.title()}s",
                 extra={'API Call': f'Create BI {object_type.title()}s',
@@ -349,7 +396,7 @@ class AlationRestAPI(object):
                        'Payload': payload,
                        'Response': api_response.status_code})
 
-            return Job(job_id=response_data.get('job_id'))
+            return Job(job_id=response_data.get('job_id'), object_type=registered_type.name, payload=bi_objects)
 
     def api_query_object_ids(self, api_token: str, object_type: str, bi_objects: list):
         """Retrieve the Report IDs from Alation and update the batch list.
@@ -363,56 +410,31 @@ class AlationRestAPI(object):
               bi_objects_out: List of objects with Alation IDS.
 
           """
-        if object_type.upper() not in self.acceptable_objects:
-            raise ValueError(f'GBMv2 does not accept the object type: {object_type.title()}')
+        registered_type = self.object_types.get(object_type)
 
-        if not self.bi_server_id:
-            raise ValueError(f'The Virtual BI Server ID is not set. Exiting Request.')
+        # Alation IDs never change once created, only the cache misses are queried
+        if self.oid_cache is not None:
+            cached_oids = self.oid_cache.get_many(object_type, [bi_object.external_id() for bi_object in bi_objects])
+            for bi_object in bi_objects:
+                if bi_object.external_id() in cached_oids:
+                    bi_object.oid = cached_oids[bi_object.external_id()]
 
-        api_urls = {
-            'FOLDER': f'{self.bi_api_url}/{self._bi_server_id}/folder/',
-            'CONNECTION': f'{self.bi_api_url}/{self.bi_server_id}/connection/',
-            'DATASOURCE': f'{self.bi_api_url}/{self.bi_server_id}/datasource/',
-            'DATASOURCE FIELD': f'{self.bi_api_url}/{self.bi_server_id}/datasource/column/',
-            'REPORT': f'{self.bi_api_url}/{self.bi_server_id}/report/',
-            'REPORT FIELD': f'{self.bi_api_url}/{self.bi_server_id}/report/column/'
-        }
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "Token": api_token
-        }
-        query_params = "?keyField=external_id&oids="
-        # GUID size 32
-        #prop_size = len(bi_objects[0].luid) + len(bi_objects[0].parent_luid) + 1
-        prop_size = len(bi_objects[0].external_id()) + 1
-        max_size = 8192 - len(query_params) - len(api_urls[object_type.upper()])
-        batch_size = int(abs(max_size/prop_size))
+            bi_objects = [bi_object for bi_object in bi_objects if bi_object.external_id() not in cached_oids]
+            if not bi_objects:
+                return
 
-        # get URL maximum size for nginx  8192, need to split this into smaller chunks
-        request_batches = [bi_objects[x:x + batch_size] for x in range(0, len(bi_objects), batch_size)]
-        for req_batch in request_batches:
-            query_params = "?keyField=external_id&oids="
-            for bi_object in req_batch:
-                query_params += bi_object.external_id() + ','
-
-            api_response = requests.get(api_urls[object_type.upper()]+query_params,
-                                        headers=headers, verify=self.verify_ssl)
-            response_data = api_response.json()
+        headers = registered_type.headers(api_token)
 
-            for bi_object in req_batch:
-                oid = next((obj for obj in response_data if
-                            bi_object.external_id() == obj.get('external_id')), None)
-                if oid is not None:
-                    bi_object.oid = oid.get('id')
-                else:
-                    API_LOGGER.warning(
-                        f"Warning: The object to be updated was not found in the catalog: "
-                        f"{bi_object.external_id()}: {bi_object.name}: {bi_object}"
-                    )
+        # get URL maximum size for nginx  8192, need to split this into smaller chunks
+        for lookup_url, req_batch in registered_type.lookup_batches(bi_objects):
+            api_response = self._request('GET', lookup_url, headers=headers, verify=self.verify_ssl,
+                                         stream=True)
 
             if api_response.status_code != 200:
-                error_code, title, detail = self._format_error(response_data)
+                error_code, title, detail, _ = self._format_error(api_response.json())
+                # Cached IDs of objects which cannot be looked up are not trusted any more
+                if self.oid_cache is not None:
+                    self.oid_cache.invalidate(object_type, [bi_object.external_id() for bi_object in req_batch])
                 API_LOGGER.error(
                     f"Error submitting the request to retrieve IDS for {len(req_batch)} BI {object_type.title()}s",
                     extra={'API Call': f'Create BI {object_type.title()}s',
@@ -423,15 +445,79 @@ class AlationRestAPI(object):
                            'Error Code': error_code,
                            'Error Title': title,
                            'Error Detail': detail})
+                continue
 
-            else:
-                API_LOGGER.info(
-                    f"Successfully submitted the request to retrieve OIDs for {len(req_batch)} BI {object_type.title()}s",
-                    extra={'API Call': f'Fill Object IDa {object_type.title()}s',
-                           'Method': 'GET',
-                           'Host': self.alation_host,
-                           'Payload': '',
-                           'Response': api_response.status_code})
+            # Only the IDs of the returned objects are kept while the response is parsed
+            catalog_oids = {api_object['external_id']: api_object['id']
+                            for api_object in iter_json_array(api_response, ('id', 'external_id'))}
+
+            resolved_oids = {}
+            missing_ids = []
+            for bi_object in req_batch:
+                oid = catalog_oids.get(bi_object.external_id())
+                if oid is not None:
+                    bi_object.oid = oid
+                    resolved_oids[bi_object.external_id()] = bi_object.oid
+                else:
+                    missing_ids.append(bi_object.external_id())
+                    API_LOGGER.warning(
+                        f"Warning: The object to be updated was not found in the catalog: "
+                        f"{bi_object.external_id()}: {bi_object.name}: {bi_object}"
+                    )
+
+            if self.oid_cache is not None:
+                self.oid_cache.put_many(object_type, resolved_oids)
+                self.oid_cache.invalidate(object_type, missing_ids)
+
+            API_LOGGER.info(
+                f"Successfully submitted the request to retrieve OIDs for {len(req_batch)} BI {object_type.title()}s",
+                extra={'API Call': f'Fill Object IDa {object_type.title()}s',
+                       'Method': 'GET',
+                       'Host': self.alation_host,
+                       'Payload': '',
+                       'Response': api_response.status_code})
+
+    def api_query_bi_objects(self, api_token: str, object_type: str, limit: int, skip: int = 0) -> list:
+        """Retrieve a page of Virtual BI Server Objects using Alation REST GBMv2 APIs.
+
+        Args:
+            api_token (str): Alation REST API Authentication Token.
+            object_type (str): Type of Virtual BI Server Object to be Retrieved.
+            limit (int): Maximum number of objects in the page.
+            skip (int): Number of objects to skip before the page starts.
+
+        Returns:
+            list: Virtual BI Server JSON objects.
+
+        """
+        registered_type = self.object_types.get(object_type)
+
+        api_response = self._request('GET', registered_type.url,
+                                     params={'limit': limit, 'skip': skip},
+                                     headers={'Token': api_token}, verify=self.verify_ssl)
+        response_data = api_response.json()
+
+        if api_response.status_code != 200:
+            error_code, title, detail, error = self._format_error(response_data)
+            API_LOGGER.error(
+                f"Error querying the BI {object_type.title()}s of the Virtual BI Server",
+                extra={'API Call': f'Get BI {object_type.title()}s',
+                       'Method': 'GET',
+                       'Host': self.alation_host,
+                       'Response': api_response.status_code,
+                       'Error Code': error_code,
+                       'Error Title': title,
+                       'Error Detail': detail})
+
+        else:
+            API_LOGGER.debug(
+                f"Successfully queried {len(response_data)} BI {object_type.title()}s of the Virtual BI Server",
+                extra={'API Call': f'Get BI {object_type.title()}s',
+                       'Method': 'GET',
+                       'Host': self.alation_host,
+                       'Response': api_response.status_code})
+
+            return response_data
 
     def api_generate_refresh_token(self) -> AlationAuth:
         """Generate the Alation API Refresh Token and initial AlationAuth Object.
@@ -444,12 +530,12 @@ class AlationRestAPI(object):
         request_data = {'username': self.username, 'password': self.password,
                         'name': self.refresh_token}
 
-        api_response = requests.post(token_url, data=request_data,
+        api_response = self._request('POST', token_url, data=request_data,
                                      verify=self.verify_ssl)
         response_data = api_response.json()
 
         if api_response.status_code != 201:
-            error_code, title, detail = self._format_error(response_data)
+            error_code, title, detail, _ = self._format_error(response_data)
             API_LOGGER.error(
                 "Error generating the Alation API Refresh Token",
                 extra={'API Call': 'Generate Refresh Token',
@@ -482,12 +568,12 @@ class AlationRestAPI(object):
         request_data = {'refresh_token': alation_auth.refresh_token,
                         'user_id': alation_auth.user_id}
 
-        api_response = requests.post(access_url, data=request_data,
+        api_response = self._request('POST', access_url, data=request_data,
                                      verify=self.verify_ssl)
         response_data = api_response.json()
 
         if api_response.status_code != 201:
-            error_code, title, detail = self._format_error(response_data)
+            error_code, title, detail, _ = self._format_error(response_data)
             API_LOGGER.error(
                 "Error generating the Alation API Access Token",
                 extra={'API Call': 'Generate Access Token',
@@ -519,12 +605,12 @@ class AlationRestAPI(object):
         request_data = {'refresh_token': alation_auth.refresh_token,
                         'user_id': alation_auth.user_id}
 
-        api_response = requests.post(validate_url, data=request_data,
+        api_response = self._request('POST', validate_url, data=request_data,
                                      verify=self.verify_ssl)
         response_data = api_response.json()
 
         if api_response.status_code != 200:
-            error_code, title, detail = self._format_error(response_data)
+            error_code, title, detail, _ = self._format_error(response_data)
             API_LOGGER.error(
                 f"Error validating the Alation API Refresh Token '{alation_auth.refresh_token}'",
                 extra={'API Call': 'Validate Refresh Token',
@@ -556,12 +642,12 @@ class AlationRestAPI(object):
         request_data = {'api_access_token': alation_auth.access_token,
                         'user_id': alation_auth.user_id}
 
-        api_response = requests.post(validate_url, data=request_data,
+        api_response = self._request('POST', validate_url, data=request_data,
                                      verify=self.verify_ssl)
         response_data = api_response.json()
 
         if api_response.status_code != 200:
-            error_code, title, detail = self._format_error(response_data)
+            error_code, title, detail, _ = self._format_error(response_data)
             API_LOGGER.error(
                 f"Error validating the Alation API Access Token '{alation_auth.access_token}'",
                 extra={'API Call': 'Validate Access Token',
@@ -601,7 +687,7 @@ class AlationRestAPI(object):
             "Token": api_token
         }
 
-        api_response = requests.post(lineage_url, json=payload, headers=headers,
+        api_response = self._request('POST', lineage_url, json=payload, headers=headers,
                                      verify=self.verify_ssl)
         response_data = api_response.json()
 
@@ -629,7 +715,308 @@ class AlationRestAPI(object):
                        'Response': api_response.status_code})
 
             #self.check_jobs_status(self.alation_auth, job)
-            return Job(job_id=response_data.get('job_id'))
+            return Job(job_id=response_data.get('job_id'), object_type='LINEAGE', payload=[payload])
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the pooled session of the Alation host.
+
+        Request bodies above the compression threshold are compressed when enabled. If the
+        host rejects the first compressed body, the request is sent again uncompressed and
+        compression stays disabled for the host. A request whose access token is rejected
+        with a 401 is sent again once with a new access token.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            **kwargs: Keyword arguments passed to requests.Session.request.
+
+        Returns:
+            requests.Response: Alation REST API response.
+
+        """
+        api_response = self._encode_and_send(method, url, **kwargs)
+        api_token = (kwargs.get('headers') or {}).get('Token')
+
+        if api_response.status_code == 401 and api_token:
+            fresh_token = self.reauthenticate(api_token)
+
+            if fresh_token:
+                api_response.close()
+                kwargs['headers'] = {**kwargs['headers'], 'Token': fresh_token}
+                api_response = self._encode_and_send(method, url, **kwargs)
+
+        return api_response
+
+    def reauthenticate(self, rejected_token: str) -> str:
+        """Generate a new access token after the host rejected the current one.
+
+        Concurrent requests rejected with the same token only generate a single new token.
+
+        Args:
+            rejected_token (str): Access token the host rejected.
+
+        Returns:
+            str: New access token, None if no new token could be generated.
+
+        """
+        if self.alation_auth is None:
+            return None
+
+        with self._auth_lock:
+            if self.alation_auth.access_token and self.alation_auth.access_token != rejected_token:
+                return self.alation_auth.access_token
+
+            API_LOGGER.warning(f"{self.alation_host} rejected the API access token, generating a new one")
+            self.api_generate_access_token(self.alation_auth)
+
+            if self.alation_auth.access_token and self.alation_auth.access_token != rejected_token:
+                return self.alation_auth.access_token
+
+        return None
+
+    def _encode_and_send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Encode and, when enabled, compress the request body and send the request.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            **kwargs: Keyword arguments passed to requests.Session.request.
+
+        Returns:
+            requests.Response: Alation REST API response.
+
+        """
+        if 'json' in kwargs:
+            kwargs['data'] = json.dumps(kwargs.pop('json'))
+
+        body = kwargs.get('data')
+        if isinstance(body, str):
+            body = kwargs['data'] = body.encode()
+
+        if (isinstance(body, bytes) and len(body) >= self.compression_threshold
+                and self.request_compression != 'none' and self._compression_accepted is not False):
+            api_response = self._send_compressed(method, url, body, **kwargs)
+
+            if api_response is not None:
+                return api_response
+
+        return self._send(method, url, len(body) if isinstance(body, bytes) else 0, **kwargs)
+
+    def timed_request(self, method: str, url: str, **kwargs) -> tuple:
+        """Send a request through the pooled session of the Alation host and measure its latency.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            **kwargs: Keyword arguments passed to requests.Session.request, verify defaults to
+                the SSL configuration of the host.
+
+        Returns:
+            tuple: Latency in seconds and the Alation REST API response.
+
+        """
+        kwargs.setdefault('verify', self.verify_ssl)
+        start_time = time.perf_counter()
+        api_response = self._request(method, url, **kwargs)
+
+        return time.perf_counter() - start_time, api_response
+
+    def _send_compressed(self, method: str, url: str, body: bytes, **kwargs) -> requests.Response:
+        """Send a request with a compressed body and record the compression savings.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            body (bytes): Uncompressed request body.
+            **kwargs: Keyword arguments passed to requests.Session.request.
+
+        Returns:
+            requests.Response: Alation REST API response, None if the host rejected the encoding.
+
+        """
+        start_time = time.perf_counter()
+        compressor = zlib.compressobj(6, zlib.DEFLATED, self.compression_wbits[self.request_compression])
+        compressed_body = compressor.compress(body) + compressor.flush()
+        compression_seconds = time.perf_counter() - start_time
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers['Content-Encoding'] = self.request_compression
+        kwargs['data'] = compressed_body
+
+        api_response = self._send(method, url, len(compressed_body), headers=headers, **kwargs)
+
+        if self._compression_accepted is None:
+            if self._encoding_rejected(api_response):
+                API_LOGGER.warning(
+                    f"{self.alation_host} rejected {self.request_compression} request bodies, "
+                    f"sending uncompressed requests",
+                    extra={'Method': method,
+                           'Host': self.alation_host,
+                           'Response': api_response.status_code})
+                self._compression_accepted = False
+                return None
+
+            # Other errors say nothing about the encoding, the next compressed request decides
+            if api_response.status_code < 400:
+                self._compression_accepted = True
+
+        # The transfer time saved is estimated from the configured bandwidth of the link to the host
+        saved_bytes = len(body) - len(compressed_body)
+        self.metrics.increment('compression_requests')
+        self.metrics.increment('compression_uncompressed_bytes', len(body))
+        self.metrics.increment('compression_compressed_bytes', len(compressed_body))
+        self.metrics.increment('compression_seconds', compression_seconds)
+        self.metrics.increment('compression_estimated_seconds_saved',
+                               saved_bytes * 8 / (self.upload_bandwidth_mbps * 1000000) - compression_seconds)
+        self.metrics.set('compression_ratio', self.metrics.counters['compression_uncompressed_bytes']
+                         / max(self.metrics.counters['compression_compressed_bytes'], 1))
+
+        return api_response
+
+    @staticmethod
+    def _encoding_rejected(api_response: requests.Response) -> bool:
+        """Return True if the host rejected the Content-Encoding of the request body.
+
+        A 415 always rejects the encoding, a 400 only when its error body refers to the encoding.
+        Any other 400 is a regular error of the request.
+
+        Args:
+            api_response (requests.Response): Response to a compressed request.
+
+        Returns:
+            bool: True if the request must be sent again uncompressed.
+
+        """
+        if api_response.status_code == 415:
+            return True
+
+        if api_response.status_code != 400:
+            return False
+
+        error_body = api_response.text.lower()
+
+        return any(term in error_body for term in ('encoding', 'gzip', 'deflate', 'compress', 'decod'))
+
+    def _send(self, method: str, url: str, request_bytes: int, **kwargs) -> requests.Response:
+        """Send a rate limited request and record its latency.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            request_bytes (int): Size of the request body sent over the wire.
+            **kwargs: Keyword arguments passed to requests.Session.request.
+
+        Returns:
+            requests.Response: Alation REST API response.
+
+        """
+        self.rate_limiter.acquire()
+        if self.autotune is not None:
+            self.autotune.acquire()
+        start_time = time.perf_counter()
+
+        try:
+            api_response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            if self.autotune is not None:
+                self.autotune.record(endpoint_key(method, url), time.perf_counter() - start_time)
+            raise
+        finally:
+            if self.autotune is not None:
+                self.autotune.release()
+
+        seconds = time.perf_counter() - start_time
+        self.metrics.record_request(endpoint_key(method, url), seconds, api_response.status_code, request_bytes)
+        if self.autotune is not None:
+            self.autotune.record(endpoint_key(method, url), seconds, api_response.status_code)
+
+        return api_response
+
+    @staticmethod
+    def autotune_controller(configs: dict) -> AimdController:
+        """Create the AimdController of a host, starting from the settings saved by the last run.
+
+        Args:
+            configs (dict): Script Environment Configurations.
+
+        Returns:
+            AimdController: Controller of the concurrent requests and chunk sizes, None if
+                auto-tuning is disabled.
+
+        """
+        if not configs.get('features_autotune'):
+            return None
+
+        return AimdController(
+            configs.get('features_pipeline_workers', 2), configs.get('alation_pool_size', 10),
+            {'upload': configs.get('features_upload_request_size', 500),
+             'download': configs.get('features_download_json_request_size', 1000)},
+            {'upload': r'POST /integration/v2/(dataflow|bi/server/\{id\}/[a-z/]+)/$',
+             'download': r'GET /integration/v2/bi/server/\{id\}/[a-z/]+/$'},
+            os.path.join(configs.get('features_autotune_directory', 'logs/autotune'),
+                         f"{urlsplit(configs['alation_host']).hostname}.json"))
+
+    def chunk_size(self, name: str, default: int) -> int:
+        """Return the number of objects per request, auto-tuned when enabled.
+
+        Args:
+            name (str): Name of the chunk size, 'upload' or 'download'.
+            default (int): Configured number of objects per request.
+
+        Returns:
+            int: Number of objects per request.
+
+        """
+        return self.autotune.chunk_size(name) if self.autotune is not None else default
+
+    def pipeline_workers(self, default: int) -> int:
+        """Return the number of worker threads of each Upload Pipeline Stage.
+
+        When auto-tuned, every pooled connection gets a worker and the concurrency limit of the
+        AimdController decides how many of them send requests at once.
+
+        Args:
+            default (int): Configured number of worker threads.
+
+        Returns:
+            int: Number of worker threads.
+
+        """
+        return self.autotune.max_concurrency if self.autotune is not None else default
+
+    def _http_adapter(self, configs: dict) -> HTTPAdapter:
+        """Create the transport adapter of the session for the configured HTTP mode.
+
+        In record mode every request and response pair is appended to the cassette of the host,
+        in replay mode the responses are served from the cassette without calling the host.
+
+        Args:
+            configs (dict): Script Environment Configurations.
+
+        Returns:
+            HTTPAdapter: Pooled transport adapter.
+
+        """
+        http_mode = configs.get('alation_http_mode', 'live')
+        cassette_location = configs.get('alation_cassette_location') or os.path.join(
+            'logs', 'cassettes', f'{urlsplit(self.alation_host).hostname}.ndjson')
+
+        if http_mode == 'record':
+            from src.cassette import CassetteRecorder
+
+            return CassetteRecorder(cassette_location, pool_connections=self.pool_size,
+                                    pool_maxsize=self.pool_size)
+
+        if http_mode == 'replay':
+            from src.cassette import CassetteReplayer
+
+            return CassetteReplayer(cassette_location, configs.get('alation_replay_latency_scale', 1),
+                                    pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+
+        if http_mode != 'live':
+            raise ValueError(f"Unsupported HTTP mode '{http_mode}', expected one of ['live', 'record', 'replay']")
+
+        return HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
 
     @property
     def bi_server_id(self) -> int:
@@ -650,6 +1037,38 @@ class AlationRestAPI(object):
 
         """
         self._bi_server_id = server_id
+        self._oid_cache = None
+        self._object_types = None
+
+    @property
+    def object_types(self) -> ObjectTypeRegistry:
+        """Return the Object Type Registry of the Virtual BI Server, built once per BI Server ID.
+
+        Returns:
+            ObjectTypeRegistry: Endpoints, headers, batch limits and serializers of the object types.
+
+        """
+        if not self.bi_server_id:
+            raise ValueError(f'The Virtual BI Server ID is not set. Exiting Request.')
+
+        if self._object_types is None:
+            self._object_types = ObjectTypeRegistry(self.bi_api_url, self.bi_server_id, self.upload_request_size)
+
+        return self._object_types
+
+    @property
+    def oid_cache(self) -> OidCache:
+        """Return the OID Cache of the host and Virtual BI Server, None if the cache is disabled.
+
+        Returns:
+            OidCache: Cache of the resolved Alation IDs.
+
+        """
+        if self._oid_cache is None and self.oid_cache_location and self.bi_server_id:
+            self._oid_cache = OidCache(self.oid_cache_location, urlsplit(self.alation_host).hostname,
+                                       self.bi_server_id)
+
+        return self._oid_cache
 
     @staticmethod
     def _format_error(response: dict) -> tuple:
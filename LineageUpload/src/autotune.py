@@ -0,0 +1,216 @@
+"""Adaptive Concurrency and Chunk Size Control of the Alation Requests."""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+LOGGER = logging.getLogger()
+
+
+class AimdController(object):
+    """Additive increase, multiplicative decrease control of the in-flight requests and chunk sizes.
+
+    The concurrency limit starts from the configured number of pipeline workers and moves between
+    one and the connection pool size, the pipelines run one worker per pooled connection and the
+    limit decides how many of them send at once. Rounds of successful requests are counted per
+    endpoint. Every completed round of an endpoint carrying chunks raises the limit by one and the
+    chunk size fed to that endpoint by a tenth of its configured value, as long as the latency of
+    the endpoint stays within latency_tolerance times the best latency seen. Other endpoints, e.g.
+    the job status polls, never raise the limits. A 429, 5xx or failed request halves the limit
+    and the chunk sizes, at most once per backoff window. The settings reached are saved, so the
+    next run starts from them.
+    """
+
+    def __init__(self, concurrency: int, max_concurrency: int, chunk_sizes: dict, chunk_endpoints: dict,
+                 settings_location: str = None, latency_tolerance: float = 2, backoff_seconds: float = 5):
+        """Create an instance of the AimdController, starting from the saved settings if there are any.
+
+        Args:
+            concurrency (int): Initial number of in-flight requests, e.g. the pipeline workers.
+            max_concurrency (int): Maximum number of in-flight requests, e.g. the connection pool size.
+            chunk_sizes (dict): Configured number of objects per request keyed by name, e.g. 'upload'.
+            chunk_endpoints (dict): Regular expression matching the endpoint keys the chunks are sent
+                to, keyed by chunk size name.
+            settings_location (str): Path to the JSON file the settings are saved to and loaded from.
+            latency_tolerance (float): Latency growth over the best latency which stops the increase.
+            backoff_seconds (float): Minimum number of seconds between two decreases.
+
+        """
+        self.settings_location = settings_location
+        self.latency_tolerance = latency_tolerance
+        self.backoff_seconds = backoff_seconds
+
+        self.max_concurrency = max(max_concurrency, 1)
+        self.chunk_limits = {name: (max(size // 10, 1), size * 4) for name, size in chunk_sizes.items()}
+        self.chunk_steps = {name: max(size // 10, 1) for name, size in chunk_sizes.items()}
+        self.chunk_endpoints = {name: re.compile(pattern) for name, pattern in chunk_endpoints.items()}
+
+        self.limit = min(max(concurrency, 1), self.max_concurrency)
+        self.chunk_sizes = dict(chunk_sizes)
+        self.decreases = 0
+        self.increases = 0
+
+        self._latencies = {}
+        self._successes = {}
+        self._in_flight = 0
+        self._backoff_until = 0
+        self._condition = threading.Condition()
+
+        self.load()
+
+    def acquire(self):
+        """Block until a request is allowed to be sent within the concurrency limit."""
+
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+
+            self._in_flight += 1
+
+    def release(self):
+        """Release the slot of a completed request."""
+
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    def chunk_size(self, name: str) -> int:
+        """Return the current chunk size.
+
+        Args:
+            name (str): Name of the chunk size, e.g. 'upload'.
+
+        Returns:
+            int: Number of objects per request.
+
+        """
+        return self.chunk_sizes[name]
+
+    def chunks_of(self, endpoint: str) -> list:
+        """Return the names of the chunk sizes sent to an endpoint.
+
+        Args:
+            endpoint (str): Endpoint key of a request, e.g. 'POST /integration/v2/dataflow/'.
+
+        Returns:
+            list: Names of the chunk sizes.
+
+        """
+        return [name for name, pattern in self.chunk_endpoints.items() if pattern.match(endpoint)]
+
+    def record(self, endpoint: str, seconds: float, status_code: int = None):
+        """Adjust the limits to the outcome of a request.
+
+        Args:
+            endpoint (str): Endpoint key of the request.
+            seconds (float): Time taken by the request.
+            status_code (int): HTTP status code of the response, None if the request failed.
+
+        """
+        with self._condition:
+            if status_code is None or status_code == 429 or status_code >= 500:
+                self._decrease(endpoint, status_code)
+                return
+
+            # Rejected requests, e.g. 401 or 404, say nothing about the capacity of the host
+            if status_code >= 400:
+                return
+
+            # Exponentially smoothed latency and the best smoothed latency of the endpoint
+            smoothed, best = self._latencies.get(endpoint, (seconds, seconds))
+            smoothed = 0.8 * smoothed + 0.2 * seconds
+            self._latencies[endpoint] = (smoothed, min(best, smoothed))
+
+            chunk_names = self.chunks_of(endpoint)
+            if not chunk_names:
+                return
+
+            self._successes[endpoint] = self._successes.get(endpoint, 0) + 1
+            if self._successes[endpoint] < self.limit:
+                return
+
+            self._successes[endpoint] = 0
+            if smoothed > best * self.latency_tolerance:
+                return
+
+            self.limit = min(self.limit + 1, self.max_concurrency)
+            for name in chunk_names:
+                self.chunk_sizes[name] = min(self.chunk_sizes[name] + self.chunk_steps[name],
+                                             self.chunk_limits[name][1])
+            self.increases += 1
+            self._condition.notify_all()
+
+    def _decrease(self, endpoint: str, status_code: int):
+        """Halve the concurrency limit and the chunk sizes, once per backoff window.
+
+        Args:
+            endpoint (str): Endpoint key of the throttled request.
+            status_code (int): HTTP status code of the response, None if the request failed.
+
+        """
+        now = time.monotonic()
+        if now < self._backoff_until:
+            return
+
+        self._backoff_until = now + self.backoff_seconds
+        self._successes = {}
+        self.limit = max(self.limit // 2, 1)
+        for name, size in self.chunk_sizes.items():
+            self.chunk_sizes[name] = max(size // 2, self.chunk_limits[name][0])
+        self.decreases += 1
+
+        LOGGER.warning(f"{endpoint} returned {status_code}, reducing to {self.limit} concurrent requests "
+                       f"and chunk sizes {self.chunk_sizes}")
+
+    @property
+    def settings(self) -> dict:
+        """Return the current concurrency limit and chunk sizes.
+
+        Returns:
+            dict: Concurrency limit and chunk sizes keyed by name.
+
+        """
+        with self._condition:
+            return {'concurrency': self.limit, 'chunk_sizes': dict(self.chunk_sizes)}
+
+    def save(self):
+        """Save the current settings so the next run starts from them."""
+
+        if not self.settings_location:
+            return
+
+        settings = self.settings
+        directory = os.path.dirname(self.settings_location)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(self.settings_location, 'w') as settings_file:
+            json.dump(settings, settings_file, indent=2)
+
+        LOGGER.info(f"Auto-tuned settings: {settings['concurrency']} concurrent requests, chunk sizes "
+                    f"{settings['chunk_sizes']} ({self.increases} increases, {self.decreases} decreases)")
+
+    def load(self) -> 'AimdController':
+        """Start from the settings saved by a previous run, within the configured limits.
+
+        Returns:
+            AimdController: This AimdController instance.
+
+        """
+        try:
+            with open(self.settings_location, 'r') as settings_file:
+                settings = json.load(settings_file)
+        except (OSError, TypeError, ValueError):
+            LOGGER.debug(f'No auto-tuned settings found at {self.settings_location}')
+            return self
+
+        self.limit = min(max(int(settings.get('concurrency', self.limit)), 1), self.max_concurrency)
+        for name, size in settings.get('chunk_sizes', {}).items():
+            if name in self.chunk_sizes:
+                minimum, maximum = self.chunk_limits[name]
+                self.chunk_sizes[name] = min(max(int(size), minimum), maximum)
+
+        return self
@@ -0,0 +1,229 @@
+"""Record and Replay of the HTTP Traffic with the Alation REST APIs."""
+
+import base64
+import collections
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+LOGGER = logging.getLogger()
+
+# Endpoints exchanging credentials, their request bodies are never digested into the cassette
+AUTH_PATHS = ('/integration/v1/createRefreshToken/', '/integration/v1/createAPIAccessToken/',
+              '/integration/v1/validateRefreshToken/', '/integration/v1/validateAPIAccessToken/')
+
+# Response fields holding credentials, recorded as synthetic values which replay as valid tokens
+SECRET_FIELDS = ('refresh_token', 'api_access_token', 'access_token', 'token', 'password')
+
+# Response headers never written to a cassette
+SECRET_HEADERS = ('set-cookie', 'authorization', 'token')
+
+
+def request_key(request: requests.PreparedRequest) -> tuple:
+    """Return the key matching a request to its recorded response.
+
+    The authentication headers change between runs and are not part of the key. Compressed
+    bodies are keyed by their decompressed content, as gzip headers carry a timestamp.
+
+    Args:
+        request (requests.PreparedRequest): Prepared request.
+
+    Returns:
+        tuple: Method, URL and SHA-1 digest of the request body.
+
+    """
+    body = request.body or b''
+    if isinstance(body, str):
+        body = body.encode()
+
+    if body and request.headers.get('Content-Encoding'):
+        # 47 lets zlib detect both the gzip and the zlib (deflate) framing
+        body = zlib.decompress(body, 47)
+
+    return request.method.upper(), request.url, hashlib.sha1(body).hexdigest()
+
+
+def is_auth_request(url: str) -> bool:
+    """Return True if the URL is an endpoint exchanging credentials.
+
+    Args:
+        url (str): Request URL.
+
+    Returns:
+        bool: True for the refresh and access token endpoints.
+
+    """
+    return urlsplit(url).path.endswith(AUTH_PATHS)
+
+
+def redact(content: bytes) -> bytes:
+    """Replace the credentials of a JSON response body with synthetic values.
+
+    The synthetic values are non-empty, so a replayed authentication still succeeds.
+
+    Args:
+        content (bytes): Response body.
+
+    Returns:
+        bytes: Response body without credentials, unchanged if it holds none.
+
+    """
+    try:
+        document = json.loads(content)
+    except ValueError:
+        return content
+
+    def redact_value(value):
+        if isinstance(value, dict):
+            return {key: f"cassette-{key.replace('_', '-')}" if key.lower() in SECRET_FIELDS and value[key]
+                    else redact_value(value[key]) for key in value}
+        if isinstance(value, list):
+            return [redact_value(item) for item in value]
+        return value
+
+    redacted = redact_value(document)
+
+    return content if redacted == document else json.dumps(redacted).encode()
+
+
+class CassetteRecorder(HTTPAdapter):
+    """Transport adapter appending every request and response pair to an NDJSON cassette.
+
+    Credentials returned by the authentication endpoints are replaced with synthetic values
+    and the bodies of the authentication requests are not digested, so a cassette holds no
+    usable credential.
+    """
+
+    def __init__(self, cassette_location: str, **kwargs):
+        """Create an instance of the CassetteRecorder.
+
+        Args:
+            cassette_location (str): Path of the cassette file, new recordings are appended.
+            **kwargs: Keyword arguments passed to HTTPAdapter.
+
+        """
+        super().__init__(**kwargs)
+
+        self.cassette_location = cassette_location
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(cassette_location)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        start_time = time.perf_counter()
+
+        response = super().send(request, **kwargs)
+        # Reading the body here keeps it available to streaming callers through iter_content
+        content = response.content
+
+        method, url, body_digest = request_key(request)
+        record = {'method': method,
+                  'url': url,
+                  # Credential requests are matched by method and URL only
+                  'body_digest': None if is_auth_request(url) else body_digest,
+                  'status_code': response.status_code,
+                  'reason': response.reason,
+                  'headers': {key: value for key, value in response.headers.items()
+                              if key.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')
+                              + SECRET_HEADERS},
+                  'body': base64.b64encode(redact(content)).decode(),
+                  'elapsed': round(time.perf_counter() - start_time, 6)}
+
+        with self._lock:
+            with open(self.cassette_location, 'a') as cassette_file:
+                cassette_file.write(json.dumps(record) + '\n')
+
+        return response
+
+
+class CassetteReplayer(HTTPAdapter):
+    """Transport adapter serving the responses of a cassette instead of calling the host.
+
+    Responses are matched by method, URL and request body, falling back to method and URL.
+    Repeated requests receive the recorded responses in order, and the last one once they
+    are used up, e.g. a job polled more often than during the recording.
+    """
+
+    def __init__(self, cassette_location: str, latency_scale: float = 1, **kwargs):
+        """Create an instance of the CassetteReplayer.
+
+        Args:
+            cassette_location (str): Path of the recorded cassette file.
+            latency_scale (float): Factor applied to the recorded latencies, 0 replays without waiting.
+            **kwargs: Keyword arguments passed to HTTPAdapter.
+
+        """
+        super().__init__(**kwargs)
+
+        self.cassette_location = cassette_location
+        self.latency_scale = latency_scale
+        self._recordings = {}
+        self._lock = threading.Lock()
+
+        with open(cassette_location, 'r') as cassette_file:
+            for line in cassette_file:
+                if not line.strip():
+                    continue
+
+                record = json.loads(line)
+                for key in ((record['method'], record['url'], record['body_digest']),
+                            (record['method'], record['url'])):
+                    self._recordings.setdefault(key, collections.deque()).append(record)
+
+        LOGGER.info(f"Replaying the HTTP traffic recorded in {cassette_location}")
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        method, url, body_digest = request_key(request)
+
+        with self._lock:
+            recordings = self._recordings.get((method, url, body_digest)) or self._recordings.get((method, url))
+
+            if not recordings:
+                raise requests.exceptions.ConnectionError(f'No recorded response for {method} {url}',
+                                                          request=request)
+
+            record = recordings.popleft() if len(recordings) > 1 else recordings[0]
+
+        if self.latency_scale:
+            time.sleep(record['elapsed'] * self.latency_scale)
+
+        return self._build_response(request, record)
+
+    @staticmethod
+    def _build_response(request: requests.PreparedRequest, record: dict) -> requests.Response:
+        """Build a response from a recorded response.
+
+        Args:
+            request (requests.PreparedRequest): Replayed request.
+            record (dict): Recorded request and response pair.
+
+        Returns:
+            requests.Response: Response with the recorded status, headers and body.
+
+        """
+        content = base64.b64decode(record['body'])
+
+        response = requests.Response()
+        response.status_code = record['status_code']
+        response.reason = record['reason']
+        response.headers = CaseInsensitiveDict(record['headers'])
+        response.url = request.url
+        response.request = request
+        response.raw = io.BytesIO(content)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = content
+        response._content_consumed = True
+
+        return response
@@ -0,0 +1,257 @@
+"""Local Index of the Objects already catalogued on the Virtual BI Server."""
+
+import contextlib
+import hashlib
+import json
+import logging
+import sqlite3
+
+from src.utils import external_id_of
+
+LOGGER = logging.getLogger()
+
+
+class CatalogIndex(object):
+    """Index of existing Virtual BI Server Objects keyed by External ID with content hashes.
+
+    The index is scoped per Alation host and Virtual BI Server, so targets sharing the SQLite
+    file and a BI Server ID keep their own snapshots.
+    """
+
+    CREATE = 'CREATE'
+    UPDATE = 'UPDATE'
+    SKIP = 'SKIP'
+
+    # Fields compared between the catalogued object and the object to be uploaded
+    comparable_fields = {
+        'FOLDER': ['name', 'description_at_source', 'parent_folder', 'url'],
+        'CONNECTION': ['name', 'description_at_source', 'connection_type', 'url'],
+        'DATASOURCE': ['name', 'description_at_source', 'parent_folder', 'datasource_type', 'url'],
+        'DATASOURCE FIELD': ['name', 'description_at_source', 'datasource', 'data_type', 'role'],
+        'REPORT': ['name', 'description_at_source', 'parent_folder', 'report_type', 'url'],
+        'REPORT FIELD': ['name', 'description_at_source', 'report', 'data_type', 'role']
+    }
+
+    # Names of a comparable field in the API responses and in the upload payloads
+    field_aliases = {
+        'url': ('url', 'source_url'),
+        'parent_folder': ('parent_folder', 'parent_folder_id'),
+        'datasource': ('datasource', 'parent_datasource_id'),
+        'report': ('report', 'parent_report_id')
+    }
+
+    def __init__(self, host: str, bi_server_id: int, database_location: str = None):
+        """Create an instance of the CatalogIndex.
+
+        Args:
+            host (str): Alation host the objects belong to.
+            bi_server_id (int): ID of the Virtual Alation BI Server.
+            database_location (str): Optional path to the SQLite file persisting the index.
+
+        """
+        self.host = host
+        self.bi_server_id = bi_server_id
+        self.database_location = database_location
+        self._objects = {object_type: {} for object_type in self.comparable_fields}
+
+        if self.database_location:
+            self.load()
+
+    def content_hash(self, object_type: str, bi_object) -> str:
+        """Hash the comparable fields of a Virtual BI Server object.
+
+        Args:
+            object_type (str): Type of Virtual BI Server Object.
+            bi_object: Virtual BI Server JSON object or BI object model.
+
+        Returns:
+            str: Hex digest of the object content.
+
+        """
+        content = [self._normalize(self._field_value(bi_object, field))
+                   for field in self.comparable_fields[object_type.upper()]]
+
+        return hashlib.sha1(json.dumps(content, default=str).encode()).hexdigest()
+
+    def _field_value(self, bi_object, field: str):
+        """Return the value of a comparable field under any of its API or payload names.
+
+        Args:
+            bi_object: Virtual BI Server JSON object, API response object or BI object model.
+            field (str): Name of the comparable field.
+
+        Returns:
+            Value of the field, None if the object has none of its names.
+
+        """
+        for name in self.field_aliases.get(field, (field,)):
+            value = bi_object.get(name) if isinstance(bi_object, dict) else getattr(bi_object, name, None)
+            if value is not None:
+                return value
+
+        return None
+
+    @staticmethod
+    def _normalize(value):
+        """Normalize a field value, so API responses and upload payloads hash the same.
+
+        References returned as objects are reduced to their External ID, blank strings to None
+        and numbers to text.
+
+        Args:
+            value: Field value.
+
+        Returns:
+            Normalized field value.
+
+        """
+        if isinstance(value, dict):
+            value = value.get('external_id', value.get('id'))
+
+        if isinstance(value, str):
+            value = value.strip() or None
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+
+        return value
+
+    def replace(self, object_type: str, api_objects: list):
+        """Replace the indexed objects of a type with the objects returned by the Alation GBMv2 APIs.
+
+        Args:
+            object_type (str): Type of Virtual BI Server Object.
+            api_objects (list): Alation REST API object response data of every object of the type.
+
+        """
+        self._objects[object_type.upper()] = {}
+        self.load_from_api_objects(object_type, api_objects)
+
+    def add(self, object_type: str, external_id: str, content_hash: str, oid: int = None):
+        """Add a catalogued object to the index.
+
+        Args:
+            object_type (str): Type of Virtual BI Server Object.
+            external_id (str): External ID of the object.
+            content_hash (str): Hash of the object content.
+            oid (int): Alation ID of the object.
+
+        """
+        self._objects[object_type.upper()][external_id] = (oid, content_hash)
+
+    def load_from_api_objects(self, object_type: str, api_objects: list):
+        """Add the objects returned by the Alation GBMv2 APIs to the index.
+
+        Args:
+            object_type (str): Type of Virtual BI Server Object.
+            api_objects (list): Alation REST API object response data.
+
+        """
+        for api_object in api_objects:
+            self.add(object_type, api_object.get('external_id'),
+                     self.content_hash(object_type, api_object), api_object.get('id'))
+
+    def oid(self, object_type: str, external_id: str) -> int:
+        """Return the Alation ID of a catalogued object.
+
+        Args:
+            object_type (str): Type of Virtual BI Server Object.
+            external_id (str): External ID of the object.
+
+        Returns:
+            int: Alation ID, None if the object is not catalogued.
+
+        """
+        return self._objects[object_type.upper()].get(external_id, (None, None))[0]
+
+    def classify(self, object_type: str, bi_object) -> str:
+        """Decide if a Virtual BI Server object must be created, updated or skipped.
+
+        Args:
+            object_type (str): Type of Virtual BI Server Object.
+            bi_object: Virtual BI Server JSON object or BI object model.
+
+        Returns:
+            str: CREATE, UPDATE or SKIP.
+
+        """
+        indexed_object = self._objects[object_type.upper()].get(external_id_of(bi_object))
+
+        if indexed_object is None:
+            return self.CREATE
+
+        if indexed_object[1] != self.content_hash(object_type, bi_object):
+            return self.UPDATE
+
+        return self.SKIP
+
+    def partition(self, object_type: str, bi_objects: list) -> dict:
+        """Split Virtual BI Server objects by the action required to upload them.
+
+        Args:
+            object_type (str): Type of Virtual BI Server Object.
+            bi_objects (list): Virtual BI Server objects to be uploaded.
+
+        Returns:
+            dict: Lists of objects keyed by CREATE, UPDATE and SKIP.
+
+        """
+        partitions = {self.CREATE: [], self.UPDATE: [], self.SKIP: []}
+
+        for bi_object in bi_objects:
+            partitions[self.classify(object_type, bi_object)].append(bi_object)
+
+        LOGGER.info(f"{object_type.title()}s - Create: {len(partitions[self.CREATE])}, "
+                    f"Update: {len(partitions[self.UPDATE])}, Skip: {len(partitions[self.SKIP])}")
+
+        return partitions
+
+    def save(self):
+        """Persist the index into the SQLite database."""
+
+        with contextlib.closing(sqlite3.connect(self.database_location)) as connection, connection:
+            self._create_table(connection)
+            connection.execute('DELETE FROM catalog_index WHERE host = ? AND bi_server_id = ?',
+                               (self.host, self.bi_server_id))
+            connection.executemany(
+                'INSERT INTO catalog_index VALUES (?, ?, ?, ?, ?, ?)',
+                ((self.host, self.bi_server_id, object_type, external_id, oid, content_hash)
+                 for object_type, objects in self._objects.items()
+                 for external_id, (oid, content_hash) in objects.items()))
+
+    def load(self):
+        """Load the index from the SQLite database."""
+
+        with contextlib.closing(sqlite3.connect(self.database_location)) as connection, connection:
+            self._create_table(connection)
+            rows = connection.execute(
+                'SELECT object_type, external_id, oid, content_hash FROM catalog_index '
+                'WHERE host = ? AND bi_server_id = ?', (self.host, self.bi_server_id))
+
+            for object_type, external_id, oid, content_hash in rows:
+                self.add(object_type, external_id, content_hash, oid)
+
+    def __len__(self) -> int:
+        """Return the number of indexed objects."""
+
+        return sum(len(objects) for objects in self._objects.values())
+
+    @staticmethod
+    def _create_table(connection: sqlite3.Connection):
+        """Create the index table if it does not exist.
+
+        An index written before the table was scoped by host is dropped, the next snapshot
+        rebuilds it.
+
+        Args:
+            connection (sqlite3.Connection): SQLite database connection.
+
+        """
+        columns = [row[1] for row in connection.execute('PRAGMA table_info(catalog_index)')]
+        if columns and 'host' not in columns:
+            LOGGER.info('Dropping the catalog index written without Alation hosts')
+            connection.execute('DROP TABLE catalog_index')
+
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS catalog_index ('
+            'host TEXT, bi_server_id INTEGER, object_type TEXT, external_id TEXT, oid INTEGER, content_hash TEXT, '
+            'PRIMARY KEY (host, bi_server_id, object_type, external_id))')
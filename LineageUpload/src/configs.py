@@ -1,13 +1,21 @@
 """Custom Class to work with Script Configurations."""
 
+import collections
 import configparser
+import copy
 import os
-from cryptography.fernet import Fernet, InvalidToken
+import threading
+
+# Parsed Script Configurations keyed by file path, section and file modification time
+_CONFIG_CACHE = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
 
 
 class ConfigEncryption(object):
     """Custom class to Encrypt and Decrypt Script Configurations."""
 
+    token_prefix = 'gAAAAA'
+
     def __init__(self, key_location: str = None):
         """Create an instance of ConfigEncryption.
 
@@ -20,15 +28,44 @@ class ConfigEncryption(object):
         else:
             self.key_location = 'configs/.secrets/.configs.key'
 
-        try:
-            file_size = os.path.getsize(self.key_location)
-        except OSError:
-            file_size = 0
+        self._key = None
+        self._fernet = None
+
+    @property
+    def key(self) -> str:
+        """Return the Fernet encryption key, generating it on first use if it does not exist.
+
+        Returns:
+            str: Fernet encryption key.
+
+        """
+        if self._key is None:
+            try:
+                file_size = os.path.getsize(self.key_location)
+            except OSError:
+                file_size = 0
+
+            if file_size == 0:
+                self._generate_key()
 
-        if file_size == 0:
-            self._generate_key()
+            self._key = self._load_key()
 
-        self.key = self._load_key()
+        return self._key
+
+    @property
+    def fernet(self):
+        """Return the cached Fernet cipher built from the encryption key.
+
+        Returns:
+            Fernet: Fernet cipher.
+
+        """
+        if self._fernet is None:
+            from cryptography.fernet import Fernet
+
+            self._fernet = Fernet(self.key)
+
+        return self._fernet
 
     def encrypt_string(self, plaintext_string: str) -> str:
         """Encrypt a plaintext string and return encoded encrypted bytes value.
@@ -40,10 +77,9 @@ class ConfigEncryption(object):
             str: Encrypted string value.
 
         """
-        f = Fernet(self.key)
         encoded_string = plaintext_string.encode()
 
-        return f.encrypt(encoded_string).decode()
+        return self.fernet.encrypt(encoded_string).decode()
 
     def decrypt_string(self, encrypted_value: str) -> str:
         """Decrypt an encoded bytes value and return plaintext string.
@@ -55,17 +91,35 @@ class ConfigEncryption(object):
             str: Decoded Plaintext String.
 
         """
-        f = Fernet(self.key)
+        # Fernet tokens always start with the version byte, plaintext values are returned as is
+        if not encrypted_value.startswith(self.token_prefix):
+            return encrypted_value
+
+        from cryptography.fernet import InvalidToken
 
         try:
-            decrypted_string = f.decrypt(encrypted_value.encode())
+            decrypted_string = self.fernet.decrypt(encrypted_value.encode())
             return decrypted_string.decode()
         except InvalidToken:
             return encrypted_value
 
+    def decrypt_values(self, values: dict) -> dict:
+        """Decrypt every value of a dictionary, e.g. a whole configuration section.
+
+        Args:
+            values (dict): Encoded encrypted or plaintext values.
+
+        Returns:
+            dict: Decoded Plaintext values with the same keys.
+
+        """
+        return {key: self.decrypt_string(value) for key, value in values.items()}
+
     def _generate_key(self):
         """Generate an Encryption Key and save it into a file."""
 
+        from cryptography.fernet import Fernet
+
         key = Fernet.generate_key()
 
         with open(self.key_location, "wb") as key_file:
@@ -94,31 +148,214 @@ class ParseConfigs(ConfigEncryption):
         """
         super().__init__(key_location=key_location)
 
-    def generate_configs(self, file_location: str) -> dict:
+    def generate_configs(self, file_location: str, section: str = 'Alation') -> dict:
         """Generate the Script Configuration Dictionary.
 
         Args:
             file_location (str): Path to the Configuration ini file.
+            section (str): Name of the Alation section to be used.
+
+        Returns:
+            dict: Script Configurations.
+
+        """
+        def build_configs(configs: configparser.ConfigParser) -> dict:
+            return {**self._alation_configs(configs[section]), **self._feature_configs(configs),
+                    **self._custom_field_configs(configs)}
+
+        return self._cached_configs(file_location, section, build_configs)
+
+    def generate_target_configs(self, file_location: str) -> dict:
+        """Generate the Script Configuration Dictionaries of every Alation target.
+
+        Targets are defined in [Alation:<name>] sections. A file with only the [Alation]
+        section produces a single 'default' target.
+
+        Args:
+            file_location (str): Path to the Configuration ini file.
+
+        Returns:
+            dict: Script Configurations keyed by target name.
+
+        """
+        def build_target_configs(configs: configparser.ConfigParser) -> dict:
+            feature_configs = {**self._feature_configs(configs), **self._custom_field_configs(configs)}
+
+            target_configs = {section.split(':', 1)[1].strip(): {**self._alation_configs(configs[section]),
+                                                                 **feature_configs}
+                              for section in configs.sections() if section.startswith('Alation:')}
+
+            if not target_configs:
+                target_configs['default'] = {**self._alation_configs(configs['Alation']), **feature_configs}
+
+            self._separate_refresh_tokens(target_configs)
+
+            return target_configs
+
+        return self._cached_configs(file_location, 'Alation:*', build_target_configs)
+
+    def _cached_configs(self, file_location: str, section: str, build_configs) -> dict:
+        """Return the memoized Script Configurations, rebuilding them when the file changes.
+
+        Args:
+            file_location (str): Path to the Configuration ini file.
+            section (str): Name of the section(s) the configurations are built from.
+            build_configs (callable): Function building the configurations from the parsed file.
 
         Returns:
             dict: Script Configurations.
 
         """
-        configs = configparser.ConfigParser()
-        configs.read(file_location)
+        try:
+            modified_time = os.stat(file_location).st_mtime_ns
+        except OSError:
+            modified_time = None
+
+        cache_key = (os.path.abspath(file_location), section, os.path.abspath(self.key_location))
+
+        with _CONFIG_CACHE_LOCK:
+            cached_configs = _CONFIG_CACHE.get(cache_key)
+
+        if cached_configs is None or cached_configs[0] != modified_time:
+            configs = configparser.ConfigParser()
+            configs.read(file_location)
+            cached_configs = (modified_time, build_configs(configs))
+
+            with _CONFIG_CACHE_LOCK:
+                _CONFIG_CACHE[cache_key] = cached_configs
+
+        return copy.deepcopy(cached_configs[1])
+
+    @staticmethod
+    def _separate_refresh_tokens(target_configs: dict):
+        """Give every target sharing a Refresh Token file its own file named after the target.
+
+        Each target stores the Refresh Token of its own host, so targets sharing the (default)
+        file would overwrite each other's token.
+
+        Args:
+            target_configs (dict): Script Configurations keyed by target name.
+
+        """
+        token_locations = collections.Counter(configs['alation_refresh_token_location']
+                                              for configs in target_configs.values())
+
+        for target, configs in target_configs.items():
+            token_location = configs['alation_refresh_token_location']
+
+            if token_locations[token_location] > 1:
+                root, extension = os.path.splitext(token_location)
+                configs['alation_refresh_token_location'] = f'{root}_{target}{extension or ".txt"}'
+
+    def _alation_configs(self, section: configparser.SectionProxy) -> dict:
+        """Generate the Alation connection configurations of a single target.
+
+        Args:
+            section (configparser.SectionProxy): Alation section of the Configuration ini file.
+
+        Returns:
+            dict: Alation connection configurations.
+
+        """
+        secrets = self.decrypt_values({key: section[key] for key in
+                                       ('username', 'password', 'refresh_token_name')})
+
+        return {'alation_host': section['host'],
+                'alation_username': secrets['username'],
+                'alation_user_id': section['user_id'],
+                'alation_password': secrets['password'],
+                'alation_refresh_token_name': secrets['refresh_token_name'],
+                'alation_refresh_token_location': section.get('refresh_token_location', fallback='') or
+                                                  'configs/refresh_token.txt',
+                'alation_enable_ssl': section.getboolean('https'),
+                'alation_ssl_cert': self._return_none_if_blank(section['ssl_cert']),
+                'alation_pool_size': section.getint('pool_size', fallback=10),
+                'alation_max_requests_per_second': section.getfloat('max_requests_per_second',
+                                                                    fallback=0),
+                'alation_request_compression': section.get('request_compression', fallback='none').lower(),
+                'alation_compression_threshold': section.getint('compression_threshold', fallback=16384),
+                'alation_upload_bandwidth_mbps': section.getfloat('upload_bandwidth_mbps', fallback=10),
+                'alation_http_mode': section.get('http_mode', fallback='live').lower(),
+                'alation_cassette_location': section.get('cassette_location', fallback='') or None,
+                'alation_replay_latency_scale': section.getfloat('replay_latency_scale', fallback=1)}
+
+    @staticmethod
+    def _custom_field_configs(configs: configparser.ConfigParser) -> dict:
+        """Generate the Custom Field configurations shared by every target.
+
+        Every key of the [CustomFields] section is an object type, its value lists the custom
+        fields of the type as comma separated <custom field name>:<object property> pairs.
+
+        Args:
+            configs (configparser.ConfigParser): Parsed Configuration ini file.
+
+        Returns:
+            dict: Custom fields keyed by object type.
+
+        """
+        custom_fields = {}
+
+        if configs.has_section('CustomFields'):
+            for object_type, fields in configs['CustomFields'].items():
+                custom_fields[object_type.upper()] = [
+                    {field_name.strip(): {'properties': {'f_oid': '', 'property': f'self.{object_property.strip()}'}}}
+                    for field_name, object_property in (field.rsplit(':', 1) for field in fields.split(',')
+                                                        if field.strip())]
+
+        return {'alation_custom_fields': custom_fields}
+
+    @staticmethod
+    def _feature_configs(configs: configparser.ConfigParser) -> dict:
+        """Generate the Script Feature configurations shared by every target.
 
-        return {'alation_username': self.decrypt_string(configs['Alation']['username']),
-                'alation_user_id': configs['Alation']['user_id'],
-                'alation_password': self.decrypt_string(configs['Alation']['password']),
-                'alation_refresh_token_name': self.decrypt_string(configs['Alation']['refresh_token_name']),
-                'alation_refresh_token_location': configs['Alation']['refresh_token_location'],
-                'alation_enable_ssl': configs['Alation'].getboolean('https'),
-                'alation_ssl_cert': self._return_none_if_blank(configs['Alation']['ssl_cert']),
-                'features_download_xml_request_size': int(configs['Features']['download_xml_request_size']),
+        Args:
+            configs (configparser.ConfigParser): Parsed Configuration ini file.
+
+        Returns:
+            dict: Script Feature configurations.
+
+        """
+        return {'features_download_xml_request_size': int(configs['Features']['download_xml_request_size']),
                 'features_download_json_request_size': int(configs['Features']['download_json_request_size']),
                 'features_upload_request_size': int(configs['Features']['upload_request_size']),
                 'features_job_status_sleep': int(configs['Features']['job_status_sleep']),
-                'features_log_retention_period': int(configs['Features']['log_retention_period'])}
+                'features_job_status_max_sleep': configs['Features'].getint('job_status_max_sleep', fallback=30),
+                'features_job_polls_per_second': configs['Features'].getfloat('job_polls_per_second', fallback=0),
+                'features_job_timeout': configs['Features'].getint('job_timeout', fallback=3600),
+                'features_job_max_unknown_polls': configs['Features'].getint('job_max_unknown_polls', fallback=10),
+                'features_log_retention_period': int(configs['Features']['log_retention_period']),
+                'features_log_directory': configs['Features'].get('log_directory', fallback='logs'),
+                'features_dry_run_directory': configs['Features'].get('dry_run_directory', fallback='logs/dry_run'),
+                'features_log_max_bytes': configs['Features'].getint('log_max_bytes', fallback=10485760),
+                'features_log_sample_rate': configs['Features'].getint('log_sample_rate', fallback=1),
+                'features_autotune': configs['Features'].getboolean('autotune', fallback=False),
+                'features_autotune_directory': configs['Features'].get('autotune_directory',
+                                                                       fallback='logs/autotune'),
+                'features_pipeline_queue_size': configs['Features'].getint('pipeline_queue_size', fallback=4),
+                'features_pipeline_workers': configs['Features'].getint('pipeline_workers', fallback=2),
+                'features_metrics_directory': configs['Features'].get('metrics_directory',
+                                                                      fallback='logs/metrics'),
+                'features_spool_directory': configs['Features'].get('spool_directory', fallback='logs/spool'),
+                'features_vds_output_format': configs['Features'].get('vds_output_format', fallback='csv'),
+                'features_vds_output_directory': configs['Features'].get('vds_output_directory', fallback='logs'),
+                'features_vds_partition_output': configs['Features'].getboolean('vds_partition_output',
+                                                                                fallback=False),
+                'features_validation_report_location': configs['Features'].get(
+                    'validation_report_location', fallback='logs/validation_report.csv'),
+                'features_progress_interval': configs['Features'].getfloat('progress_interval', fallback=5),
+                'features_progress_status_location': configs['Features'].get('progress_status_location',
+                                                                             fallback='') or None,
+                'features_oid_cache_location': configs['Features'].get('oid_cache_location',
+                                                                       fallback='logs/oid_cache.db'),
+                'features_parse_workers': configs['Features'].getint('parse_workers', fallback=1),
+                'features_parse_parallel_min_rows': configs['Features'].getint('parse_parallel_min_rows',
+                                                                               fallback=200000),
+                'features_watch_directory': configs['Features'].get('watch_directory', fallback='drop'),
+                'features_watch_poll_interval': configs['Features'].getfloat('watch_poll_interval', fallback=5),
+                'features_watch_queue_size': configs['Features'].getint('watch_queue_size', fallback=4),
+                'features_resubmit_attempts': configs['Features'].getint('resubmit_attempts', fallback=2),
+                'features_lineage_staging_patterns': [pattern.strip() for pattern in configs['Features'].get(
+                    'lineage_staging_patterns', fallback='').split(',') if pattern.strip()]}
 
     def _return_none_if_blank(self, config_value: str) -> str:
         """Helper function to format the Configuration Dictionary. If string value is empty
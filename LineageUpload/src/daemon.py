@@ -0,0 +1,178 @@
+"""Long-running Daemon processing the Mapping Documents dropped into a folder."""
+
+import logging
+import os
+import queue
+import shutil
+import signal
+import threading
+
+LOGGER = logging.getLogger()
+
+_END_OF_STREAM = object()
+
+
+class DropFolderDaemon(object):
+    """Poll a drop folder and process every new mapping workbook through a bounded queue.
+
+    The authenticated clients, caches and imports of the process stay resident between
+    workbooks. On SIGINT or SIGTERM the daemon stops watching, drains the queued workbooks
+    and exits.
+    """
+
+    workbook_extensions = ('.xlsx', '.xlsm')
+
+    def __init__(self, watch_directory: str, process_function, poll_interval: float = 5, queue_size: int = 4):
+        """Create an instance of the DropFolderDaemon.
+
+        Args:
+            watch_directory (str): Directory the mapping workbooks are dropped into.
+            process_function (callable): Function called with the path of every workbook,
+                returning True if the workbook was processed successfully.
+            poll_interval (float): Seconds between two scans of the drop folder.
+            queue_size (int): Maximum number of workbooks waiting to be processed.
+
+        """
+        self.watch_directory = watch_directory
+        self.process_function = process_function
+        self.poll_interval = poll_interval
+
+        self.processing_directory = os.path.join(watch_directory, 'processing')
+        self.processed_directory = os.path.join(watch_directory, 'processed')
+        self.failed_directory = os.path.join(watch_directory, 'failed')
+
+        self.statistics = {'processed': 0, 'failed': 0}
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._seen = {}
+
+    def run(self):
+        """Watch the drop folder until a stop is requested, then drain the queue."""
+
+        for directory in (self.watch_directory, self.processing_directory, self.processed_directory,
+                          self.failed_directory):
+            os.makedirs(directory, exist_ok=True)
+
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signal_number, lambda *_: self.stop())
+
+        worker = threading.Thread(target=self._process_queue, name='drop-folder-worker')
+        worker.start()
+
+        LOGGER.info(f"Watching {self.watch_directory} for mapping workbooks every {self.poll_interval} seconds")
+
+        try:
+            # Workbooks interrupted by a previous shutdown are processed first
+            for file_name in sorted(os.listdir(self.processing_directory)):
+                self._enqueue(os.path.join(self.processing_directory, file_name))
+
+            while not self._stop.is_set():
+                for file_location in self.poll():
+                    self._enqueue(file_location)
+
+                self._stop.wait(self.poll_interval)
+        finally:
+            LOGGER.info(f"Stopping, draining {self._queue.qsize()} queued workbooks")
+            self._queue.put(_END_OF_STREAM)
+            worker.join()
+
+        LOGGER.info(f"Drop folder daemon stopped: {self.statistics}")
+
+    def stop(self):
+        """Request a graceful stop of the daemon."""
+
+        self._stop.set()
+
+    def poll(self) -> list:
+        """Return the workbooks of the drop folder which are complete and not yet queued.
+
+        A workbook is complete once its size and modification time did not change between two scans,
+        so files still being copied are not picked up.
+
+        Returns:
+            list: Paths of the new workbooks, oldest first.
+
+        """
+        ready = []
+        current = {}
+
+        with os.scandir(self.watch_directory) as entries:
+            for entry in entries:
+                if (not entry.is_file() or entry.name.startswith(('~$', '.'))
+                        or not entry.name.lower().endswith(self.workbook_extensions)):
+                    continue
+
+                file_stat = entry.stat()
+                signature = (file_stat.st_size, file_stat.st_mtime_ns)
+                current[entry.path] = signature
+
+                if self._seen.get(entry.path) == signature:
+                    ready.append((file_stat.st_mtime_ns, entry.path))
+
+        # Queued workbooks are moved out of the folder, so they are never picked up twice
+        ready_paths = {path for _, path in ready}
+        self._seen = {path: signature for path, signature in current.items() if path not in ready_paths}
+
+        return [path for _, path in sorted(ready)]
+
+    def _enqueue(self, file_location: str):
+        """Move a workbook into the processing folder and queue it, waiting while the queue is full.
+
+        Args:
+            file_location (str): Path of the workbook.
+
+        """
+        queued_location = file_location
+        if os.path.dirname(os.path.abspath(file_location)) != os.path.abspath(self.processing_directory):
+            queued_location = self.unique_location(self.processing_directory, os.path.basename(file_location))
+            shutil.move(file_location, queued_location)
+
+        while True:
+            try:
+                self._queue.put(queued_location, timeout=self.poll_interval)
+                LOGGER.info(f"Queued mapping workbook {os.path.basename(file_location)}")
+                return
+            except queue.Full:
+                LOGGER.debug(f"Queue full, waiting to queue {os.path.basename(file_location)}")
+
+    @staticmethod
+    def unique_location(directory: str, file_name: str) -> str:
+        """Return a path in the directory which does not overwrite a workbook with the same name.
+
+        Args:
+            directory (str): Directory the workbook is moved into.
+            file_name (str): Name of the workbook.
+
+        Returns:
+            str: Path of the workbook, suffixed with a counter when the name is taken.
+
+        """
+        root, extension = os.path.splitext(file_name)
+        location = os.path.join(directory, file_name)
+        counter = 1
+
+        while os.path.exists(location):
+            location = os.path.join(directory, f'{root}_{counter}{extension}')
+            counter += 1
+
+        return location
+
+    def _process_queue(self):
+        """Process the queued workbooks until the end of the stream."""
+
+        while True:
+            file_location = self._queue.get()
+
+            if file_location is _END_OF_STREAM:
+                return
+
+            try:
+                successful = self.process_function(file_location)
+            except Exception as process_error:
+                LOGGER.error(f"Processing {file_location} failed: {process_error}", exc_info=True)
+                successful = False
+
+            target_directory = self.processed_directory if successful else self.failed_directory
+            shutil.move(file_location, self.unique_location(target_directory, os.path.basename(file_location)))
+            self.statistics['processed' if successful else 'failed'] += 1
@@ -0,0 +1,180 @@
+"""Offline Compilation of the Upload Requests for Dry Runs."""
+
+import json
+import logging
+import os
+from urllib.parse import urlsplit
+
+from src.metrics import RunMetrics
+from src.utils import percentile
+
+LOGGER = logging.getLogger()
+
+JOB_ENDPOINT = 'GET /api/v1/bulk_metadata/job/'
+
+
+class PayloadCompiler(object):
+    """Write the upload requests to NDJSON files and estimate their cost without any network call."""
+
+    def __init__(self, output_directory: str = 'logs/dry_run'):
+        """Create an instance of the PayloadCompiler.
+
+        Args:
+            output_directory (str): Directory the NDJSON payload files are written to.
+
+        """
+        self.output_directory = output_directory
+        self.request_sets = {}
+
+    def add(self, name: str, endpoint: str, request_bodies: list, creates_jobs: bool = True,
+            targets: list = None):
+        """Write a set of request bodies, one request per line, to an NDJSON file.
+
+        Args:
+            name (str): Name of the request set, used as the file name.
+            endpoint (str): Endpoint key the requests are sent to, e.g. 'POST /integration/v2/dataflow/'.
+            request_bodies (list): JSON request bodies, chunked exactly as the uploaders send them.
+            creates_jobs (bool): True if every request starts an Alation Background Job.
+            targets (list): Names of the targets the requests are sent to, None for every target.
+
+        """
+        os.makedirs(self.output_directory, exist_ok=True)
+        file_location = os.path.join(self.output_directory, f'{name}.ndjson')
+        sizes = []
+
+        with open(file_location, 'w') as ndjson_file:
+            for request_body in request_bodies:
+                line = json.dumps(request_body, default=str)
+                sizes.append(len(line.encode()))
+                ndjson_file.write(line + '\n')
+
+        self.request_sets[name] = {'endpoint': endpoint, 'file': file_location,
+                                   'jobs': len(sizes) if creates_jobs else 0,
+                                   'sizes': sorted(sizes), 'targets': targets}
+
+    def add_chunked(self, name: str, endpoint: str, payloads, target_configs: dict):
+        """Write the request bodies of spooled payloads with the chunk size each target uploads with.
+
+        Targets sharing a chunk size share one request set, the sets of other chunk sizes are
+        suffixed with their chunk size.
+
+        Args:
+            name (str): Name of the request set, used as the file name.
+            endpoint (str): Endpoint key the requests are sent to, e.g. 'POST /integration/v2/dataflow/'.
+            payloads (SpooledPayloads): Spooled request payloads.
+            target_configs (dict): Script Environment Configurations keyed by target name.
+
+        """
+        chunk_sizes = {target: self.upload_chunk_size(configs) for target, configs in target_configs.items()}
+
+        for chunk_size in sorted(set(chunk_sizes.values())):
+            targets = [target for target, target_chunk_size in chunk_sizes.items() if target_chunk_size == chunk_size]
+            set_name = name if len(set(chunk_sizes.values())) == 1 else f'{name}_{chunk_size}'
+
+            self.add(set_name, endpoint, payloads.with_chunk_size(chunk_size), targets=targets)
+
+    @staticmethod
+    def upload_chunk_size(configs: dict) -> int:
+        """Return the number of objects per upload request of a target.
+
+        Args:
+            configs (dict): Script Environment Configurations of the target.
+
+        Returns:
+            int: Chunk size auto-tuned by the last run when auto-tuning is enabled, the
+                configured upload request size otherwise.
+
+        """
+        if not configs.get('features_autotune'):
+            return configs['features_upload_request_size']
+
+        from src.alation_rest import AlationRestAPI
+
+        return AlationRestAPI.autotune_controller(configs).chunk_size('upload')
+
+    def report(self, target_configs: dict) -> dict:
+        """Print the request counts, the byte-size distribution and the projected runtime per target.
+
+        The runtime is projected from the per-endpoint latencies recorded by the last run
+        against each target.
+
+        Args:
+            target_configs (dict): Script Environment Configurations keyed by target name.
+
+        Returns:
+            dict: Summary of every request set.
+
+        """
+        summary = {}
+
+        for name, request_set in self.request_sets.items():
+            sizes = request_set['sizes']
+            summary[name] = {'endpoint': request_set['endpoint'],
+                             'file': request_set['file'],
+                             'requests': len(sizes),
+                             'jobs': request_set['jobs'],
+                             'total_bytes': sum(sizes),
+                             'min_bytes': sizes[0] if sizes else 0,
+                             'p50_bytes': percentile(sizes, 50),
+                             'p90_bytes': percentile(sizes, 90),
+                             'p99_bytes': percentile(sizes, 99),
+                             'max_bytes': sizes[-1] if sizes else 0}
+
+            print(f"{name}: {summary[name]['requests']} requests, {summary[name]['jobs']} jobs, "
+                  f"{summary[name]['total_bytes']} bytes -> {request_set['file']}")
+            print(f"    request bytes min/p50/p90/p99/max: {summary[name]['min_bytes']}/"
+                  f"{summary[name]['p50_bytes']}/{summary[name]['p90_bytes']}/"
+                  f"{summary[name]['p99_bytes']}/{summary[name]['max_bytes']}")
+
+        for target, configs in target_configs.items():
+            metrics = RunMetrics(os.path.join(configs['features_metrics_directory'],
+                                              f"{urlsplit(configs['alation_host']).hostname}.json")).load()
+            projected_seconds = 0.0
+            unknown_endpoints = []
+
+            job_latency = metrics.mean_latency(JOB_ENDPOINT)
+            polls_per_job = self.polls_per_job(metrics)
+
+            for name, request_set in summary.items():
+                # Request sets of another chunk size are not sent to the target
+                targets = self.request_sets[name]['targets']
+                if targets is not None and target not in targets:
+                    continue
+
+                request_latency = metrics.mean_latency(request_set['endpoint'])
+
+                if request_latency is None:
+                    unknown_endpoints.append(request_set['endpoint'])
+                else:
+                    projected_seconds += request_set['requests'] * request_latency
+
+                if request_set['jobs'] and job_latency is not None:
+                    projected_seconds += request_set['jobs'] * polls_per_job * job_latency
+
+            # Every pipeline stage processes its requests with the configured number of workers
+            projected_seconds /= max(configs['features_pipeline_workers'], 1)
+
+            print(f"Target '{target}': projected runtime {projected_seconds:.1f} seconds "
+                  f"({polls_per_job:.1f} polls per job)"
+                  + (f" (no recorded latency for {', '.join(unknown_endpoints)})" if unknown_endpoints else ''))
+
+        return summary
+
+    @staticmethod
+    def polls_per_job(metrics: RunMetrics) -> float:
+        """Return the number of status polls a job needed until completion in the recorded run.
+
+        Args:
+            metrics (RunMetrics): Metrics recorded by the last run against a target.
+
+        Returns:
+            float: Average polls per completed job, 1 if the run completed no job.
+
+        """
+        if metrics.counters.get('job_polls_per_completed_job'):
+            return metrics.counters['job_polls_per_completed_job']
+
+        if metrics.counters.get('jobs_completed'):
+            return metrics.counters.get('job_polls', 0) / metrics.counters['jobs_completed'] or 1
+
+        return 1
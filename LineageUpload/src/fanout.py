@@ -0,0 +1,161 @@
+"""Parallel Upload of the same prepared Payloads to several Alation targets."""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.alation_helpers import AlationHelpers
+from src.progress import ProgressReporter
+
+LOGGER = logging.getLogger()
+
+
+class MultiTargetUploader(object):
+    """Fan out an upload to several Alation targets concurrently."""
+
+    def __init__(self, target_configs: dict, progress: ProgressReporter = None):
+        """Create an instance of the MultiTargetUploader.
+
+        Args:
+            target_configs (dict): Script Environment Configurations keyed by target name.
+            progress (ProgressReporter): Progress of the run, shared by every target.
+
+        """
+        self.target_configs = target_configs
+        self.progress = progress
+        self.sessions = {}
+
+    def connect(self, resolve_custom_fields: bool = True) -> dict:
+        """Authenticate with every target in the background.
+
+        The sessions are created while the caller keeps working, e.g. parsing the mapping
+        document, and are reused by every following run.
+
+        Args:
+            resolve_custom_fields (bool): Also start resolving the configured custom field IDs.
+
+        Returns:
+            dict: Futures of the AlationHelpers and AlationAuth objects keyed by target name.
+
+        """
+        executor = ThreadPoolExecutor(max_workers=len(self.target_configs), thread_name_prefix='alation-connect')
+        self.sessions = {name: executor.submit(self._connect, configs, resolve_custom_fields, self.progress)
+                         for name, configs in self.target_configs.items()}
+        executor.shutdown(wait=False)
+
+        return self.sessions
+
+    @staticmethod
+    def _connect(configs: dict, resolve_custom_fields: bool, progress: ProgressReporter = None) -> tuple:
+        """Create the AlationHelpers of a target and authenticate with it.
+
+        Args:
+            configs (dict): Script Environment Configurations of the target.
+            resolve_custom_fields (bool): Also start resolving the configured custom field IDs.
+            progress (ProgressReporter): Progress of the run, shared by every target.
+
+        Returns:
+            tuple: AlationHelpers and AlationAuth objects of the target.
+
+        """
+        alation_helper = AlationHelpers(configs, progress)
+        alation_auth = alation_helper.alation_authentication()
+
+        if resolve_custom_fields:
+            alation_helper.resolve_custom_fields(alation_auth.access_token)
+
+        return alation_helper, alation_auth
+
+    def run(self, upload_function, save_metrics: bool = True) -> dict:
+        """Authenticate with every target and run the upload against each of them in parallel.
+
+        Every target gets its own AlationHelpers instance, so the authentication, the
+        connection pool and the rate limit are never shared between targets. The sessions
+        started by connect() are reused, missing sessions are connected first.
+
+        Args:
+            upload_function (callable): Function called with the AlationHelpers and AlationAuth
+                objects of a target. The prepared payloads are shared between all calls and
+                must not be modified.
+            save_metrics (bool): Save the run metrics and auto-tuned settings of every target for
+                the next run. Runs which do not upload, e.g. the connectivity probe, leave the
+                metrics of the last upload in place.
+
+        Returns:
+            dict: Upload result of every target keyed by target name.
+
+        """
+        if not self.sessions:
+            self.connect()
+
+        with ThreadPoolExecutor(max_workers=len(self.target_configs),
+                                thread_name_prefix='alation-target') as executor:
+            futures = {name: executor.submit(self._run_target, name, configs, self.sessions[name],
+                                             upload_function, save_metrics)
+                       for name, configs in self.target_configs.items()}
+
+            results = {name: future.result() for name, future in futures.items()}
+
+        self.log_results(results)
+
+        return results
+
+    @staticmethod
+    def _run_target(name: str, configs: dict, session, upload_function, save_metrics: bool = True) -> dict:
+        """Run the upload against a single Alation target.
+
+        Args:
+            name (str): Name of the Alation target.
+            configs (dict): Script Environment Configurations of the target.
+            session (concurrent.futures.Future): Future of the target's AlationHelpers and AlationAuth.
+            upload_function (callable): Function running the upload.
+            save_metrics (bool): Save the run metrics and auto-tuned settings of the target.
+
+        Returns:
+            dict: Status, result, error and duration of the target upload. The upload failed
+                if it raised or if objects were still failing after the re-submissions.
+
+        """
+        start_time = time.perf_counter()
+        LOGGER.info(f"Starting the upload to the Alation target '{name}' ({configs['alation_host']})")
+
+        try:
+            alation_helper, alation_auth = session.result()
+            # The helper is reused between uploads, only the failures of this upload count
+            alation_helper.job_results.clear()
+            result = upload_function(alation_helper, alation_auth)
+            if save_metrics:
+                alation_helper.metrics.save()
+                if alation_helper.autotune is not None:
+                    alation_helper.autotune.save()
+
+            failed_count = alation_helper.job_results.failed_count
+            if failed_count:
+                return {'status': 'FAILED', 'result': result,
+                        'error': f"{failed_count} objects or lineage payloads failed to upload",
+                        'seconds': round(time.perf_counter() - start_time, 2)}
+
+            return {'status': 'SUCCESSFUL', 'result': result, 'error': None,
+                    'seconds': round(time.perf_counter() - start_time, 2)}
+
+        except Exception as target_error:
+            LOGGER.error(f"Upload to the Alation target '{name}' failed: {target_error}", exc_info=True)
+
+            return {'status': 'FAILED', 'result': None, 'error': str(target_error),
+                    'seconds': round(time.perf_counter() - start_time, 2)}
+
+    @staticmethod
+    def log_results(results: dict):
+        """Log the upload result of every target.
+
+        Args:
+            results (dict): Upload result of every target keyed by target name.
+
+        """
+        for name, result in results.items():
+            message = f"Target '{name}': {result['status']} in {result['seconds']} seconds"
+
+            if result['error']:
+                LOGGER.error(f"{message} - {result['error']}")
+            else:
+                LOGGER.info(message)
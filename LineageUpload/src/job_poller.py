@@ -0,0 +1,229 @@
+"""Shared, Rate Limited Polling of the Alation Background Jobs."""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from src.models.alation.job import Job
+from src.progress import ProgressReporter
+from src.utils import RateLimiter
+
+if TYPE_CHECKING:
+    from src.alation_rest import AlationRestAPI
+    from src.models.alation.auth import AlationAuth
+
+LOGGER = logging.getLogger()
+
+
+class _PolledJob(object):
+    """Polling state of a single Alation Background Job."""
+
+    def __init__(self, job: Job, alation_auth: 'AlationAuth', interval: float, deadline: float):
+        """Create an instance of the _PolledJob.
+
+        Args:
+            job (Job): Alation Background Job.
+            alation_auth (AlationAuth): Authentication whose current access token is used for every poll.
+            interval (float): Seconds until the next poll.
+            deadline (float): Monotonic time after which the job is marked as failed.
+
+        """
+        self.job = job
+        self.alation_auth = alation_auth
+        self.interval = interval
+        self.deadline = deadline
+        self.unknown_polls = 0
+        self.completed = threading.Event()
+
+
+class JobPoller(object):
+    """Poll every outstanding Alation Background Job of a host from a single thread.
+
+    The job status API returns one job per request, so instead of every pipeline worker
+    polling its own job, the jobs are polled on a shared schedule. The poll interval of a
+    job grows while it keeps running, and the polls of all jobs share one rate limit.
+
+    A job is marked as failed once it passed its deadline, or once its status could not be
+    read for max_unknown_polls consecutive polls, e.g. because the job was purged.
+    """
+
+    def __init__(self, alation_api: 'AlationRestAPI', poll_interval: float = 3, max_poll_interval: float = 30,
+                 polls_per_second: float = 0, progress: ProgressReporter = None, job_timeout: float = 3600,
+                 max_unknown_polls: int = 10):
+        """Create an instance of the JobPoller.
+
+        Args:
+            alation_api (AlationRestAPI): Alation REST API of the host.
+            poll_interval (float): Seconds between the first polls of a job.
+            max_poll_interval (float): Largest number of seconds between two polls of a job.
+            polls_per_second (float): Maximum number of job polls per second, 0 disables the limit.
+            progress (ProgressReporter): Progress the pending and completed jobs are reported to.
+            job_timeout (float): Seconds after which a job still running is marked as failed.
+            max_unknown_polls (int): Consecutive polls without a readable status after which
+                a job is marked as failed.
+
+        """
+        self.alation_api = alation_api
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max(max_poll_interval, poll_interval)
+        self.rate_limiter = RateLimiter(polls_per_second)
+        self.progress = progress or ProgressReporter()
+        self.job_timeout = job_timeout
+        self.max_unknown_polls = max(max_unknown_polls, 1)
+
+        self.polls = 0
+        self.completed_jobs = 0
+
+        # Heap of (next poll time, sequence, polled job)
+        self._schedule = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def wait(self, alation_auth: 'AlationAuth', job: Job):
+        """Block until the Alation Background Job has completed or was marked as failed.
+
+        Args:
+            alation_auth (AlationAuth): Alation REST API Authentication Object, its current
+                access token is read for every poll.
+            job (Job): Alation Background Job.
+
+        """
+        polled_job = _PolledJob(job, alation_auth, self.poll_interval, time.monotonic() + self.job_timeout)
+        self.progress.increment('jobs_pending')
+
+        with self._condition:
+            self._schedule_poll(polled_job)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll_jobs, name='alation-job-poller', daemon=True)
+                self._thread.start()
+
+        # The poller marks the job as failed at its deadline, the timeout only guards against a dead poller
+        if not polled_job.completed.wait(self.job_timeout + self.max_poll_interval * 2):
+            self._fail(polled_job, f'No status received within {self.job_timeout} seconds')
+
+    @property
+    def polls_per_completed_job(self) -> float:
+        """Return the average number of polls needed per completed job.
+
+        Returns:
+            float: Polls per completed job, 0 before the first job completed.
+
+        """
+        return self.polls / self.completed_jobs if self.completed_jobs else 0
+
+    def _poll_jobs(self):
+        """Poll the jobs as they become due, forever."""
+
+        while True:
+            with self._condition:
+                while not self._schedule or self._schedule[0][0] > time.monotonic():
+                    self._condition.wait(self._schedule[0][0] - time.monotonic() if self._schedule else None)
+
+                _, _, polled_job = heapq.heappop(self._schedule)
+
+            try:
+                self._poll(polled_job)
+            except Exception as poll_error:
+                # A job is never lost, it is either polled again or released as failed
+                LOGGER.error(f"Polling the Alation Background Job {polled_job.job.id} failed: {poll_error}",
+                             exc_info=True)
+                self._fail(polled_job, f'Polling failed: {poll_error}')
+
+    def _poll(self, polled_job: _PolledJob):
+        """Poll a job once, then complete, fail or reschedule it.
+
+        Args:
+            polled_job (_PolledJob): Polling state of the job.
+
+        """
+        job = polled_job.job
+
+        # The waiter gave up on the job, see wait
+        if polled_job.completed.is_set():
+            return
+
+        self.rate_limiter.acquire()
+        try:
+            self.alation_api.api_query_job(polled_job.alation_auth.access_token, job)
+        except Exception as poll_error:
+            LOGGER.warning(f"Polling the Alation Background Job {job.id} failed: {poll_error}")
+
+        self.polls += 1
+        self.alation_api.metrics.increment('job_polls')
+
+        if job.status is None:
+            polled_job.unknown_polls += 1
+            LOGGER.debug(f"Job: {job.id}.... status unknown")
+        else:
+            polled_job.unknown_polls = 0
+            job.log_job()
+
+        if job.status is not None and job.completed:
+            self._complete(polled_job)
+        elif polled_job.unknown_polls >= self.max_unknown_polls:
+            self._fail(polled_job, f'Status could not be read in {polled_job.unknown_polls} polls')
+        elif time.monotonic() >= polled_job.deadline:
+            self._fail(polled_job, f'Still {job.status or "unknown"} after {self.job_timeout} seconds')
+        else:
+            polled_job.interval = min(polled_job.interval * 1.5, self.max_poll_interval)
+            with self._condition:
+                self._schedule_poll(polled_job)
+
+    def _schedule_poll(self, polled_job: _PolledJob):
+        """Schedule the next poll of a job, the caller holds the condition.
+
+        Args:
+            polled_job (_PolledJob): Polling state of the job.
+
+        """
+        heapq.heappush(self._schedule, (time.monotonic() + polled_job.interval, next(self._sequence), polled_job))
+        self._condition.notify()
+
+    def _complete(self, polled_job: _PolledJob):
+        """Release the waiter of a completed job.
+
+        Args:
+            polled_job (_PolledJob): Polling state of the job.
+
+        """
+        self.completed_jobs += 1
+        self.alation_api.metrics.increment('jobs_completed')
+        self.alation_api.metrics.set('job_polls_per_completed_job', self.polls_per_completed_job)
+        self._release(polled_job)
+
+    def _fail(self, polled_job: _PolledJob, message: str):
+        """Mark a job whose status cannot be determined as failed and release its waiter.
+
+        Args:
+            polled_job (_PolledJob): Polling state of the job.
+            message (str): Reason the job is marked as failed.
+
+        """
+        if polled_job.completed.is_set():
+            return
+
+        polled_job.job.status = 'FAILED'
+        polled_job.job.message = message
+        LOGGER.error(f"Job: {polled_job.job.id} marked as failed - {message}")
+        self.alation_api.metrics.increment('jobs_abandoned')
+        self._release(polled_job)
+
+    def _release(self, polled_job: _PolledJob):
+        """Report a finished job and wake up its waiter, only once per job.
+
+        Args:
+            polled_job (_PolledJob): Polling state of the job.
+
+        """
+        with self._condition:
+            if polled_job.completed.is_set():
+                return
+            polled_job.completed.set()
+
+        self.progress.increment('jobs_pending', -1)
+        self.progress.increment('jobs_completed')
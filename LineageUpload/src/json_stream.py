@@ -0,0 +1,60 @@
+"""Incremental Parsing of the JSON Array Responses of the Alation REST APIs."""
+
+
+class _ResponseReader(object):
+    """File-like reader over the decoded body chunks of a streamed response."""
+
+    def __init__(self, chunks):
+        """Create an instance of the _ResponseReader.
+
+        Args:
+            chunks (iterator): Decoded body chunks.
+
+        """
+        self._chunks = chunks
+
+    def read(self, size: int = -1) -> bytes:
+        # ijson probes the type of the stream with read(0), which must not consume a chunk
+        if size == 0:
+            return b''
+
+        # ijson only needs some bytes per call, so a single chunk is returned at a time
+        return next(self._chunks, b'')
+
+
+def _ijson():
+    """Import ijson, which the JSON array responses are streamed with.
+
+    Returns:
+        module: ijson module.
+
+    Raises:
+        ImportError: If ijson is not installed. Parsing the whole body at once instead would
+            hold the largest responses in memory.
+
+    """
+    try:
+        import ijson
+    except ImportError as import_error:
+        raise ImportError("ijson is required to stream the JSON array responses of the Alation REST APIs. "
+                          "Install the packages of requirements.txt.") from import_error
+
+    return ijson
+
+
+def iter_json_array(api_response, fields: tuple = None, chunk_size: int = 64 * 1024):
+    """Yield the items of a JSON array response, keeping only the requested fields.
+
+    The body is parsed with ijson while it is downloaded, so only a single item is
+    materialized at a time. The response should be requested with stream=True.
+
+    Args:
+        api_response (requests.Response): Response with a JSON array body.
+        fields (tuple): Names of the fields kept of every item, None keeps every field.
+        chunk_size (int): Number of bytes read from the connection at a time.
+
+    """
+    items = _ijson().items(_ResponseReader(api_response.iter_content(chunk_size)), 'item', use_float=True)
+
+    for item in items:
+        yield {field: item.get(field) for field in fields} if fields and isinstance(item, dict) else item
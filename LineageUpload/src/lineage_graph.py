@@ -0,0 +1,137 @@
+"""In-memory Column Lineage Graph."""
+
+import logging
+import re
+
+LOGGER = logging.getLogger()
+
+
+class LineageGraph(object):
+    """Column level lineage graph keyed by fully qualified column keys (schema.table.column)."""
+
+    def __init__(self, staging_patterns: list = None):
+        """Create an instance of the LineageGraph.
+
+        Args:
+            staging_patterns (list): Regular expressions matching the table names of staging
+                hops which are collapsed by compact().
+
+        """
+        self.staging_patterns = [re.compile(pattern) for pattern in staging_patterns or []]
+        self._sources = {}
+        self._targets = {}
+        self.edges_added = 0
+
+    def add_edge(self, source_key: str, target_key: str):
+        """Add a source to target column edge, duplicates are ignored.
+
+        Args:
+            source_key (str): Fully qualified key of the source column.
+            target_key (str): Fully qualified key of the target column.
+
+        """
+        self.edges_added += 1
+        self._link(source_key, target_key)
+
+    def _link(self, source_key: str, target_key: str):
+        """Link a source column to a target column.
+
+        Args:
+            source_key (str): Fully qualified key of the source column.
+            target_key (str): Fully qualified key of the target column.
+
+        """
+        if source_key == target_key:
+            return
+
+        self._sources.setdefault(target_key, set()).add(source_key)
+        self._targets.setdefault(source_key, set()).add(target_key)
+
+    def add_edges(self, edges):
+        """Add every source to target column edge of an iterable.
+
+        Args:
+            edges (iterable): Tuples of source and target column keys.
+
+        """
+        for source_key, target_key in edges:
+            self.add_edge(source_key, target_key)
+
+    def compact(self) -> int:
+        """Collapse the staging hops, linking their sources directly to their targets.
+
+        A staging column is only removed when it has both upstream and downstream columns,
+        so the ends of the lineage are never lost.
+
+        Returns:
+            int: Number of collapsed staging columns.
+
+        """
+        collapsed = 0
+
+        for column_key in [key for key in self._sources if self.is_staging(key)]:
+            sources = self._sources.get(column_key, set())
+            targets = self._targets.get(column_key, set())
+
+            if not sources or not targets:
+                continue
+
+            for source_key in sources:
+                self._targets[source_key].discard(column_key)
+            for target_key in targets:
+                self._sources[target_key].discard(column_key)
+
+            del self._sources[column_key]
+            del self._targets[column_key]
+
+            for source_key in sources:
+                for target_key in targets:
+                    self._link(source_key, target_key)
+
+            collapsed += 1
+
+        return collapsed
+
+    def is_staging(self, column_key: str) -> bool:
+        """Return True if the column belongs to a staging table.
+
+        Args:
+            column_key (str): Fully qualified column key.
+
+        Returns:
+            bool: True if the table name matches a staging pattern.
+
+        """
+        table_name = self.table_key(column_key)
+
+        return any(pattern.search(table_name) for pattern in self.staging_patterns)
+
+    def paths(self):
+        """Yield the smallest set of lineage paths, one per target column with all of its sources.
+
+        Every target table is represented by a single dataflow object.
+
+        """
+        for target_key in sorted(self._sources, key=self.table_key):
+            sources = self._sources[target_key]
+
+            if sources:
+                yield [sorted(sources), f'api/{self.table_key(target_key)}', target_key]
+
+    def __len__(self) -> int:
+        """Return the number of unique edges in the graph."""
+
+        return sum(len(sources) for sources in self._sources.values())
+
+    @staticmethod
+    def table_key(column_key: str) -> str:
+        """Return the table part of a fully qualified column key.
+
+        Args:
+            column_key (str): Fully qualified column key, e.g. schema_name.table.column.
+
+        Returns:
+            str: Table name, e.g. table.
+
+        """
+        return column_key.split('.', 1)[-1].rsplit('.', 1)[0]
@@ -0,0 +1,263 @@
+"""Logging Configurations, Helpers and Rotation of the Script Log Files."""
+
+import atexit
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+
+LOGGER = logging.getLogger()
+
+# Attributes every LogRecord carries, anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', logging.INFO, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single line JSON documents including their `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a log record.
+
+        Args:
+            record (logging.LogRecord): Log record.
+
+        Returns:
+            str: JSON document of the record.
+
+        """
+        document = {'time': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+                    'level': record.levelname,
+                    'logger': record.name or 'root',
+                    'thread': record.threadName,
+                    'message': record.getMessage()}
+
+        document.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+
+        if record.exc_info:
+            document['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            document['exception'] = record.exc_text
+
+        return json.dumps(document, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Pass only one in every `sample_rate` records of each high-volume call site.
+
+    Only the per-batch records of the Alation REST API logger and of the job status modules
+    are sampled. The first record of every call site, all warnings and errors and every other
+    record, like the section headers, are always passed.
+    """
+
+    def __init__(self, sample_rate: int = 1, logger_names: tuple = ('alation_rest',),
+                 module_names: tuple = ('job', 'job_poller')):
+        """Create an instance of the SamplingFilter.
+
+        Args:
+            sample_rate (int): Keep one in every sample_rate records, 1 disables sampling.
+            logger_names (tuple): Names of the loggers whose records are sampled.
+            module_names (tuple): Names of the modules whose records are sampled.
+
+        """
+        super().__init__()
+        self.sample_rate = max(sample_rate, 1)
+        self.logger_names = set(logger_names)
+        self.module_names = set(module_names)
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return True if the record should be logged.
+
+        Args:
+            record (logging.LogRecord): Log record.
+
+        Returns:
+            bool: True if the record is kept.
+
+        """
+        if self.sample_rate == 1 or record.levelno >= logging.WARNING:
+            return True
+
+        if record.name not in self.logger_names and record.module not in self.module_names:
+            return True
+
+        call_site = (record.pathname, record.lineno)
+
+        with self._lock:
+            count = self._counts.get(call_site, 0)
+            self._counts[call_site] = count + 1
+
+        return count % self.sample_rate == 0
+
+
+class ExceptionQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler keeping the formatted exception of a record in exc_text.
+
+    The default QueueHandler merges the traceback into the message and clears exc_text,
+    so the JSON log lost its exception field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Prepare a record for the queue, resolving the message and the exception to text.
+
+        Args:
+            record (logging.LogRecord): Log record.
+
+        Returns:
+            logging.LogRecord: Copy of the record safe to be formatted by another thread.
+
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+
+        return record
+
+
+class LoggingConfigs(object):
+    """Logging Configurations of the script."""
+
+    @staticmethod
+    def logging_configs(log_directory: str = 'logs', max_bytes: int = 10 * 1024 * 1024,
+                        backup_count: int = 20) -> dict:
+        """Return the logging dictConfig of the script.
+
+        Args:
+            log_directory (str): Directory of the JSON log files.
+            max_bytes (int): Size after which the log file is rotated.
+            backup_count (int): Maximum number of rotated log files kept.
+
+        Returns:
+            dict: Logging configuration for logging.config.dictConfig.
+
+        """
+        os.makedirs(log_directory, exist_ok=True)
+
+        return {
+            'version': 1,
+            'disable_existing_loggers': False,
+            'formatters': {
+                'console': {'format': '%(asctime)s %(levelname)-8s %(message)s'},
+                'json': {'()': JsonFormatter}
+            },
+            'handlers': {
+                'console': {'class': 'logging.StreamHandler',
+                            'level': 'INFO',
+                            'formatter': 'console'},
+                'file': {'class': 'logging.handlers.RotatingFileHandler',
+                         'level': 'DEBUG',
+                         'formatter': 'json',
+                         'filename': os.path.join(log_directory, 'lineage_upload.log'),
+                         'maxBytes': max_bytes,
+                         'backupCount': backup_count,
+                         'encoding': 'utf-8'}
+            },
+            'loggers': {
+                'alation_rest': {'level': 'DEBUG'},
+                'urllib3': {'level': 'WARNING'}
+            },
+            'root': {'level': 'DEBUG', 'handlers': ['console', 'file']}
+        }
+
+    @staticmethod
+    def enable_async_logging(sample_rate: int = 1) -> logging.handlers.QueueListener:
+        """Move the handlers of the root logger behind a queue, so logging threads never format or write.
+
+        The records are formatted and written by a single listener thread, which is stopped
+        and flushed when the interpreter exits.
+
+        Args:
+            sample_rate (int): Keep one in every sample_rate INFO or DEBUG records of each API and job call site.
+
+        Returns:
+            logging.handlers.QueueListener: Started listener writing the records.
+
+        """
+        root_logger = logging.getLogger()
+        handlers = list(root_logger.handlers)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = ExceptionQueueHandler(log_queue)
+        queue_handler.addFilter(SamplingFilter(sample_rate))
+
+        for handler in handlers:
+            root_logger.removeHandler(handler)
+        root_logger.addHandler(queue_handler)
+
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+
+        return listener
+
+
+class LogHelper(object):
+    """Write the section headers of the script log."""
+
+    def __init__(self, logger: logging.Logger = None):
+        """Create an instance of the LogHelper.
+
+        Args:
+            logger (logging.Logger): Logger the headers are written to, defaults to the root logger.
+
+        """
+        self.logger = logger or LOGGER
+
+    def log_header(self, title: str):
+        """Log a section header.
+
+        Args:
+            title (str): Title of the section.
+
+        """
+        self.logger.info(f"{'=' * 20} {title} {'=' * 20}")
+
+    def log_script_start(self):
+        """Log the start of the script."""
+
+        self.log_header(f"Alation Custom Lineage Updater started {datetime.datetime.now():%Y-%m-%d %H:%M:%S}")
+
+
+class LogRotater(object):
+    """Remove the rotated log files older than the retention period."""
+
+    @staticmethod
+    def rotate_logs(retention_period: int, log_directory: str = 'logs') -> int:
+        """Delete the log files which were last written more than retention_period days ago.
+
+        Args:
+            retention_period (int): Number of days log files are kept.
+            log_directory (str): Directory of the log files.
+
+        Returns:
+            int: Number of deleted log files.
+
+        """
+        if not os.path.isdir(log_directory):
+            return 0
+
+        cutoff = time.time() - retention_period * 24 * 60 * 60
+        removed = 0
+
+        for file_name in os.listdir(log_directory):
+            file_location = os.path.join(log_directory, file_name)
+
+            if '.log' in file_name and os.path.isfile(file_location) and os.path.getmtime(file_location) < cutoff:
+                os.remove(file_location)
+                removed += 1
+
+        LOGGER.debug(f"Removed {removed} log files older than {retention_period} days from {log_directory}")
+
+        return removed
@@ -0,0 +1,110 @@
+"""Schema-driven Loader of the Mapping Document."""
+
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas
+
+LOGGER = logging.getLogger()
+
+# Columns of the mapping document used by the script and whether their values repeat
+# heavily enough to be stored as categoricals.
+MAPPING_COLUMNS = {
+    "Target Database / Table Name": 'category',
+    "Target Field Name": 'object',
+    "Data Type Conformity": 'category',
+    "Data Length": 'category',
+    "Nullable": 'category',
+    "Object/Source Table Name": 'category',
+    "Source Field Name": 'object',
+    "Source Data Type": 'category',
+    "Source Field Length": 'category'
+}
+
+
+class MappingDocumentLoader(object):
+    """Load only the required columns of the mapping document with memory efficient dtypes."""
+
+    def __init__(self, columns: dict = None):
+        """Create an instance of the MappingDocumentLoader.
+
+        Args:
+            columns (dict): Required column names and their dtypes, defaults to MAPPING_COLUMNS.
+
+        """
+        self.columns = columns or MAPPING_COLUMNS
+
+    def validate_schema(self, header_columns: list):
+        """Check that every required column is present in the mapping document.
+
+        Args:
+            header_columns (list): Column names found in the mapping document.
+
+        """
+        missing_columns = [column for column in self.columns if column not in set(header_columns)]
+
+        if missing_columns:
+            raise ValueError(f"The mapping document is missing the required columns: {missing_columns}")
+
+    def load(self, file_location: str, sheet_name=0) -> 'pandas.DataFrame':
+        """Validate the schema and load the required columns of the mapping document.
+
+        Args:
+            file_location (str): Path to the mapping document.
+            sheet_name (str|int): Name or position of the mapping sheet.
+
+        Returns:
+            pandas.DataFrame: Mapping document.
+
+        """
+        import pandas as pd
+
+        self.validate_schema(self.read_header(file_location, sheet_name))
+
+        pd_df_mapfile_in = pd.read_excel(file_location, sheet_name=sheet_name, engine="openpyxl",
+                                         usecols=lambda column: column in self.columns)
+
+        return self.apply_dtypes(pd_df_mapfile_in)
+
+    @staticmethod
+    def read_header(file_location: str, sheet_name=0) -> list:
+        """Read only the header row of the mapping sheet, without loading the whole workbook.
+
+        Args:
+            file_location (str): Path to the mapping document.
+            sheet_name (str|int): Name or position of the mapping sheet.
+
+        Returns:
+            list: Column names of the mapping sheet.
+
+        """
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(file_location, read_only=True)
+
+        try:
+            worksheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+            return [column for column in next(worksheet.iter_rows(max_row=1, values_only=True), ())
+                    if column is not None]
+        finally:
+            workbook.close()
+
+    def apply_dtypes(self, pd_df_mapfile_in: 'pandas.DataFrame') -> 'pandas.DataFrame':
+        """Cast the repeating columns of the mapping document to categoricals.
+
+        Args:
+            pd_df_mapfile_in (pandas.DataFrame): Mapping document.
+
+        Returns:
+            pandas.DataFrame: Mapping document with the configured dtypes.
+
+        """
+        for column, dtype in self.columns.items():
+            if dtype == 'category' and column in pd_df_mapfile_in.columns:
+                pd_df_mapfile_in[column] = pd_df_mapfile_in[column].astype('category')
+
+        LOGGER.debug(f"Loaded {len(pd_df_mapfile_in)} mapping rows using "
+                     f"{pd_df_mapfile_in.memory_usage(deep=True).sum()} bytes")
+
+        return pd_df_mapfile_in
@@ -0,0 +1,138 @@
+"""Run Metrics recorded while talking to the Alation REST APIs."""
+
+import json
+import logging
+import os
+import re
+import threading
+from urllib.parse import urlsplit
+
+LOGGER = logging.getLogger()
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """Return the key identifying the endpoint of a request, independent of IDs and query strings.
+
+    Args:
+        method (str): HTTP method.
+        url (str): Request URL.
+
+    Returns:
+        str: Endpoint key, e.g. 'POST /integration/v2/bi/server/{id}/report/'.
+
+    """
+    return f"{method.upper()} {re.sub(r'/[0-9]+(?=/|$)', '/{id}', urlsplit(url).path)}"
+
+
+class RunMetrics(object):
+    """Thread safe counters and per-endpoint latencies of a run, kept in constant memory."""
+
+    def __init__(self, file_location: str = None):
+        """Create an instance of RunMetrics.
+
+        Args:
+            file_location (str): Path to the JSON file the latencies are saved to and loaded from.
+
+        """
+        self.file_location = file_location
+        self.endpoints = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def record_request(self, endpoint: str, seconds: float, status_code: int = None,
+                       request_bytes: int = 0):
+        """Record the latency of a single request.
+
+        Args:
+            endpoint (str): Endpoint key of the request.
+            seconds (float): Time taken by the request.
+            status_code (int): HTTP status code of the response.
+            request_bytes (int): Size of the request body.
+
+        """
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, {'requests': 0, 'errors': 0, 'total_seconds': 0.0,
+                                                         'min_seconds': seconds, 'max_seconds': seconds,
+                                                         'request_bytes': 0})
+            stats['requests'] += 1
+            stats['total_seconds'] += seconds
+            stats['min_seconds'] = min(stats['min_seconds'], seconds)
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['request_bytes'] += request_bytes
+
+            if status_code is not None and status_code >= 400:
+                stats['errors'] += 1
+
+    def increment(self, counter: str, value: float = 1):
+        """Increment a named run counter.
+
+        Args:
+            counter (str): Name of the counter.
+            value (float): Value added to the counter.
+
+        """
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def set(self, counter: str, value: float):
+        """Set a named run counter.
+
+        Args:
+            counter (str): Name of the counter.
+            value (float): Value of the counter.
+
+        """
+        with self._lock:
+            self.counters[counter] = value
+
+    def mean_latency(self, endpoint: str) -> float:
+        """Return the mean latency of an endpoint.
+
+        Args:
+            endpoint (str): Endpoint key.
+
+        Returns:
+            float: Mean latency in seconds, None if the endpoint was never called.
+
+        """
+        stats = self.endpoints.get(endpoint)
+
+        if not stats or not stats['requests']:
+            return None
+
+        return stats['total_seconds'] / stats['requests']
+
+    def save(self):
+        """Save the per-endpoint latencies so the next run can use them."""
+
+        if not self.file_location:
+            return
+
+        with self._lock:
+            data = {'endpoints': self.endpoints, 'counters': self.counters}
+
+        directory = os.path.dirname(self.file_location)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(self.file_location, 'w') as metrics_file:
+            json.dump(data, metrics_file, indent=2)
+
+    def load(self) -> 'RunMetrics':
+        """Load the per-endpoint latencies recorded by a previous run.
+
+        Returns:
+            RunMetrics: This RunMetrics instance.
+
+        """
+        try:
+            with open(self.file_location, 'r') as metrics_file:
+                data = json.load(metrics_file)
+        except (OSError, TypeError, ValueError):
+            LOGGER.debug(f'No recorded run metrics found at {self.file_location}')
+            return self
+
+        self.endpoints = data.get('endpoints', {})
+        self.counters = data.get('counters', {})
+
+        return self
@@ -1,6 +1,11 @@
 """Alation Background Job."""
 
+import hashlib
+import json
 import logging
+import threading
+
+from src.utils import external_id_of
 
 LOGGER = logging.getLogger()
 
@@ -8,18 +13,23 @@ LOGGER = logging.getLogger()
 class Job(object):
     """Alation Background Job."""
 
-    def __init__(self, job_id: int, api_response: dict = None):
+    def __init__(self, job_id: int, api_response: dict = None, object_type: str = None,
+                 payload: list = None):
         """Create an instance of the Alation Background Job.
 
         Args:
             job_id (int): ID of the Alation Background Job.
             api_response (dict): Alation REST API Get Job Status Response Data.
+            object_type (str): Type of the Virtual BI Server Objects submitted in the Job.
+            payload (list): Objects submitted in the Job.
 
         """
         self._id = job_id
         self._status = None
         self._message = None
         self._result = None
+        self.object_type = object_type
+        self.payload = payload
 
         if api_response:
             self.load_from_api_response(api_response)
@@ -128,6 +138,41 @@ class Job(object):
         """
         self._result = result
 
+    @property
+    def failures(self) -> list:
+        """Return the objects the Alation Job reported as failed.
+
+        Returns:
+            list: Dictionaries with the External ID (None when not reported) and the error message.
+
+        """
+        failures = []
+
+        for entry in self.result or []:
+            if not isinstance(entry, dict):
+                continue
+
+            for key in ('error_objects', 'failed_objects', 'errors'):
+                for failed_object in entry.get(key) or []:
+                    if isinstance(failed_object, dict):
+                        failures.append({'external_id': failed_object.get('external_id', failed_object.get('key')),
+                                         'error': failed_object.get('error', failed_object.get('message',
+                                                                                                failed_object))})
+                    else:
+                        failures.append({'external_id': None, 'error': failed_object})
+
+        return failures
+
+    @property
+    def failed_external_ids(self) -> set:
+        """Return the External IDs of the objects the Alation Job reported as failed.
+
+        Returns:
+            set: External IDs of the failed objects.
+
+        """
+        return {failure['external_id'] for failure in self.failures if failure['external_id'] is not None}
+
     def load_from_api_response(self, api_response: dict):
         """Load the Object properties form Alation REST API Get Job Response.
 
@@ -154,3 +199,192 @@ class Job(object):
                 LOGGER.info(message)
             else:
                 LOGGER.error(message)
+
+
+class JobResultAggregator(object):
+    """Aggregate the results and object failures of the Alation Jobs of a run.
+
+    Failures are tracked per submitted object, so an object which succeeds when it is
+    submitted again no longer counts as failed. Reported failures which cannot be matched to a
+    submitted object, e.g. the errors of lineage payloads without External IDs, are kept per Job
+    until the objects they may belong to are submitted again.
+    """
+
+    def __init__(self):
+        """Create an instance of the JobResultAggregator."""
+
+        self.jobs = {}
+        self._failures = {}
+        # Keys of the objects every unmatched failure may belong to, keyed by object type and failure key
+        self._unmatched = {}
+        self._lock = threading.Lock()
+
+    @property
+    def failures(self) -> dict:
+        """Return the outstanding object failures.
+
+        Returns:
+            dict: Lists of failures with the External ID and the error message, keyed by object type.
+
+        """
+        with self._lock:
+            return {object_type: list(failures.values()) for object_type, failures in self._failures.items()}
+
+    @property
+    def failed_count(self) -> int:
+        """Return the number of objects which are still failing.
+
+        Returns:
+            int: Number of outstanding object failures.
+
+        """
+        with self._lock:
+            return sum(len(failures) for failures in self._failures.values())
+
+    def clear(self):
+        """Forget the Jobs and failures of a previous upload."""
+
+        with self._lock:
+            self.jobs = {}
+            self._failures = {}
+            self._unmatched = {}
+
+    def add(self, job: Job):
+        """Add a completed Alation Job to the aggregate.
+
+        Failures of earlier attempts are cleared for the objects the Job submitted successfully.
+
+        Args:
+            job (Job): Completed Alation Background Job.
+
+        """
+        object_type = job.object_type or 'UNKNOWN'
+        failed_objects = self.failed_objects(job)
+        failed_keys = {self._object_key(failed_object) for failed_object in failed_objects}
+        errors = {failure['external_id']: failure['error'] for failure in job.failures}
+        submitted_ids = {self._external_id(submitted_object) for submitted_object in job.payload or []}
+        unmatched_failures = [failure for failure in job.failures
+                              if failure['external_id'] is None or failure['external_id'] not in submitted_ids]
+
+        with self._lock:
+            counts = self.jobs.setdefault(object_type, {'successful': 0, 'failed': 0})
+            counts['successful' if job.success else 'failed'] += 1
+            failures = self._failures.setdefault(object_type, {})
+            unmatched = self._unmatched.setdefault(object_type, {})
+
+            # The outcome of this Job replaces the failures of earlier submissions of its objects
+            for submitted_object in job.payload or []:
+                object_key = self._object_key(submitted_object)
+                failures.pop(object_key, None)
+
+                for failure_key, object_keys in list(unmatched.items()):
+                    if object_key in object_keys:
+                        del unmatched[failure_key]
+                        failures.pop(failure_key, None)
+
+            for failed_object in failed_objects:
+                external_id = self._external_id(failed_object)
+                # Objects resubmitted because of unmatched failures are reported by those failures
+                if unmatched_failures and external_id not in job.failed_external_ids:
+                    continue
+
+                failures[self._object_key(failed_object)] = {
+                    'external_id': external_id, 'error': errors.get(external_id, job.message or job.status)}
+
+            for index, failure in enumerate(unmatched_failures):
+                failures[(job.id, index)] = failure
+                if failed_keys:
+                    unmatched[(job.id, index)] = failed_keys
+
+    def add_failed_submission(self, object_type: str, submitted_objects: list, error: str):
+        """Record objects whose submission did not start an Alation Job.
+
+        Args:
+            object_type (str): Type of the submitted objects.
+            submitted_objects (list): Objects which could not be submitted.
+            error (str): Reason of the failure.
+
+        """
+        with self._lock:
+            failures = self._failures.setdefault(object_type or 'UNKNOWN', {})
+
+            for submitted_object in submitted_objects:
+                failures[self._object_key(submitted_object)] = {'external_id': self._external_id(submitted_object),
+                                                                'error': error}
+
+    def failed_objects(self, job: Job) -> list:
+        """Return the submitted objects of an Alation Job which need to be submitted again.
+
+        A Job which failed without any per-object failure report, or which reported failures
+        that match none of its objects, e.g. a lineage payload, is retried with its whole payload.
+
+        Args:
+            job (Job): Completed Alation Background Job.
+
+        Returns:
+            list: Submitted objects which failed.
+
+        """
+        if not job.payload:
+            return []
+
+        failed_external_ids = job.failed_external_ids
+
+        if failed_external_ids:
+            failed_objects = [bi_object for bi_object in job.payload
+                              if JobResultAggregator._external_id(bi_object) in failed_external_ids]
+            if failed_objects:
+                return failed_objects
+
+        return list(job.payload) if job.failures or not job.success else []
+
+    @staticmethod
+    def _external_id(submitted_object) -> str:
+        """Return the External ID of a submitted object, None for objects without one like lineage payloads.
+
+        Args:
+            submitted_object: Virtual BI Server object or lineage dataflow payload.
+
+        Returns:
+            str: External ID of the object.
+
+        """
+        try:
+            return external_id_of(submitted_object)
+        except AttributeError:
+            return None
+
+    @classmethod
+    def _object_key(cls, submitted_object):
+        """Return the key a submitted object's failure is tracked under across attempts.
+
+        Args:
+            submitted_object: Virtual BI Server object or lineage dataflow payload.
+
+        Returns:
+            str: External ID of the object, or a digest of its content when it has none.
+
+        """
+        external_id = cls._external_id(submitted_object)
+
+        if external_id is not None:
+            return external_id
+
+        return hashlib.sha1(json.dumps(submitted_object, sort_keys=True, default=str).encode()).hexdigest()
+
+    def log_summary(self):
+        """Log the aggregated Job results per object type."""
+
+        outstanding_failures = self.failures
+
+        for object_type, counts in self.jobs.items():
+            failures = outstanding_failures.get(object_type, [])
+            message = (f"{object_type.title()} Jobs - Successful: {counts['successful']}, "
+                       f"Failed: {counts['failed']}, Failed objects: {len(failures)}")
+
+            if failures:
+                LOGGER.error(message)
+                for failure in failures[:20]:
+                    LOGGER.error(f"    - {failure['external_id']}: {failure['error']}")
+            else:
+                LOGGER.info(message)
@@ -0,0 +1,138 @@
+"""Registry of the Virtual BI Server Object Types accepted by the Alation GBMv2 APIs."""
+
+import json
+
+
+class ObjectType(object):
+    """Endpoint, headers, batch limits and serializer of a single GBMv2 object type."""
+
+    json_headers = {"Accept": "application/json", "Content-Type": "application/json"}
+    lookup_query = "?keyField=external_id&oids="
+
+    def __init__(self, name: str, url: str, batch_size: int, custom_field_otype: str = None,
+                 max_url_length: int = 8192):
+        """Create an instance of the ObjectType.
+
+        Args:
+            name (str): Upper case name of the object type, e.g. 'REPORT FIELD'.
+            url (str): Endpoint of the object type on the Virtual BI Server.
+            batch_size (int): Maximum number of objects created by a single request.
+            custom_field_otype (str): Alation otype used when updating custom field values.
+            max_url_length (int): Maximum URL length accepted by the host, nginx defaults to 8192.
+
+        """
+        self.name = name
+        self.title = name.title()
+        self.url = url
+        self.batch_size = batch_size
+        self.custom_field_otype = custom_field_otype
+
+        # Room left for the comma separated External IDs of a lookup request
+        self.lookup_capacity = max_url_length - len(self.lookup_query) - len(url)
+
+    def headers(self, api_token: str) -> dict:
+        """Return the JSON request headers with the authentication token.
+
+        Args:
+            api_token (str): Alation REST API Authentication Token.
+
+        Returns:
+            dict: Request headers.
+
+        """
+        return {**self.json_headers, 'Token': api_token}
+
+    @staticmethod
+    def serialize(bi_objects: list) -> str:
+        """Serialize the Virtual BI Server objects into a request body.
+
+        Args:
+            bi_objects (list): Virtual BI Server JSON objects.
+
+        Returns:
+            str: JSON request body.
+
+        """
+        return json.dumps(bi_objects, default=str)
+
+    def lookup_batches(self, bi_objects: list) -> list:
+        """Split the objects into lookup requests which fit the maximum URL length.
+
+        Args:
+            bi_objects (list): Virtual BI Server objects with External IDs.
+
+        Returns:
+            list: Tuples of the lookup URL and the objects it looks up.
+
+        """
+        # The batch size is estimated from the first External ID, as GUIDs share the same length
+        batch_size = max(int(abs(self.lookup_capacity / (len(bi_objects[0].external_id()) + 1))), 1)
+
+        return [(f"{self.url}{self.lookup_query}{''.join(bi_object.external_id() + ',' for bi_object in batch)}",
+                 batch)
+                for batch in (bi_objects[x:x + batch_size] for x in range(0, len(bi_objects), batch_size))]
+
+
+class ObjectTypeRegistry(object):
+    """Object types of a single Virtual BI Server, built once per BI Server ID."""
+
+    # Endpoint path relative to the Virtual BI Server and custom field otype of every GBMv2 object type
+    object_types = {'FOLDER': ('folder/', None),
+                    'CONNECTION': ('connection/', None),
+                    'DATASOURCE': ('datasource/', None),
+                    'DATASOURCE FIELD': ('datasource/column/', None),
+                    'REPORT': ('report/', 'bi_report'),
+                    'REPORT FIELD': ('report/column/', 'bi_report_column')}
+
+    def __init__(self, bi_api_url: str, bi_server_id: int, batch_size: int = 500):
+        """Create an instance of the ObjectTypeRegistry.
+
+        Args:
+            bi_api_url (str): URL of the Alation BI Server API.
+            bi_server_id (int): ID of the Virtual BI Server.
+            batch_size (int): Default maximum number of objects created by a single request.
+
+        """
+        self.bi_server_id = bi_server_id
+        self._types = {name: ObjectType(name, f'{bi_api_url}/{bi_server_id}/{path}', batch_size, otype)
+                       for name, (path, otype) in self.object_types.items()}
+
+    def get(self, object_type: str) -> ObjectType:
+        """Return the registered object type, ignoring the case of its name.
+
+        Args:
+            object_type (str): Name of the object type.
+
+        Returns:
+            ObjectType: Registered object type.
+
+        """
+        try:
+            return self._types[object_type]
+        except KeyError:
+            registered_type = self._types.get(object_type.upper())
+
+        if registered_type is None:
+            raise ValueError(f'GBMv2 does not accept the object type: {object_type.title()}')
+
+        # Later lookups of the same spelling skip the upper casing
+        self._types[object_type] = registered_type
+
+        return registered_type
+
+    def accepts(self, object_type: str) -> bool:
+        """Return True if GBMv2 accepts the object type, the spelling is normalized once by get.
+
+        Args:
+            object_type (str): Name of the object type.
+
+        Returns:
+            bool: True if the object type is accepted.
+
+        """
+        try:
+            self.get(object_type)
+        except ValueError:
+            return False
+
+        return True
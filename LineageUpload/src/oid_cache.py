@@ -0,0 +1,132 @@
+"""Persistent Cache of the Alation IDs resolved for Virtual BI Server Objects."""
+
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+
+LOGGER = logging.getLogger()
+
+
+class OidCache(object):
+    """SQLite cache mapping the External IDs of Virtual BI Server Objects to their Alation IDs.
+
+    The cache is scoped per Alation host and Virtual BI Server, the entries of the scope are
+    kept in memory and every change is written through to the SQLite database.
+    """
+
+    def __init__(self, database_location: str, host: str, bi_server_id: int):
+        """Create an instance of the OidCache and load the cached entries of the scope.
+
+        Args:
+            database_location (str): Path to the SQLite file persisting the cache.
+            host (str): Alation host the objects belong to.
+            bi_server_id (int): ID of the Virtual Alation BI Server.
+
+        """
+        self.database_location = database_location
+        self.host = host
+        self.bi_server_id = bi_server_id
+        self.hits = 0
+        self.misses = 0
+
+        self._oids = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(database_location)), exist_ok=True)
+
+        with contextlib.closing(sqlite3.connect(self.database_location)) as connection, connection:
+            self._create_table(connection)
+            rows = connection.execute(
+                'SELECT object_type, external_id, oid FROM oid_cache WHERE host = ? AND bi_server_id = ?',
+                (self.host, self.bi_server_id))
+
+            for object_type, external_id, oid in rows:
+                self._oids.setdefault(object_type, {})[external_id] = oid
+
+    def get_many(self, object_type: str, external_ids: list) -> dict:
+        """Return the cached Alation IDs of a list of objects.
+
+        Args:
+            object_type (str): Type of Virtual BI Server Object.
+            external_ids (list): External IDs of the objects.
+
+        Returns:
+            dict: Alation IDs keyed by External ID, only for the cached objects.
+
+        """
+        with self._lock:
+            cached_oids = self._oids.get(object_type.upper(), {})
+            found = {external_id: cached_oids[external_id] for external_id in external_ids
+                     if external_id in cached_oids}
+
+            self.hits += len(found)
+            self.misses += len(external_ids) - len(found)
+
+        return found
+
+    def put_many(self, object_type: str, oids: dict):
+        """Add resolved Alation IDs to the cache.
+
+        Args:
+            object_type (str): Type of Virtual BI Server Object.
+            oids (dict): Alation IDs keyed by External ID.
+
+        """
+        if not oids:
+            return
+
+        with self._lock:
+            self._oids.setdefault(object_type.upper(), {}).update(oids)
+
+            with contextlib.closing(sqlite3.connect(self.database_location)) as connection, connection:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO oid_cache VALUES (?, ?, ?, ?, ?)',
+                    ((self.host, self.bi_server_id, object_type.upper(), external_id, oid)
+                     for external_id, oid in oids.items()))
+
+    def invalidate(self, object_type: str, external_ids: list):
+        """Remove objects from the cache, e.g. because they are created again with new Alation IDs.
+
+        Args:
+            object_type (str): Type of Virtual BI Server Object.
+            external_ids (list): External IDs of the objects.
+
+        """
+        with self._lock:
+            cached_oids = self._oids.get(object_type.upper(), {})
+            stale_ids = [external_id for external_id in external_ids if external_id in cached_oids]
+
+            if not stale_ids:
+                return
+
+            for external_id in stale_ids:
+                del cached_oids[external_id]
+
+            with contextlib.closing(sqlite3.connect(self.database_location)) as connection, connection:
+                connection.executemany(
+                    'DELETE FROM oid_cache WHERE host = ? AND bi_server_id = ? AND object_type = ? '
+                    'AND external_id = ?',
+                    ((self.host, self.bi_server_id, object_type.upper(), external_id)
+                     for external_id in stale_ids))
+
+        LOGGER.debug(f"Invalidated {len(stale_ids)} cached {object_type.title()} OIDs")
+
+    def __len__(self) -> int:
+        """Return the number of cached objects."""
+
+        return sum(len(oids) for oids in self._oids.values())
+
+    @staticmethod
+    def _create_table(connection: sqlite3.Connection):
+        """Create the cache table if it does not exist.
+
+        Args:
+            connection (sqlite3.Connection): SQLite database connection.
+
+        """
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS oid_cache ('
+            'host TEXT, bi_server_id INTEGER, object_type TEXT, external_id TEXT, oid INTEGER, '
+            'PRIMARY KEY (host, bi_server_id, object_type, external_id))')
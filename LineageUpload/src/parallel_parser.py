@@ -0,0 +1,269 @@
+"""Process-pool Parallel Parsing of the Mapping Document."""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING
+
+from src.mapping_schema import MAPPING_COLUMNS
+from src.vds_parser import VDSParser
+
+if TYPE_CHECKING:
+    import pandas
+
+LOGGER = logging.getLogger()
+
+POSITION_COLUMN = '__position'
+TABLE_COLUMN = '__table_name'
+FIELD_COLUMN = '__field_name'
+
+
+def _parse_partition(shm_name: str, size: int) -> dict:
+    """Parse a partition of the mapping document in a worker process.
+
+    The partition is read from an Arrow IPC stream in shared memory. The results are returned
+    as Arrow IPC buffers, so neither direction pickles the Python string objects.
+
+    Args:
+        shm_name (str): Name of the shared memory block holding the partition.
+        size (int): Size of the Arrow IPC stream in the shared memory block.
+
+    Returns:
+        dict: Arrow IPC buffers of the target definitions, source definitions and lineage edges.
+
+    """
+    import pyarrow as pa
+
+    # The block is owned and unlinked by the parent process, the worker only copies the stream out
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        ipc_bytes = bytes(shm.buf[:size])
+    finally:
+        shm.close()
+
+    pd_df_partition = _from_ipc(ipc_bytes)
+
+    results = {}
+    for name, field_column, table_column, definitions in (
+            ('target', "Target Field Name", "Target Database / Table Name", VDSParser.target_definitions),
+            ('source', "Source Field Name", "Object/Source Table Name", VDSParser.source_definitions)):
+        pd_df_fd = pd_df_partition.drop_duplicates(subset=field_column)
+        pd_df_definitions = definitions(VDSParser._fill_blanks(pd_df_fd))
+        pd_df_definitions[POSITION_COLUMN] = pd_df_fd[POSITION_COLUMN].to_numpy()
+        pd_df_definitions[FIELD_COLUMN] = pd_df_fd[field_column].to_numpy()
+        pd_df_definitions[TABLE_COLUMN] = pd_df_fd[table_column].astype(object).fillna('').to_numpy()
+        results[name] = _to_ipc(pa.Table.from_pandas(pd_df_definitions, preserve_index=False))
+
+    results['edges'] = _to_ipc(pa.Table.from_pandas(VDSParser.lineage_edges(pd_df_partition),
+                                                    preserve_index=False))
+
+    return results
+
+
+def _to_ipc(table) -> bytes:
+    """Serialize an Arrow table to an IPC stream.
+
+    Args:
+        table (pyarrow.Table): Arrow table.
+
+    Returns:
+        bytes: Arrow IPC stream.
+
+    """
+    import pyarrow as pa
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue().to_pybytes()
+
+
+def _from_ipc(ipc_bytes: bytes) -> 'pandas.DataFrame':
+    """Deserialize an Arrow IPC stream into a DataFrame.
+
+    Args:
+        ipc_bytes (bytes): Arrow IPC stream.
+
+    Returns:
+        pandas.DataFrame: Deserialized table.
+
+    """
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(ipc_bytes).read_all().to_pandas()
+
+
+class ParallelVDSParser(VDSParser):
+    """VDSParser which parses partitions of the mapping document, split by target table, in a process pool.
+
+    The results of the partitions are merged in the original row order and deduplicated
+    globally, so the output matches the serial VDSParser.
+    """
+
+    def __init__(self, configs: dict, workers: int = None):
+        """Create an instance of the ParallelVDSParser.
+
+        Args:
+            configs (dict): Script Environment Configurations.
+            workers (int): Number of worker processes, defaults to parse_workers or the CPU count.
+
+        """
+        super().__init__(configs)
+
+        self.workers = workers or configs.get('features_parse_workers') or os.cpu_count()
+        self._parsed = None
+
+    def parse_and_create_target(self, pd_df_mapfile_in: 'pandas.DataFrame'):
+        pd_df_target_fd = self._merge(self._parse(pd_df_mapfile_in)['target'])
+
+        self.write_output(pd_df_target_fd.drop(columns=[TABLE_COLUMN]), pd_df_target_fd[TABLE_COLUMN].tolist())
+
+    def parse_and_create_source(self, pd_df_mapfile_in: 'pandas.DataFrame'):
+        pd_df_source_fd = self._merge(self._parse(pd_df_mapfile_in)['source'])
+
+        self.write_output(pd_df_source_fd.drop(columns=[TABLE_COLUMN]), pd_df_source_fd[TABLE_COLUMN].tolist())
+
+    def lineage_paths(self, pd_df_mapfile_in: 'pandas.DataFrame'):
+        """Yield the deduplicated lineage paths of the edges built by the worker processes.
+
+        Args:
+            pd_df_mapfile_in (pandas.DataFrame): Mapping document.
+
+        """
+        yield from self.compact_lineage(self._parse(pd_df_mapfile_in)['edges'])
+
+    def _parse(self, pd_df_mapfile_in: 'pandas.DataFrame') -> dict:
+        """Parse the mapping document in the process pool, once per DataFrame.
+
+        Args:
+            pd_df_mapfile_in (pandas.DataFrame): Mapping document.
+
+        Returns:
+            dict: Concatenated target definitions, source definitions and lineage edges.
+
+        """
+        import pandas as pd
+
+        if self._parsed is not None and self._parsed[0] is pd_df_mapfile_in:
+            return self._parsed[1]
+
+        blocks = [self._share(partition) for partition in self.partitions(pd_df_mapfile_in)]
+
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(blocks)) or 1,
+                                     mp_context=self.process_context()) as executor:
+                partition_results = list(executor.map(_parse_partition, [shm.name for shm, _ in blocks],
+                                                      [size for _, size in blocks]))
+        finally:
+            for shm, _ in blocks:
+                shm.close()
+                shm.unlink()
+
+        parsed = {name: pd.concat([_from_ipc(results[name]) for results in partition_results], ignore_index=True)
+                  for name in ('target', 'source', 'edges')}
+
+        LOGGER.info(f"Parsed {len(pd_df_mapfile_in)} mapping rows in {len(blocks)} partitions "
+                    f"with {self.workers} worker processes")
+
+        self._parsed = (pd_df_mapfile_in, parsed)
+
+        return parsed
+
+    @staticmethod
+    def process_context():
+        """Return the multiprocessing context of the worker processes.
+
+        The parser runs while the logging, progress and job poller threads are alive, so the
+        workers are started from a fork server, or spawned where forkserver is unavailable,
+        instead of forking the threaded process.
+
+        Returns:
+            multiprocessing.context.BaseContext: forkserver or spawn context.
+
+        """
+        start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+        return multiprocessing.get_context(start_method)
+
+    def partitions(self, pd_df_mapfile_in: 'pandas.DataFrame') -> list:
+        """Split the mapping document by target table into one partition per worker.
+
+        Every target table is assigned as a whole to the partition with the fewest rows.
+
+        Args:
+            pd_df_mapfile_in (pandas.DataFrame): Mapping document.
+
+        Returns:
+            list: Mapping document partitions with the original row positions.
+
+        """
+        import numpy as np
+
+        pd_df_mapping = pd_df_mapfile_in[[column for column in MAPPING_COLUMNS
+                                          if column in pd_df_mapfile_in.columns]].copy()
+
+        # Arrow columns hold a single type, cells of mixed type columns are passed as text
+        for column in pd_df_mapping.columns:
+            dtype = pd_df_mapping[column].dtype.name
+            distinct_values = pd_df_mapping[column].cat.categories if dtype == 'category' \
+                else pd_df_mapping[column].dropna()
+
+            if dtype in ('category', 'object') and distinct_values.map(type).nunique() > 1:
+                values = pd_df_mapping[column].astype(object)
+                pd_df_mapping[column] = values.where(values.isna(), values.astype(str)).astype(dtype)
+
+        pd_df_mapping[POSITION_COLUMN] = np.arange(len(pd_df_mapping))
+
+        table_codes = pd_df_mapping["Target Database / Table Name"].astype('category').cat.codes.to_numpy()
+        table_sizes = np.bincount(table_codes + 1)
+
+        partition_of_table = np.zeros(len(table_sizes), dtype=np.int64)
+        partition_sizes = np.zeros(self.workers, dtype=np.int64)
+        for table in np.argsort(-table_sizes, kind='stable'):
+            partition_of_table[table] = np.argmin(partition_sizes)
+            partition_sizes[partition_of_table[table]] += table_sizes[table]
+
+        row_partitions = partition_of_table[table_codes + 1]
+
+        return [pd_df_mapping[row_partitions == partition] for partition in range(self.workers)
+                if partition_sizes[partition]]
+
+    @staticmethod
+    def _share(pd_df_partition: 'pandas.DataFrame') -> tuple:
+        """Write a partition as an Arrow IPC stream into a new shared memory block.
+
+        Args:
+            pd_df_partition (pandas.DataFrame): Mapping document partition.
+
+        Returns:
+            tuple: Shared memory block and size of the IPC stream.
+
+        """
+        import pyarrow as pa
+
+        ipc_bytes = _to_ipc(pa.Table.from_pandas(pd_df_partition, preserve_index=False))
+        size = len(ipc_bytes)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shm.buf[:size] = ipc_bytes
+
+        return shm, size
+
+    @staticmethod
+    def _merge(pd_df_definitions: 'pandas.DataFrame') -> 'pandas.DataFrame':
+        """Restore the original row order and deduplicate the definitions across partitions.
+
+        Args:
+            pd_df_definitions (pandas.DataFrame): Definitions of every partition.
+
+        Returns:
+            pandas.DataFrame: VDS definitions with the table name column.
+
+        """
+        pd_df_definitions = pd_df_definitions.sort_values(POSITION_COLUMN, kind='stable')
+        pd_df_definitions = pd_df_definitions.drop_duplicates(subset=FIELD_COLUMN)
+
+        return pd_df_definitions.drop(columns=[POSITION_COLUMN, FIELD_COLUMN]).reset_index(drop=True)
@@ -0,0 +1,231 @@
+"""Dependency-aware Pipeline Orchestrator for the Alation Upload Sequence."""
+
+import logging
+import queue
+import threading
+import time
+
+LOGGER = logging.getLogger()
+
+_END_OF_STREAM = object()
+
+
+def merge_statistics(*statistics: dict) -> dict:
+    """Sum the processing statistics of several Pipeline runs, e.g. of an upload and its re-submissions.
+
+    Args:
+        *statistics (dict): Processing statistics keyed by Stage name.
+
+    Returns:
+        dict: Summed processing statistics keyed by Stage name.
+
+    """
+    merged = {}
+
+    for run_statistics in statistics:
+        for name, stage_statistics in run_statistics.items():
+            merged_stage = merged.setdefault(name, {})
+            for key, value in stage_statistics.items():
+                merged_stage[key] = round(merged_stage.get(key, 0) + value, 3)
+
+    return merged
+
+
+class PipelineStage(object):
+    """Single Stage of the Upload Pipeline."""
+
+    def __init__(self, name: str, handler, upstream: str = None, workers: int = 1,
+                 queue_size: int = 4, wait_for: list = None):
+        """Create an instance of a Pipeline Stage.
+
+        Args:
+            name (str): Unique name of the Stage.
+            handler (callable): Function called with every item received by the Stage. The
+                returned value is passed to the downstream Stages, None is not passed on.
+            upstream (str): Name of the Stage feeding this Stage.
+            workers (int): Number of worker threads processing the Stage's items.
+            queue_size (int): Maximum number of items waiting in the Stage's queue.
+            wait_for (list): Stages which must be complete before this Stage starts.
+
+        """
+        self.name = name
+        self.handler = handler
+        self.upstream = upstream
+        self.workers = workers
+        self.wait_for = wait_for or []
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self.downstream = []
+        self.done = threading.Event()
+
+        self.processed = 0
+        self.errors = []
+        self.busy_seconds = 0.0
+
+        self._active_workers = workers
+        self._lock = threading.Lock()
+
+    def run_worker(self):
+        """Process items from the Stage queue until the end of the stream is reached."""
+
+        for stage in self.wait_for:
+            stage.done.wait()
+
+        while True:
+            item = self.inbox.get()
+
+            if item is _END_OF_STREAM:
+                # Leave the marker in the queue for the sibling workers
+                self.inbox.put(_END_OF_STREAM)
+                self._finish_worker()
+                return
+
+            start_time = time.perf_counter()
+
+            try:
+                output = self.handler(item)
+            except Exception as stage_error:
+                LOGGER.error(f"Pipeline stage '{self.name}' failed to process an item: {stage_error}",
+                             exc_info=True)
+                with self._lock:
+                    self.errors.append(stage_error)
+                continue
+            finally:
+                with self._lock:
+                    self.busy_seconds += time.perf_counter() - start_time
+
+            with self._lock:
+                self.processed += 1
+
+            if output is not None:
+                for stage in self.downstream:
+                    # Blocks when the downstream Stage is behind which applies backpressure
+                    stage.inbox.put(output)
+
+    def _finish_worker(self):
+        """Close the Stage once the last worker has finished."""
+
+        with self._lock:
+            self._active_workers -= 1
+            last_worker = self._active_workers == 0
+
+        if last_worker:
+            for stage in self.downstream:
+                stage.inbox.put(_END_OF_STREAM)
+            self.done.set()
+
+    @property
+    def statistics(self) -> dict:
+        """Return the processing statistics of the Stage.
+
+        Returns:
+            dict: Processed item count, error count and time spent in the handler.
+
+        """
+        return {'processed': self.processed,
+                'errors': len(self.errors),
+                'busy_seconds': round(self.busy_seconds, 3)}
+
+
+class UploadPipeline(object):
+    """Stream objects between Upload Stages through bounded queues."""
+
+    def __init__(self, queue_size: int = 4, workers: int = 1):
+        """Create an instance of the Upload Pipeline.
+
+        Args:
+            queue_size (int): Default maximum number of items waiting in each Stage's queue.
+            workers (int): Default number of worker threads for each Stage.
+
+        """
+        self.queue_size = queue_size
+        self.workers = workers
+        self.stages = {}
+
+    def add_stage(self, name: str, handler, upstream: str = None, workers: int = None,
+                  wait_for: list = None) -> PipelineStage:
+        """Add a Stage to the Pipeline.
+
+        Args:
+            name (str): Unique name of the Stage.
+            handler (callable): Function processing each item received by the Stage.
+            upstream (str): Name of the Stage feeding this Stage. Stages without an
+                upstream Stage are fed from the sources passed to run().
+            workers (int): Number of worker threads, defaults to the Pipeline setting.
+            wait_for (list): Names of Stages which must be complete before this Stage starts.
+
+        Returns:
+            PipelineStage: Newly added Stage.
+
+        """
+        if name in self.stages:
+            raise ValueError(f"Pipeline stage '{name}' already exists.")
+
+        for dependency in [upstream] + (wait_for or []):
+            if dependency and dependency not in self.stages:
+                raise ValueError(f"Pipeline stage '{name}' depends on the unknown stage '{dependency}'.")
+
+        stage = PipelineStage(name, handler, upstream=upstream,
+                              workers=workers or self.workers,
+                              queue_size=self.queue_size,
+                              wait_for=[self.stages[dependency] for dependency in wait_for or []])
+
+        if upstream:
+            self.stages[upstream].downstream.append(stage)
+
+        self.stages[name] = stage
+
+        return stage
+
+    def run(self, sources: dict) -> dict:
+        """Run the Pipeline until every Stage has processed all of its items.
+
+        Args:
+            sources (dict): Iterable of items keyed by the name of the Stage it feeds.
+
+        Returns:
+            dict: Processing statistics keyed by Stage name.
+
+        """
+        for name in sources:
+            if name not in self.stages or self.stages[name].upstream:
+                raise ValueError(f"Pipeline stage '{name}' cannot be fed from a source.")
+
+        threads = []
+
+        for stage in self.stages.values():
+            for worker in range(stage.workers):
+                thread = threading.Thread(target=stage.run_worker, daemon=True,
+                                          name=f'{stage.name}-{worker}')
+                thread.start()
+                threads.append(thread)
+
+        for name, stage in self.stages.items():
+            if not stage.upstream:
+                thread = threading.Thread(target=self._feed, daemon=True, name=f'{name}-source',
+                                          args=(stage, sources.get(name, [])))
+                thread.start()
+                threads.append(thread)
+
+        start_time = time.perf_counter()
+
+        for thread in threads:
+            thread.join()
+
+        LOGGER.info(f"Upload pipeline finished in {time.perf_counter() - start_time:.2f} seconds")
+
+        return {name: stage.statistics for name, stage in self.stages.items()}
+
+    @staticmethod
+    def _feed(stage: PipelineStage, items):
+        """Stream the source items into a root Stage.
+
+        Args:
+            stage (PipelineStage): Stage fed by the source.
+            items (iterable): Source items.
+
+        """
+        try:
+            for item in items:
+                stage.inbox.put(item)
+        finally:
+            stage.inbox.put(_END_OF_STREAM)
@@ -0,0 +1,177 @@
+"""Pre-flight Connectivity and Latency Probe of an Alation target."""
+
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from src.utils import percentile
+
+if TYPE_CHECKING:
+    from src.alation_helpers import AlationHelpers
+    from src.models.alation.auth import AlationAuth
+
+LOGGER = logging.getLogger()
+
+
+class ConnectionProbe(object):
+    """Measure the latency and throughput of the Alation endpoints used by the upload."""
+
+    def __init__(self, alation_helper: 'AlationHelpers', samples: int = 20):
+        """Create an instance of the ConnectionProbe.
+
+        Args:
+            alation_helper (AlationHelpers): Alation helper of the probed target.
+            samples (int): Number of sequential requests measured per endpoint.
+
+        """
+        self.alation_helper = alation_helper
+        self.samples = samples
+        self.pool_size = alation_helper.configs.get('alation_pool_size', 10)
+
+    def endpoints(self) -> dict:
+        """Return the probed endpoint URLs keyed by name.
+
+        Returns:
+            dict: Endpoint URLs.
+
+        """
+        return {'job': f'{self.alation_helper.alation_host}/api/v1/bulk_metadata/job/?id=0',
+                'custom_field': f'{self.alation_helper.api_v2_url}/custom_field/?limit=1',
+                'bi/server': f'{self.alation_helper.bi_api_url}/'}
+
+    def run(self, alation_auth: 'AlationAuth') -> dict:
+        """Warm up the connection pool and measure every endpoint.
+
+        Args:
+            alation_auth (AlationAuth): Alation REST API Authentication Object.
+
+        Returns:
+            dict: Latency percentiles and status codes per endpoint, plus the concurrent
+                throughput of the bi/server endpoint.
+
+        """
+        headers = {'Token': alation_auth.access_token}
+        endpoints = self.endpoints()
+
+        # Open every pooled connection once, so the measurements exclude the TLS handshakes
+        self._concurrent_requests(endpoints['bi/server'], headers, self.pool_size)
+
+        results = {}
+        for name, url in endpoints.items():
+            latencies, status_codes = [], {}
+
+            for _ in range(self.samples):
+                seconds, status_code = self._timed_request(url, headers)
+                latencies.append(seconds)
+                status_codes[status_code] = status_codes.get(status_code, 0) + 1
+
+            latencies.sort()
+            results[name] = {'p50': percentile(latencies, 50),
+                             'p90': percentile(latencies, 90),
+                             'p99': percentile(latencies, 99),
+                             'status_codes': status_codes}
+
+        start_time = time.perf_counter()
+        concurrent_status_codes = self._concurrent_requests(endpoints['bi/server'], headers,
+                                                            self.pool_size * self.samples)
+        elapsed = time.perf_counter() - start_time
+
+        results['throughput'] = {'requests_per_second': self.pool_size * self.samples / elapsed,
+                                 'workers': self.pool_size,
+                                 'throttled': concurrent_status_codes.count(429)}
+
+        return results
+
+    def recommend(self, results: dict) -> dict:
+        """Recommend the concurrency and batch size settings from the probe results.
+
+        The number of workers is the parallelism the host actually sustained, i.e. the
+        concurrent throughput multiplied by the sequential latency.
+
+        Args:
+            results (dict): Probe results returned by run().
+
+        Returns:
+            dict: Recommended configs.ini settings keyed by section and key.
+
+        """
+        throughput = results['throughput']
+        latency = results['bi/server']['p50']
+        effective_parallelism = throughput['requests_per_second'] * latency
+
+        pipeline_workers = min(max(int(round(effective_parallelism)), 1), self.pool_size)
+
+        return {
+            'Alation': {
+                # Every pipeline stage of an object type runs its own workers
+                'pool_size': max(pipeline_workers * 4, 4),
+                'max_requests_per_second': int(throughput['requests_per_second'] * 0.8)
+                if throughput['throttled'] else 0},
+            'Features': {
+                'pipeline_workers': pipeline_workers,
+                # Slow round trips are amortized over larger requests
+                'upload_request_size': 1000 if latency > 0.5 else 500,
+                'job_status_sleep': max(int(math.ceil(results['job']['p90'] * 2)), 1)}
+        }
+
+    def report(self, results: dict) -> dict:
+        """Print the probe results and the recommended settings.
+
+        Args:
+            results (dict): Probe results returned by run().
+
+        Returns:
+            dict: Recommended configs.ini settings keyed by section and key.
+
+        """
+        print(f"Probe of {self.alation_helper.alation_host}:")
+        for name in self.endpoints():
+            print(f"    {name:<14} p50 {results[name]['p50'] * 1000:8.1f} ms, "
+                  f"p90 {results[name]['p90'] * 1000:8.1f} ms, p99 {results[name]['p99'] * 1000:8.1f} ms, "
+                  f"status codes {results[name]['status_codes']}")
+
+        throughput = results['throughput']
+        print(f"    throughput     {throughput['requests_per_second']:.1f} requests/s with "
+              f"{throughput['workers']} workers, {throughput['throttled']} throttled")
+
+        recommendations = self.recommend(results)
+        print('Recommended configs.ini settings:')
+        for section, settings in recommendations.items():
+            print(f'[{section}]')
+            for key, value in settings.items():
+                print(f'{key}={value}')
+
+        return recommendations
+
+    def _timed_request(self, url: str, headers: dict) -> tuple:
+        """Send a GET request and measure its latency.
+
+        Args:
+            url (str): Request URL.
+            headers (dict): Request headers.
+
+        Returns:
+            tuple: Latency in seconds and response status code.
+
+        """
+        seconds, api_response = self.alation_helper.timed_request('GET', url, headers=headers)
+
+        return seconds, api_response.status_code
+
+    def _concurrent_requests(self, url: str, headers: dict, count: int) -> list:
+        """Send GET requests through every pooled connection at once.
+
+        Args:
+            url (str): Request URL.
+            headers (dict): Request headers.
+            count (int): Number of requests.
+
+        Returns:
+            list: Response status codes.
+
+        """
+        with ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='alation-probe') as executor:
+            return [status_code for _, status_code in
+                    executor.map(lambda _: self._timed_request(url, headers), range(count))]
@@ -0,0 +1,215 @@
+"""Live Progress of the Upload Stages."""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+LOGGER = logging.getLogger()
+
+
+class ProgressReporter(object):
+    """Thread safe progress counters of the upload stages, rendered periodically.
+
+    Only a fixed set of counters and a smoothed rate per stage are kept, so the memory used
+    does not grow with the size of the run. The progress is rendered to the terminal and,
+    optionally, rewritten atomically to a JSON status file for monitoring.
+    """
+
+    # submit_failed counts the items of requests which did not start an Alation Background Job
+    stages = ('parsed', 'submitted', 'submit_failed', 'jobs_pending', 'jobs_completed', 'oids_resolved')
+
+    def __init__(self, status_location: str = None, interval: float = 5, stream=None, smoothing: float = 0.3):
+        """Create an instance of the ProgressReporter.
+
+        Args:
+            status_location (str): Path of the JSON status file, None disables the file.
+            interval (float): Seconds between two renders of the progress.
+            stream (file): Terminal stream the progress is rendered to, defaults to stderr.
+            smoothing (float): Weight of the latest interval in the exponentially smoothed rates.
+
+        """
+        self.status_location = status_location
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.smoothing = smoothing
+
+        self.counts = dict.fromkeys(self.stages, 0)
+        self.totals = dict.fromkeys(self.stages)
+        self.rates = dict.fromkeys(self.stages, 0.0)
+
+        self._start_time = time.monotonic()
+        self._last_tick = (self._start_time, dict(self.counts))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def increment(self, stage: str, value: int = 1):
+        """Increment the counter of a stage.
+
+        Args:
+            stage (str): Name of the stage.
+            value (int): Value added to the counter, negative for gauges like jobs_pending.
+
+        """
+        with self._lock:
+            self.counts[stage] = self.counts.get(stage, 0) + value
+
+    def add_total(self, stage: str, total: int):
+        """Add to the expected total of a stage, used to estimate the time remaining.
+
+        Args:
+            stage (str): Name of the stage.
+            total (int): Number of items the stage is expected to process in addition.
+
+        """
+        with self._lock:
+            self.totals[stage] = (self.totals.get(stage) or 0) + total
+
+    def snapshot(self) -> dict:
+        """Return the current progress of every stage.
+
+        Returns:
+            dict: Elapsed seconds and, per stage, the count, total, rate per second and ETA in seconds.
+
+        """
+        with self._lock:
+            stages = {}
+            for stage, count in self.counts.items():
+                total, rate = self.totals.get(stage), self.rates.get(stage, 0.0)
+                eta = max(total - count, 0) / rate if total is not None and rate > 0 else None
+                stages[stage] = {'count': count, 'total': total, 'rate': round(rate, 2),
+                                 'eta_seconds': round(eta) if eta is not None else None}
+
+        return {'timestamp': time.time(), 'elapsed_seconds': round(time.monotonic() - self._start_time),
+                'stages': stages}
+
+    def start(self) -> 'ProgressReporter':
+        """Start rendering the progress in a background thread.
+
+        Returns:
+            ProgressReporter: This ProgressReporter instance.
+
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._render_periodically, name='progress-reporter', daemon=True)
+            self._thread.start()
+
+        return self
+
+    def stop(self):
+        """Stop the background thread and render the final progress."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.render()
+        if self.stream.isatty():
+            self.stream.write('\n')
+
+    def render(self):
+        """Update the smoothed rates, then render the progress to the terminal and the status file."""
+
+        self._update_rates()
+        snapshot = self.snapshot()
+
+        line = ' | '.join(self._format_stage(stage, progress) for stage, progress in snapshot['stages'].items())
+        line = f"[{self._format_seconds(snapshot['elapsed_seconds'])}] {line}"
+
+        if self.stream.isatty():
+            self.stream.write(f'\r\x1b[K{line}')
+            self.stream.flush()
+        else:
+            LOGGER.info(f'Progress: {line}')
+
+        if self.status_location:
+            self._write_status(snapshot)
+
+    def _render_periodically(self):
+        """Render the progress every interval until stopped."""
+
+        while not self._stop.wait(self.interval):
+            try:
+                self.render()
+            except Exception as render_error:
+                LOGGER.warning(f'Rendering the upload progress failed: {render_error}')
+
+    def _update_rates(self):
+        """Fold the throughput since the previous render into the smoothed rate of every stage."""
+
+        with self._lock:
+            now = time.monotonic()
+            last_time, last_counts = self._last_tick
+            elapsed = now - last_time
+
+            if elapsed <= 0:
+                return
+
+            for stage, count in self.counts.items():
+                interval_rate = max(count - last_counts.get(stage, 0), 0) / elapsed
+                previous_rate = self.rates.get(stage)
+                self.rates[stage] = interval_rate if not previous_rate \
+                    else self.smoothing * interval_rate + (1 - self.smoothing) * previous_rate
+
+            self._last_tick = (now, dict(self.counts))
+
+    def _write_status(self, snapshot: dict):
+        """Atomically replace the JSON status file with the snapshot.
+
+        Args:
+            snapshot (dict): Progress snapshot.
+
+        """
+        directory = os.path.dirname(self.status_location)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temporary_location = f'{self.status_location}.tmp'
+        with open(temporary_location, 'w') as status_file:
+            json.dump(snapshot, status_file, indent=2)
+
+        os.replace(temporary_location, self.status_location)
+
+    def _format_stage(self, stage: str, progress: dict) -> str:
+        """Format the progress of a single stage.
+
+        Args:
+            stage (str): Name of the stage.
+            progress (dict): Progress of the stage.
+
+        Returns:
+            str: Formatted progress, e.g. 'submitted 1200/5000 (40.0/s, ETA 01:35)'.
+
+        """
+        text = f"{stage.replace('_', ' ')} {progress['count']}"
+
+        if progress['total'] is not None:
+            text += f"/{progress['total']}"
+
+        if stage != 'jobs_pending':
+            text += f" ({progress['rate']:.1f}/s"
+            if progress['eta_seconds'] is not None:
+                text += f", ETA {self._format_seconds(progress['eta_seconds'])}"
+            text += ')'
+
+        return text
+
+    @staticmethod
+    def _format_seconds(seconds: int) -> str:
+        """Format a number of seconds as [hours:]minutes:seconds.
+
+        Args:
+            seconds (int): Number of seconds.
+
+        Returns:
+            str: Formatted duration.
+
+        """
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+
+        return f'{hours}:{minutes:02d}:{seconds:02d}' if hours else f'{minutes:02d}:{seconds:02d}'
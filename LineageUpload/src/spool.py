@@ -0,0 +1,194 @@
+"""On-disk NDJSON Spool between the Parse and Upload Stages."""
+
+import json
+import logging
+import mmap
+import os
+
+LOGGER = logging.getLogger()
+
+
+class SpoolWriter(object):
+    """Stream records into size-limited NDJSON segment files."""
+
+    def __init__(self, directory: str, segment_bytes: int = 64 * 1024 * 1024):
+        """Create an instance of the SpoolWriter. Existing segments in the directory are replaced.
+
+        Args:
+            directory (str): Directory holding the segment files of the spool.
+            segment_bytes (int): Size after which a new segment file is started.
+
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.records = 0
+        self.segments = []
+
+        self._segment_file = None
+        self._segment_size = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith('.ndjson') or file_name == 'manifest.json':
+                os.remove(os.path.join(self.directory, file_name))
+
+    def write(self, record):
+        """Append a JSON serializable record to the spool.
+
+        Args:
+            record: JSON serializable record.
+
+        """
+        line = (json.dumps(record, default=str) + '\n').encode()
+
+        if self._segment_file is None or self._segment_size + len(line) > self.segment_bytes:
+            self._start_segment()
+
+        self._segment_file.write(line)
+        self._segment_size += len(line)
+        self.records += 1
+
+    def write_many(self, records):
+        """Append every record of an iterable to the spool.
+
+        Args:
+            records (iterable): JSON serializable records.
+
+        """
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        """Close the current segment and write the spool manifest."""
+
+        if self._segment_file is not None:
+            self._segment_file.close()
+            self._segment_file = None
+
+        with open(os.path.join(self.directory, 'manifest.json'), 'w') as manifest_file:
+            json.dump({'records': self.records, 'segments': self.segments}, manifest_file)
+
+        LOGGER.debug(f'Spooled {self.records} records into {len(self.segments)} segments in {self.directory}')
+
+    def _start_segment(self):
+        """Close the current segment and open the next one."""
+
+        if self._segment_file is not None:
+            self._segment_file.close()
+
+        segment_name = f'segment_{len(self.segments):05d}.ndjson'
+        self.segments.append(segment_name)
+        self._segment_file = open(os.path.join(self.directory, segment_name), 'wb')
+        self._segment_size = 0
+
+    def __enter__(self) -> 'SpoolWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class SpoolReader(object):
+    """Read the records of an NDJSON spool back through memory-mapped segment files."""
+
+    def __init__(self, directory: str):
+        """Create an instance of the SpoolReader.
+
+        Args:
+            directory (str): Directory holding the segment files of the spool.
+
+        """
+        self.directory = directory
+
+        with open(os.path.join(self.directory, 'manifest.json'), 'r') as manifest_file:
+            manifest = json.load(manifest_file)
+
+        self.records = manifest['records']
+        self.segments = manifest['segments']
+
+    def __iter__(self):
+        """Yield the records of the spool in the order they were written."""
+
+        for segment_name in self.segments:
+            with open(os.path.join(self.directory, segment_name), 'rb') as segment_file:
+                if os.fstat(segment_file.fileno()).st_size == 0:
+                    continue
+
+                with mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ) as segment:
+                    for line in iter(segment.readline, b''):
+                        yield json.loads(line)
+
+    def __len__(self) -> int:
+        return self.records
+
+    def chunks(self, chunk_size):
+        """Yield the records of the spool in lists of at most chunk_size records.
+
+        Args:
+            chunk_size (int): Maximum number of records in each chunk, or a function returning
+                the maximum number of records of the next chunk.
+
+        """
+        chunk = []
+        size = chunk_size() if callable(chunk_size) else chunk_size
+
+        for record in self:
+            chunk.append(record)
+
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+                size = chunk_size() if callable(chunk_size) else chunk_size
+
+        if chunk:
+            yield chunk
+
+
+class SpooledPayloads(object):
+    """Re-iterable request payloads built lazily from the chunks of a spool."""
+
+    def __init__(self, reader: SpoolReader, chunk_size: int, build_payload):
+        """Create an instance of SpooledPayloads.
+
+        Args:
+            reader (SpoolReader): Reader of the spooled records.
+            chunk_size (int): Number of records in each payload, or a function returning the
+                number of records of the next payload.
+            build_payload (callable): Function building a request payload from a chunk of records.
+
+        """
+        self.reader = reader
+        self.chunk_size = chunk_size
+        self.build_payload = build_payload
+
+    def __iter__(self):
+        """Yield the request payloads. Every iteration reads the spool again."""
+
+        for chunk in self.reader.chunks(self.chunk_size):
+            yield self.build_payload(chunk)
+
+    def __len__(self) -> int:
+        return -(-len(self.reader) // (self.chunk_size() if callable(self.chunk_size) else self.chunk_size))
+
+    def with_chunk_size(self, chunk_size) -> 'SpooledPayloads':
+        """Return the payloads of the same spool built with another chunk size.
+
+        Args:
+            chunk_size (int): Number of records in each payload, or a function returning the
+                number of records of the next payload.
+
+        Returns:
+            SpooledPayloads: Payloads sharing the spool reader.
+
+        """
+        return SpooledPayloads(self.reader, chunk_size, self.build_payload)
+
+    @property
+    def records(self) -> int:
+        """Return the number of spooled records over all payloads.
+
+        Returns:
+            int: Number of spooled records.
+
+        """
+        return len(self.reader)
@@ -0,0 +1,101 @@
+"""Shared helper functions for the Lineage Upload Script."""
+
+import threading
+import time
+
+
+def chunk_list(items: list, chunk_size: int) -> list:
+    """Split a list into consecutive chunks.
+
+    Args:
+        items (list): List to be split.
+        chunk_size (int): Maximum number of items in each chunk.
+
+    Returns:
+        list: List of chunks.
+
+    """
+    if chunk_size < 1:
+        raise ValueError(f'Chunk size must be a positive number, got {chunk_size}.')
+
+    return [items[x:x + chunk_size] for x in range(0, len(items), chunk_size)]
+
+
+def adaptive_chunks(items: list, chunk_size):
+    """Yield consecutive chunks of a list, sized by a function called before every chunk.
+
+    Args:
+        items (list): List to be split.
+        chunk_size (callable): Function returning the maximum number of items of the next chunk.
+
+    """
+    start = 0
+
+    while start < len(items):
+        size = max(chunk_size(), 1)
+        yield items[start:start + size]
+        start += size
+
+
+def external_id_of(bi_object) -> str:
+    """Return the External ID of a Virtual BI Server object.
+
+    Args:
+        bi_object: Virtual BI Server JSON object or BI object model.
+
+    Returns:
+        str: External ID of the object.
+
+    """
+    if isinstance(bi_object, dict):
+        return bi_object.get('external_id')
+
+    return bi_object.external_id()
+
+
+def percentile(sorted_values: list, percentile_rank: float):
+    """Return the nearest-rank percentile of a sorted list.
+
+    Args:
+        sorted_values (list): Values sorted in ascending order.
+        percentile_rank (float): Percentile between 0 and 100.
+
+    Returns:
+        Percentile value, 0 for an empty list.
+
+    """
+    if not sorted_values:
+        return 0
+
+    rank = max(int(round(percentile_rank / 100 * len(sorted_values))) - 1, 0)
+
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class RateLimiter(object):
+    """Thread safe limit of the number of requests sent per second."""
+
+    def __init__(self, requests_per_second: float = 0):
+        """Create an instance of the RateLimiter.
+
+        Args:
+            requests_per_second (float): Maximum number of requests per second, 0 disables the limit.
+
+        """
+        self.interval = 1 / requests_per_second if requests_per_second > 0 else 0
+        self._next_request = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the next request is allowed to be sent."""
+
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_request - now
+            self._next_request = max(now, self._next_request) + self.interval
+
+        if wait_time > 0:
+            time.sleep(wait_time)
@@ -0,0 +1,188 @@
+"""Vectorized Validation of the Mapping Document before any Alation API call."""
+
+import logging
+from typing import TYPE_CHECKING
+
+from src.mapping_schema import MAPPING_COLUMNS
+
+if TYPE_CHECKING:
+    import pandas
+
+LOGGER = logging.getLogger()
+
+TARGET_KEY_COLUMNS = ["Target Database / Table Name", "Target Field Name"]
+SOURCE_KEY_COLUMNS = ["Object/Source Table Name", "Source Field Name"]
+
+
+class MappingValidator(object):
+    """Run vectorized rule checks over the mapping document and report the failing rows.
+
+    Failed checks are reported as errors, which stop the upload, or as warnings for rows
+    which are still uploaded but worth reviewing.
+    """
+
+    ERROR = 'error'
+    WARNING = 'warning'
+
+    nullable_values = ['Y', 'N', 'YES', 'NO', 'TRUE', 'FALSE', '1', '0']
+    length_required_types = ['CHAR', 'VARCHAR', 'VARCHAR2', 'NVARCHAR', 'NVARCHAR2', 'NCHAR', 'STRING',
+                             'DECIMAL', 'NUMERIC']
+    # Types valid without a length, e.g. Oracle NUMBER, which are only reported as warnings
+    length_optional_types = ['NUMBER']
+    unbounded_lengths = ['MAX']
+
+    def __init__(self, required_columns: list = None):
+        """Create an instance of the MappingValidator.
+
+        Args:
+            required_columns (list): Columns which must exist in the mapping document.
+
+        """
+        self.required_columns = required_columns or list(MAPPING_COLUMNS)
+
+    def validate(self, pd_df_mapfile_in: 'pandas.DataFrame') -> 'pandas.DataFrame':
+        """Validate the mapping document.
+
+        Args:
+            pd_df_mapfile_in (pandas.DataFrame): Mapping document.
+
+        Returns:
+            pandas.DataFrame: Row-level report with the row number, rule, severity, column and value
+                of every failed check. The report is empty when the document is valid.
+
+        """
+        import pandas as pd
+
+        missing_columns = [column for column in self.required_columns if column not in pd_df_mapfile_in.columns]
+        if missing_columns:
+            return pd.DataFrame({'row': [None] * len(missing_columns), 'rule': 'required_column',
+                                 'severity': self.ERROR, 'column': missing_columns, 'value': None})
+
+        # Every column is compared as upper case stripped text, categories are converted once
+        text = {column: self._as_text(pd_df_mapfile_in[column]) for column in self.required_columns}
+        blank = {column: values == '' for column, values in text.items()}
+
+        errors = []
+
+        for column in TARGET_KEY_COLUMNS + ["Data Type Conformity"]:
+            errors.append(self._errors(pd_df_mapfile_in, blank[column], 'blank_value', column))
+
+        errors.append(self._errors(pd_df_mapfile_in, ~blank["Nullable"] & ~text["Nullable"].isin(
+            self.nullable_values), 'malformed_nullable', "Nullable"))
+
+        for type_column, length_column in (("Data Type Conformity", "Data Length"),
+                                           ("Source Data Type", "Source Field Length")):
+            errors.append(self._errors(
+                pd_df_mapfile_in, text[type_column].isin(self.length_required_types) & blank[length_column],
+                'missing_length', length_column))
+            errors.append(self._errors(
+                pd_df_mapfile_in, text[type_column].isin(self.length_optional_types) & blank[length_column],
+                'missing_length', length_column, self.WARNING))
+
+            unbounded = text[length_column].isin(self.unbounded_lengths)
+            errors.append(self._errors(pd_df_mapfile_in, unbounded, 'unbounded_length', length_column,
+                                       self.WARNING))
+            errors.append(self._errors(
+                pd_df_mapfile_in, ~blank[length_column] & ~unbounded & ~text[length_column].str.fullmatch(
+                    r'\d+(\.0+)?|\d+\s*,\s*\d+'), 'malformed_length', length_column))
+
+        # The same target column must not be mapped with conflicting definitions
+        target_keys = text[TARGET_KEY_COLUMNS[0]] + '.' + text[TARGET_KEY_COLUMNS[1]]
+        definitions = text["Data Type Conformity"] + '(' + text["Data Length"] + ')' + text["Nullable"]
+        conflicting = definitions.groupby(target_keys).transform('nunique') > 1
+        errors.append(self._errors(pd_df_mapfile_in, conflicting, 'conflicting_definition',
+                                   TARGET_KEY_COLUMNS[1]))
+
+        duplicated = pd.concat([target_keys, text[SOURCE_KEY_COLUMNS[0]] + '.' + text[SOURCE_KEY_COLUMNS[1]]],
+                               axis=1).duplicated(keep='first')
+        errors.append(self._errors(pd_df_mapfile_in, duplicated, 'duplicate_mapping', TARGET_KEY_COLUMNS[1],
+                                   self.WARNING))
+
+        # Lineage endpoints need both the table and the field of each side
+        for table_column, field_column in (TARGET_KEY_COLUMNS, SOURCE_KEY_COLUMNS):
+            incomplete = blank[table_column] ^ blank[field_column]
+            errors.append(self._errors(pd_df_mapfile_in, incomplete, 'incomplete_lineage_endpoint', table_column))
+
+        dangling = ~blank[TARGET_KEY_COLUMNS[1]] & blank[SOURCE_KEY_COLUMNS[0]] & blank[SOURCE_KEY_COLUMNS[1]]
+        # Target-only rows still define the target column, they just produce no lineage
+        errors.append(self._errors(pd_df_mapfile_in, dangling, 'dangling_lineage_endpoint', SOURCE_KEY_COLUMNS[1],
+                                   self.WARNING))
+
+        report = pd.concat(errors, ignore_index=True)
+
+        return report.sort_values(['row', 'rule'], kind='stable').reset_index(drop=True)
+
+    def validate_and_report(self, pd_df_mapfile_in: 'pandas.DataFrame', report_location: str = None) -> bool:
+        """Validate the mapping document, log a summary and optionally write the report to CSV.
+
+        Args:
+            pd_df_mapfile_in (pandas.DataFrame): Mapping document.
+            report_location (str): Path of the CSV validation report.
+
+        Returns:
+            bool: True if no check failed with the error severity, warnings do not stop the upload.
+
+        """
+        report = self.validate(pd_df_mapfile_in)
+
+        if report.empty:
+            LOGGER.info(f"Mapping document validation passed for {len(pd_df_mapfile_in)} rows")
+            return True
+
+        valid = not (report['severity'] == self.ERROR).any()
+        log = LOGGER.warning if valid else LOGGER.error
+
+        for (rule, severity), count in report.groupby(['rule', 'severity'], sort=False).size().items():
+            (LOGGER.error if severity == self.ERROR else LOGGER.warning)(
+                f"Mapping document validation rule '{rule}' ({severity}) failed for {count} rows")
+
+        if report_location:
+            report.to_csv(report_location, index=False)
+            log(f"Mapping document validation report written to {report_location}")
+
+        return valid
+
+    @staticmethod
+    def _as_text(values: 'pandas.Series') -> 'pandas.Series':
+        """Convert a column to upper case stripped text with blanks for missing values.
+
+        Args:
+            values (pandas.Series): Column of the mapping document.
+
+        Returns:
+            pandas.Series: Normalized text values.
+
+        """
+        import numpy as np
+        import pandas as pd
+
+        if values.dtype.name == 'category':
+            # Normalize each category once and expand through the category codes
+            categories = np.append(values.cat.categories.astype(str).str.strip().str.upper().to_numpy(), '')
+            return pd.Series(categories[values.cat.codes.to_numpy()], index=values.index)
+
+        return values.fillna('').astype(str).str.strip().str.upper()
+
+    @staticmethod
+    def _errors(pd_df_mapfile_in: 'pandas.DataFrame', failed: 'pandas.Series', rule: str,
+                column: str, severity: str = 'error') -> 'pandas.DataFrame':
+        """Build the report rows of a failed rule.
+
+        Args:
+            pd_df_mapfile_in (pandas.DataFrame): Mapping document.
+            failed (pandas.Series): True for every row failing the rule.
+            rule (str): Name of the rule.
+            column (str): Column checked by the rule.
+            severity (str): error or warning.
+
+        Returns:
+            pandas.DataFrame: Error report rows.
+
+        """
+        import pandas as pd
+
+        failed_rows = pd_df_mapfile_in.loc[failed.to_numpy(), column]
+
+        # Row numbers match the mapping sheet, where row 1 holds the header
+        return pd.DataFrame({'row': failed_rows.index + 2, 'rule': rule, 'severity': severity, 'column': column,
+                             'value': failed_rows.astype(object).to_numpy()})
@@ -3,28 +3,66 @@
 # Press ⌃R to execute it or replace it with your code.
 # Press Double ⇧ to search everywhere for classes, files, tool windows, actions, and settings.
 
-import argparse
+import logging
+import os
+import shutil
+from typing import TYPE_CHECKING
+from urllib.parse import quote
 
-import pandas
+from src.lineage_graph import LineageGraph
+from src.spool import SpoolWriter
+from src.utils import chunk_list
 
-from src.configs import ParseConfigs
-import pandas as pd
-import logging.config
-import requests
+# pandas is only imported when a parse method runs. The logging configuration is
+# loaded by the entry point instead of at import time.
+if TYPE_CHECKING:
+    import pandas
 
-from src.alation_helpers import AlationHelpers
-from src.models.alation.auth import AlationAuth
+    from src.progress import ProgressReporter
 
-from src.logs import LoggingConfigs, LogHelper, LogRotater
+LOGGER = logging.getLogger()
 
-from requests.packages.urllib3.exceptions import InsecureRequestWarning
-requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+OUTPUT_EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}
 
-logging.config.dictConfig(LoggingConfigs.logging_configs())
+alation_helper = None
 
-LOGGER = logging.getLogger()
 
-alation_helper = None
+def read_vds_definitions(location: str, output_format: str = None):
+    """Read VDS definitions written by VDSParser, as a single file or a partitioned directory.
+
+    Arrow IPC files are memory-mapped, so the returned table references the file without copying it.
+
+    Args:
+        location (str): Path of the VDS definition file or partitioned directory.
+        output_format (str): csv, parquet or arrow, derived from the file extension when not given.
+
+    Returns:
+        pyarrow.Table: VDS definitions.
+
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if output_format is None:
+        extension = os.path.splitext(location)[1]
+        output_format = next((name for name, value in OUTPUT_EXTENSIONS.items() if value == extension), None)
+
+    if os.path.isdir(location):
+        dataset_format = {'csv': 'csv', 'parquet': 'parquet', 'arrow': 'ipc'}[output_format or 'parquet']
+        return ds.dataset(location, format=dataset_format, partitioning='hive').to_table()
+
+    if output_format == 'arrow':
+        with pa.memory_map(location, 'r') as source:
+            return pa.ipc.open_file(source).read_all()
+
+    if output_format == 'parquet':
+        import pyarrow.parquet as pq
+
+        return pq.read_table(location, memory_map=True)
+
+    import pyarrow.csv as pa_csv
+
+    return pa_csv.read_csv(location)
 
 class VDSParser(object):
 
@@ -35,43 +73,315 @@ class VDSParser(object):
             configs (dict): Script Environment Configurations.
 
         """
-        self._output_filename = "logs/output.csv"
+        self.output_format = configs.get('features_vds_output_format', 'csv').lower()
+        self.partition_output = configs.get('features_vds_partition_output', False)
+        self.output_directory = configs.get('features_vds_output_directory', 'logs')
+        self.staging_patterns = configs.get('features_lineage_staging_patterns', [])
+
+        if self.output_format not in OUTPUT_EXTENSIONS:
+            raise ValueError(f"'{self.output_format}' is not a supported VDS output format.")
+
+        self._output_filename = self.output_location('output')
+
+    def output_location(self, name: str) -> str:
+        """Return the path of a VDS definition output in the configured directory and format.
+
+        Args:
+            name (str): Name of the output without extension.
+
+        Returns:
+            str: Path of the output file.
+
+        """
+        return os.path.join(self.output_directory, f'{name}{OUTPUT_EXTENSIONS[self.output_format]}')
+
+    def parse_and_create_target(self, pd_df_mapfile_in: 'pandas.DataFrame'):
+        pd_df_target_fd = self._fill_blanks(pd_df_mapfile_in.drop_duplicates(subset="Target Field Name"))
+
+        self.write_output(self.target_definitions(pd_df_target_fd),
+                          pd_df_target_fd["Target Database / Table Name"].tolist())
+
+    def parse_and_create_source(self, pd_df_mapfile_in: 'pandas.DataFrame'):
+        pd_df_source_fd = self._fill_blanks(pd_df_mapfile_in.drop_duplicates(subset="Source Field Name"))
+
+        self.write_output(self.source_definitions(pd_df_source_fd),
+                          pd_df_source_fd["Object/Source Table Name"].tolist())
+
+    @staticmethod
+    def target_definitions(pd_df_target_fd: 'pandas.DataFrame') -> 'pandas.DataFrame':
+        """Build the VDS definitions of the target columns.
+
+        Args:
+            pd_df_target_fd (pandas.DataFrame): Deduplicated mapping rows without missing values.
+
+        Returns:
+            pandas.DataFrame: VDS definitions.
+
+        """
+        return VDSParser._definitions(
+            pd_df_target_fd["Target Database / Table Name"], pd_df_target_fd["Target Field Name"],
+            pd_df_target_fd["Data Type Conformity"], pd_df_target_fd["Data Length"],
+            pd_df_target_fd["Nullable"].astype(str).str.lower())
+
+    @staticmethod
+    def source_definitions(pd_df_source_fd: 'pandas.DataFrame') -> 'pandas.DataFrame':
+        """Build the VDS definitions of the source columns.
+
+        Args:
+            pd_df_source_fd (pandas.DataFrame): Deduplicated mapping rows without missing values.
+
+        Returns:
+            pandas.DataFrame: VDS definitions.
+
+        """
+        return VDSParser._definitions(
+            pd_df_source_fd["Object/Source Table Name"], pd_df_source_fd["Source Field Name"],
+            pd_df_source_fd["Source Data Type"], pd_df_source_fd["Source Field Length"], '')
+
+    @staticmethod
+    def _definitions(table_names: 'pandas.Series', field_names: 'pandas.Series', data_types: 'pandas.Series',
+                     data_lengths: 'pandas.Series', nullable) -> 'pandas.DataFrame':
+        """Build VDS definitions with vectorized string operations.
+
+        Args:
+            table_names (pandas.Series): Table names.
+            field_names (pandas.Series): Field names.
+            data_types (pandas.Series): Data types.
+            data_lengths (pandas.Series): Data lengths.
+            nullable (pandas.Series|str): Nullable flags.
+
+        Returns:
+            pandas.DataFrame: VDS definitions.
+
+        """
+        import pandas as pd
+
+        return pd.DataFrame({
+            'key': ('schema_name.' + table_names.astype(str) + '.' + field_names.astype(str)).to_numpy(),
+            'table_type': '',
+            'column_type': (data_types.astype(str) + '(' + data_lengths.astype(str) + ')').to_numpy(),
+            'index_type': '',
+            'columns_name': '',
+            'nullable': nullable.to_numpy() if isinstance(nullable, pd.Series) else nullable})
+
+    @staticmethod
+    def _fill_blanks(pd_df_in: 'pandas.DataFrame') -> 'pandas.DataFrame':
+        """Replace missing values with empty strings, including in categorical columns.
+
+        Args:
+            pd_df_in (pandas.DataFrame): Mapping document rows.
+
+        Returns:
+            pandas.DataFrame: Mapping document rows without missing values.
+
+        """
+        pd_df_out = pd_df_in.copy()
+
+        for column in pd_df_out.select_dtypes('category').columns:
+            if '' not in pd_df_out[column].cat.categories:
+                pd_df_out[column] = pd_df_out[column].cat.add_categories('')
+
+        return pd_df_out.fillna('')
+
+    def write_output(self, pd_df_out: 'pandas.DataFrame', table_names: list = None):
+        """Write the VDS definitions in the configured output format.
+
+        Partitioned output is written as one file per table into
+        <output_filename>/table_name=<table>/part-0.<extension>, with the table name URI-encoded
+        so a '/' in a Database / Table name does not nest partitions. The output of a previous
+        run is removed first, so no stale partition or file survives.
+
+        Args:
+            pd_df_out (pandas.DataFrame): VDS definitions.
+            table_names (list): Table name of every VDS definition, used to partition the output.
+
+        """
+        self._remove_output(self.output_filename)
+
+        if not self.partition_output or table_names is None:
+            self._write_file(pd_df_out, self.output_filename)
+            return
+
+        import pandas
+
+        # A Series key is never mistaken for column labels, unlike a list with a single table name
+        for table_name, pd_df_partition in pd_df_out.groupby(pandas.Series(table_names, index=pd_df_out.index),
+                                                             sort=False):
+            partition_directory = os.path.join(self.output_filename, f'table_name={quote(str(table_name), safe="")}')
+            os.makedirs(partition_directory, exist_ok=True)
+            self._write_file(pd_df_partition,
+                             os.path.join(partition_directory, f'part-0{OUTPUT_EXTENSIONS[self.output_format]}'))
+
+    @staticmethod
+    def _remove_output(location: str):
+        """Remove the VDS definition file or partitioned directory written by a previous run.
+
+        Args:
+            location (str): Path of the output file or partitioned directory.
+
+        """
+        if os.path.isdir(location):
+            shutil.rmtree(location)
+        elif os.path.exists(location):
+            os.remove(location)
+
+    def _write_file(self, pd_df_out: 'pandas.DataFrame', file_location: str):
+        """Write a single VDS definition file.
+
+        Args:
+            pd_df_out (pandas.DataFrame): VDS definitions.
+            file_location (str): Path of the output file.
+
+        """
+        if self.output_format == 'csv':
+            pd_df_out.to_csv(file_location, sep=",", index=False)
+            return
+
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(pd_df_out, preserve_index=False)
+
+        if self.output_format == 'parquet':
+            import pyarrow.parquet as pq
+
+            pq.write_table(table, file_location)
+        else:
+            with pa.OSFile(file_location, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    def build_lineage_payloads(self, pd_df_mapfile_in: 'pandas.DataFrame', batch_size: int) -> list:
+        """Build the Alation dataflow payloads linking the source columns to the target columns.
+
+        Args:
+            pd_df_mapfile_in (pandas.DataFrame): Mapping document.
+            batch_size (int): Maximum number of lineage paths in a single payload.
+
+        Returns:
+            list: Alation dataflow payloads.
+
+        """
+        return [self.build_lineage_payload(paths_batch)
+                for paths_batch in chunk_list(list(self.lineage_paths(pd_df_mapfile_in)), batch_size)]
+
+    def spool_lineage_paths(self, pd_df_mapfile_in: 'pandas.DataFrame', spool_writer: SpoolWriter,
+                            progress: 'ProgressReporter' = None, report_every: int = 1000) -> int:
+        """Stream the lineage paths of the mapping document into an on-disk spool.
+
+        Args:
+            pd_df_mapfile_in (pandas.DataFrame): Mapping document.
+            spool_writer (SpoolWriter): Writer of the lineage path spool.
+            progress (ProgressReporter): Progress the parsed lineage paths are reported to while spooling.
+            report_every (int): Number of spooled lineage paths between two progress updates.
+
+        Returns:
+            int: Number of spooled lineage paths.
+
+        """
+        unreported = 0
+
+        for lineage_path in self.lineage_paths(pd_df_mapfile_in):
+            spool_writer.write(lineage_path)
+            unreported += 1
+
+            if progress is not None and unreported == report_every:
+                progress.increment('parsed', unreported)
+                unreported = 0
+
+        if progress is not None and unreported:
+            progress.increment('parsed', unreported)
+
+        return spool_writer.records
+
+    def lineage_paths(self, pd_df_mapfile_in: 'pandas.DataFrame'):
+        """Yield the deduplicated lineage paths of the mapping document.
+
+        The edges are loaded into a LineageGraph which removes duplicates and collapses the
+        configured staging hops. Each path links all sources of a target column to it through
+        the dataflow object of the target table.
+
+        Args:
+            pd_df_mapfile_in (pandas.DataFrame): Mapping document.
+
+        """
+        yield from self.compact_lineage(self.lineage_edges(pd_df_mapfile_in))
 
-    def parse_and_create_target(self, pd_df_mapfile_in: pandas.DataFrame):
+    @staticmethod
+    def lineage_edges(pd_df_mapfile_in: 'pandas.DataFrame') -> 'pandas.DataFrame':
+        """Build the source to target column edges of the mapping document.
 
-        pd_df_target_fd = pd_df_mapfile_in.drop_duplicates(subset="Target Field Name").fillna('')
+        Args:
+            pd_df_mapfile_in (pandas.DataFrame): Mapping document.
 
-        rows = []
-        for index, row in pd_df_target_fd.iterrows():
-            rows.append([f'schema_name.{row.get("Target Database / Table Name")}.{row.get("Target Field Name")}',
-                         '',
-                         f'{row.get("Data Type Conformity")}({row.get("Data Length")})',
-                         '',
-                         '',
-                         str(row.get("Nullable")).lower(),
-                         ])
+        Returns:
+            pandas.DataFrame: Unique source_key and target_key column pairs.
 
-        pd_out_csv = pd.DataFrame(rows, columns=['key', 'table_type', 'column_type', 'index_type', 'columns_name',
-                                                 'nullable'])
-        pd_out_csv.to_csv(self.output_filename, sep=",", index=False)
+        """
+        import pandas as pd
 
-    def parse_and_create_source(self, pd_df_mapfile_in: pandas.DataFrame):
+        pd_df_lineage = pd_df_mapfile_in[["Object/Source Table Name", "Source Field Name",
+                                          "Target Database / Table Name", "Target Field Name"]]
+        pd_df_lineage = pd_df_lineage.dropna().drop_duplicates()
 
-        pd_df_target_fd = pd_df_mapfile_in.drop_duplicates(subset="Source Field Name").fillna('')
+        return pd.DataFrame({
+            'source_key': ('schema_name.' + pd_df_lineage["Object/Source Table Name"].astype(str) + '.'
+                           + pd_df_lineage["Source Field Name"].astype(str)).to_numpy(),
+            'target_key': ('schema_name.' + pd_df_lineage["Target Database / Table Name"].astype(str) + '.'
+                           + pd_df_lineage["Target Field Name"].astype(str)).to_numpy()})
 
-        rows = []
-        for index, row in pd_df_target_fd.iterrows():
-            rows.append([f'schema_name.{row.get("Object/Source Table Name")}.{row.get("Source Field Name")}',
-                         '',
-                         f'{row.get("Source Data Type")}({row.get("Source Field Length")})',
-                         '',
-                         '',
-                         "",
-                         ])
+    def compact_lineage(self, pd_df_edges: 'pandas.DataFrame'):
+        """Yield the lineage paths of a set of column edges.
 
+        Without staging patterns every target table is compacted on its own, so only the graph
+        of one target table is held in memory at a time. Collapsing a staging hop links edges of
+        different target tables, so with staging patterns the graph of every unique edge is held
+        in memory before the first path is yielded.
+
+        Args:
+            pd_df_edges (pandas.DataFrame): source_key and target_key column pairs.
+
+        """
+        if self.staging_patterns:
+            partitions = [pd_df_edges]
+        else:
+            target_tables = pd_df_edges['target_key'].map(LineageGraph.table_key)
+            partitions = (partition for _, partition in pd_df_edges.groupby(target_tables, sort=True))
+
+        edges_added = unique_edges = collapsed = 0
+
+        for pd_df_partition in partitions:
+            lineage_graph = LineageGraph(self.staging_patterns)
+            lineage_graph.add_edges(zip(pd_df_partition['source_key'], pd_df_partition['target_key']))
+            collapsed += lineage_graph.compact()
+            edges_added += lineage_graph.edges_added
+            unique_edges += len(lineage_graph)
+
+            yield from lineage_graph.paths()
+
+        LOGGER.info(f"Lineage graph: {edges_added} mapped edges, {unique_edges} unique edges, "
+                    f"{collapsed} staging columns collapsed")
+
+    @staticmethod
+    def build_lineage_payload(paths_batch: list) -> dict:
+        """Build a single Alation dataflow payload from a batch of lineage paths.
+
+        Args:
+            paths_batch (list): Source column key(s), dataflow and target column keys.
+
+        Returns:
+            dict: Alation dataflow payload with the dataflow objects referenced by the paths.
+
+        """
+        dataflows = dict.fromkeys(dataflow for _, dataflow, _ in paths_batch)
 
-        pd_out_csv = pd.DataFrame(rows, columns=['key', 'table_type', 'column_type', 'index_type', 'columns_name', 'nullable'])
-        pd_out_csv.to_csv(self.output_filename, sep=",", index=False)
+        return {'dataflow_objects': [{'external_id': dataflow,
+                                      'title': dataflow.replace('api/', '', 1),
+                                      'content': f'Mapping document load of {dataflow.replace("api/", "", 1)}'}
+                                     for dataflow in dataflows],
+                'paths': [[[{'otype': 'column', 'key': source_key}
+                            for source_key in ([source_keys] if isinstance(source_keys, str) else source_keys)],
+                           [{'otype': 'dataflow', 'key': dataflow}],
+                           [{'otype': 'column', 'key': target_key}]]
+                          for source_keys, dataflow, target_key in paths_batch]}
 
     @property
     def output_filename(self) -> str:
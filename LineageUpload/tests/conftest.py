@@ -0,0 +1,117 @@
+"""Shared pytest configuration and fixtures of the LineageUpload tests."""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+# The modules are imported as src.<module> from the LineageUpload directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubAlation(object):
+    """Local HTTP server answering the Alation REST API requests with canned responses."""
+
+    def __init__(self):
+        """Create an instance of the StubAlation and start serving on a free local port."""
+
+        self.routes = {}
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                path, query = urlsplit(self.path).path, parse_qs(urlsplit(self.path).query)
+                stub.requests.append({'method': self.command, 'path': self.path, 'headers': dict(self.headers),
+                                      'body': body})
+
+                route, with_query = stub.routes.get((self.command, path), (None, False))
+                if route is None:
+                    status_code, response_body = 404, {'detail': 'Not found'}
+                else:
+                    status_code, response_body = route(self.headers, body, query) if with_query else route(
+                        self.headers, body)
+                content = json.dumps(response_body).encode()
+
+                self.send_response(status_code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.host = f'http://127.0.0.1:{self.server.server_port}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def route(self, method: str, path: str, handler, with_query: bool = False):
+        """Answer the requests of an endpoint with handler(headers, body) -> (status code, JSON body).
+
+        With with_query the handler also receives the parsed query string, handler(headers, body, query).
+        """
+
+        self.routes[(method, path)] = (handler, with_query)
+
+    def respond(self, method: str, path: str, status_code: int = 200, response_body=None):
+        """Answer the requests of an endpoint with a fixed response."""
+
+        self.route(method, path, lambda headers, body: (status_code, {} if response_body is None else response_body))
+
+
+@pytest.fixture
+def stub_alation():
+    stub = StubAlation()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+@pytest.fixture
+def alation_configs(tmp_path, stub_alation):
+    return {'alation_host': stub_alation.host,
+            'alation_username': 'user',
+            'alation_password': 'password',
+            'alation_user_id': 1,
+            'alation_refresh_token_name': 'LineageUpload',
+            'alation_refresh_token_location': str(tmp_path / 'refresh_token.txt'),
+            'alation_enable_ssl': False,
+            'alation_pool_size': 2,
+            'features_metrics_directory': str(tmp_path / 'metrics'),
+            'features_job_status_sleep': 0,
+            'features_job_status_max_sleep': 0,
+            'features_resubmit_attempts': 1,
+            'features_pipeline_queue_size': 2,
+            'features_pipeline_workers': 1}
+
+
+@pytest.fixture
+def configs_ini(tmp_path):
+    """Return a function writing a configs.ini, the Alation sections only need their host."""
+
+    def write(alation_sections: dict, features: dict = None, custom_fields: dict = None) -> str:
+        sections = {name: {'username': 'user', 'user_id': 1, 'password': 'password',
+                           'refresh_token_name': 'LineageUpload', 'https': False, 'ssl_cert': '', **options}
+                    for name, options in alation_sections.items()}
+        sections['Features'] = {'download_xml_request_size': 500, 'download_json_request_size': 1000,
+                                'upload_request_size': 500, 'job_status_sleep': 0, 'job_status_max_sleep': 0,
+                                'log_retention_period': 5, 'resubmit_attempts': 0, 'pipeline_workers': 1,
+                                **(features or {})}
+        if custom_fields is not None:
+            sections['CustomFields'] = custom_fields
+
+        file_location = tmp_path / 'configs.ini'
+        file_location.write_text(''.join(f'[{name}]\n' + ''.join(f'{key}={value}\n' for key, value in options.items())
+                                         for name, options in sections.items()))
+
+        return str(file_location)
+
+    return write
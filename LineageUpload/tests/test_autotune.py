@@ -0,0 +1,43 @@
+"""Tests of the adaptive concurrency and chunk size control."""
+
+from src.alation_rest import AlationRestAPI
+
+LINEAGE = 'POST /integration/v2/dataflow/'
+JOB_STATUS = 'GET /api/v1/bulk_metadata/job/'
+REPORTS = 'GET /integration/v2/bi/server/{id}/report/'
+
+
+def test_limit_starts_from_the_pipeline_workers(tmp_path, stub_alation, alation_configs):
+    alation_api = AlationRestAPI({**alation_configs, 'alation_pool_size': 8, 'features_pipeline_workers': 2,
+                                  'features_autotune': True, 'features_autotune_directory': str(tmp_path)})
+
+    assert alation_api.autotune.limit == 2
+    assert alation_api.autotune.max_concurrency == 8
+    assert alation_api.pipeline_workers(2) == 8
+
+
+def test_chunk_sizes_only_grow_from_their_own_endpoint(tmp_path, stub_alation, alation_configs):
+    alation_api = AlationRestAPI({**alation_configs, 'alation_pool_size': 8, 'features_pipeline_workers': 2,
+                                  'features_upload_request_size': 100,
+                                  'features_download_json_request_size': 1000,
+                                  'features_autotune': True, 'features_autotune_directory': str(tmp_path)})
+    autotune = alation_api.autotune
+
+    for status_code in [200] * 10 + [401, 404] * 10:
+        autotune.record(JOB_STATUS, 0.1, status_code)
+
+    assert autotune.settings == {'concurrency': 2, 'chunk_sizes': {'upload': 100, 'download': 1000}}
+
+    autotune.record(LINEAGE, 0.1, 202)
+    autotune.record(LINEAGE, 0.1, 202)
+
+    assert autotune.settings == {'concurrency': 3, 'chunk_sizes': {'upload': 110, 'download': 1000}}
+
+    for _ in range(3):
+        autotune.record(REPORTS, 0.1, 200)
+
+    assert autotune.settings == {'concurrency': 4, 'chunk_sizes': {'upload': 110, 'download': 1100}}
+
+    autotune.record(LINEAGE, 0.1, 503)
+
+    assert autotune.settings == {'concurrency': 2, 'chunk_sizes': {'upload': 55, 'download': 550}}
@@ -0,0 +1,38 @@
+"""Tests of the HTTP traffic record and replay against a stub Alation host."""
+
+from src.alation_rest import AlationRestAPI
+from src.models.alation.auth import AlationAuth
+
+ACCESS_TOKEN_PATH = '/integration/v1/createAPIAccessToken/'
+LINEAGE_PATH = '/integration/v2/dataflow/'
+
+
+def upload(alation_api: AlationRestAPI) -> tuple:
+    alation_auth = AlationAuth()
+    alation_auth.refresh_token = 'secret-refresh-token'
+    alation_auth.user_id = 1
+    alation_api.api_generate_access_token(alation_auth)
+
+    return alation_auth, alation_api.api_create_lineage(alation_auth.access_token, {'paths': []})
+
+
+def test_recorded_traffic_replays_without_credentials(tmp_path, stub_alation, alation_configs):
+    cassette_location = tmp_path / 'cassette.ndjson'
+    configs = {**alation_configs, 'alation_cassette_location': str(cassette_location),
+               'alation_replay_latency_scale': 0}
+    stub_alation.respond('POST', ACCESS_TOKEN_PATH, 201, {'api_access_token': 'secret-access-token',
+                                                          'token_status': 'ACTIVE'})
+    stub_alation.respond('POST', LINEAGE_PATH, 202, {'job_id': 42})
+
+    recorded_auth, recorded_job = upload(AlationRestAPI({**configs, 'alation_http_mode': 'record'}))
+    stub_alation.server.shutdown()
+
+    replayed_auth, replayed_job = upload(AlationRestAPI({**configs, 'alation_http_mode': 'replay'}))
+
+    assert recorded_auth.access_token == 'secret-access-token'
+    assert replayed_auth.access_token == 'cassette-api-access-token'
+    assert replayed_job.id == recorded_job.id == 42
+
+    cassette = cassette_location.read_text()
+    assert 'secret' not in cassette
+    assert len(cassette.splitlines()) == 2
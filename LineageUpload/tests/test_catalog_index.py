@@ -0,0 +1,108 @@
+"""Tests of the local Catalog Index of the Virtual BI Server objects."""
+
+import sqlite3
+
+from src.catalog_index import CatalogIndex
+
+HOST = 'alation.example.com'
+
+API_REPORTS = [
+    {'id': 7, 'external_id': 'r1', 'name': 'Sales ', 'parent_folder': {'id': 3, 'external_id': 'f1'},
+     'source_url': 'https://bi/r1', 'report_type': 'DASHBOARD'},
+    {'id': 8, 'external_id': 'r2', 'name': 'Costs', 'parent_folder': {'id': 3, 'external_id': 'f1'},
+     'source_url': 'https://bi/r2', 'report_type': 'DASHBOARD', 'description_at_source': 'Monthly'}]
+
+
+def report_payload(external_id: str, **fields) -> dict:
+    payload = {'external_id': external_id, 'name': 'Sales', 'parent_folder': 'f1',
+               'url': f'https://bi/{external_id}', 'report_type': 'DASHBOARD', 'description_at_source': ''}
+    payload.update(fields)
+
+    return payload
+
+
+def test_saved_index_loads_back(tmp_path):
+    database_location = str(tmp_path / 'catalog_index.db')
+
+    catalog_index = CatalogIndex(HOST, 1, database_location)
+    catalog_index.load_from_api_objects('REPORT', API_REPORTS)
+    catalog_index.save()
+
+    reloaded_index = CatalogIndex(HOST, 1, database_location)
+
+    assert len(reloaded_index) == 2
+    assert reloaded_index.oid('REPORT', 'r1') == 7
+    assert reloaded_index.oid('REPORT', 'r2') == 8
+    assert reloaded_index._objects == catalog_index._objects
+
+
+def test_changed_content_is_updated(tmp_path):
+    catalog_index = CatalogIndex(HOST, 1)
+    catalog_index.load_from_api_objects('REPORT', API_REPORTS)
+
+    partitions = catalog_index.partition('REPORT', [
+        report_payload('r1'),
+        report_payload('r2', name='Costs', description_at_source='Quarterly'),
+        report_payload('r3')])
+
+    assert [payload['external_id'] for payload in partitions[CatalogIndex.SKIP]] == ['r1']
+    assert [payload['external_id'] for payload in partitions[CatalogIndex.UPDATE]] == ['r2']
+    assert [payload['external_id'] for payload in partitions[CatalogIndex.CREATE]] == ['r3']
+
+
+def test_in_memory_and_persisted_index_classify_alike(tmp_path):
+    database_location = str(tmp_path / 'catalog_index.db')
+    payloads = [report_payload('r1'), report_payload('r2', name='Costs'), report_payload('r3')]
+
+    in_memory_index = CatalogIndex(HOST, 1)
+    in_memory_index.load_from_api_objects('REPORT', API_REPORTS)
+
+    persisted_index = CatalogIndex(HOST, 1, database_location)
+    persisted_index.load_from_api_objects('REPORT', API_REPORTS)
+    persisted_index.save()
+    persisted_index = CatalogIndex(HOST, 1, database_location)
+
+    assert ([in_memory_index.classify('REPORT', payload) for payload in payloads]
+            == [persisted_index.classify('REPORT', payload) for payload in payloads]
+            == [CatalogIndex.SKIP, CatalogIndex.UPDATE, CatalogIndex.CREATE])
+
+
+def test_hosts_sharing_a_bi_server_id_keep_their_own_index(tmp_path):
+    database_location = str(tmp_path / 'catalog_index.db')
+
+    production_index = CatalogIndex(HOST, 1, database_location)
+    production_index.load_from_api_objects('REPORT', API_REPORTS)
+    production_index.save()
+
+    test_index = CatalogIndex('alation-test.example.com', 1, database_location)
+    test_index.load_from_api_objects('REPORT', [{**API_REPORTS[0], 'id': 70, 'name': 'Renamed'}])
+    test_index.save()
+
+    production_index = CatalogIndex(HOST, 1, database_location)
+    test_index = CatalogIndex('alation-test.example.com', 1, database_location)
+
+    assert len(production_index) == 2
+    assert production_index.oid('REPORT', 'r1') == 7
+    assert production_index.classify('REPORT', report_payload('r1')) == CatalogIndex.SKIP
+    assert len(test_index) == 1
+    assert test_index.oid('REPORT', 'r1') == 70
+    assert test_index.classify('REPORT', report_payload('r1')) == CatalogIndex.UPDATE
+
+
+def test_index_without_hosts_is_rebuilt(tmp_path):
+    database_location = str(tmp_path / 'catalog_index.db')
+
+    with sqlite3.connect(database_location) as connection:
+        connection.execute('CREATE TABLE catalog_index (bi_server_id INTEGER, object_type TEXT, '
+                           'external_id TEXT, oid INTEGER, content_hash TEXT, '
+                           'PRIMARY KEY (bi_server_id, object_type, external_id))')
+        connection.execute("INSERT INTO catalog_index VALUES (1, 'REPORT', 'r1', 7, 'stale')")
+    connection.close()
+
+    catalog_index = CatalogIndex(HOST, 1, database_location)
+    assert len(catalog_index) == 0
+
+    catalog_index.load_from_api_objects('REPORT', API_REPORTS)
+    catalog_index.save()
+
+    assert len(CatalogIndex(HOST, 1, database_location)) == 2
@@ -0,0 +1,35 @@
+"""Tests of the request body compression negotiation against a stub Alation host."""
+
+import pytest
+
+from src.alation_rest import AlationRestAPI
+
+LINEAGE_PATH = '/integration/v2/dataflow/'
+
+
+@pytest.fixture
+def alation_api(alation_configs):
+    return AlationRestAPI({**alation_configs, 'alation_request_compression': 'gzip', 'alation_compression_threshold': 1})
+
+
+def test_unrelated_bad_request_keeps_compression(stub_alation, alation_api):
+    stub_alation.respond('POST', LINEAGE_PATH, 400, {'detail': 'Invalid dataflow object'})
+
+    api_response = alation_api._request('POST', f'{stub_alation.host}{LINEAGE_PATH}', json={'paths': []})
+
+    assert api_response.status_code == 400
+    assert len(stub_alation.requests) == 1
+    assert alation_api._compression_accepted is None
+
+
+@pytest.mark.parametrize('status_code, response_body', [(415, {'detail': 'Unsupported Media Type'}),
+                                                        (400, {'detail': 'Could not decode gzip body'})])
+def test_rejected_encoding_is_sent_uncompressed(stub_alation, alation_api, status_code, response_body):
+    stub_alation.route('POST', LINEAGE_PATH, lambda headers, body: (
+        (status_code, response_body) if headers.get('Content-Encoding') else (202, {'job_id': 1})))
+
+    api_response = alation_api._request('POST', f'{stub_alation.host}{LINEAGE_PATH}', json={'paths': []})
+
+    assert api_response.status_code == 202
+    assert [request['headers'].get('Content-Encoding') for request in stub_alation.requests] == ['gzip', None]
+    assert alation_api._compression_accepted is False
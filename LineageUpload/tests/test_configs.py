@@ -0,0 +1,97 @@
+"""Tests of the Script Configurations parsing."""
+
+import os
+
+from src.configs import ConfigEncryption, ParseConfigs
+
+
+def test_every_alation_target_section_is_parsed(configs_ini):
+    file_location = configs_ini({'Alation': {'host': 'https://default.example.com'},
+                                 'Alation:prod': {'host': 'https://prod.example.com', 'pool_size': 4},
+                                 'Alation:qa': {'host': 'https://qa.example.com'}},
+                                features={'pipeline_workers': 3})
+
+    target_configs = ParseConfigs().generate_target_configs(file_location)
+
+    assert list(target_configs) == ['prod', 'qa']
+    assert target_configs['prod']['alation_host'] == 'https://prod.example.com'
+    assert target_configs['prod']['alation_pool_size'] == 4
+    assert target_configs['qa']['alation_host'] == 'https://qa.example.com'
+    assert target_configs['qa']['alation_pool_size'] == 10
+    assert all(configs['features_pipeline_workers'] == 3 for configs in target_configs.values())
+
+
+def test_single_alation_section_is_the_default_target(configs_ini):
+    file_location = configs_ini({'Alation': {'host': 'https://default.example.com'}})
+
+    target_configs = ParseConfigs().generate_target_configs(file_location)
+
+    assert list(target_configs) == ['default']
+    assert target_configs['default']['alation_refresh_token_location'] == 'configs/refresh_token.txt'
+
+
+def test_shared_refresh_token_files_are_suffixed_with_the_target(configs_ini):
+    file_location = configs_ini({'Alation:prod': {'host': 'https://prod.example.com'},
+                                 'Alation:qa': {'host': 'https://qa.example.com',
+                                                'refresh_token_location': 'configs/refresh_token.txt'},
+                                 'Alation:dev': {'host': 'https://dev.example.com',
+                                                 'refresh_token_location': 'configs/dev_token'}})
+
+    target_configs = ParseConfigs().generate_target_configs(file_location)
+
+    assert {name: configs['alation_refresh_token_location'] for name, configs in target_configs.items()} == {
+        'prod': 'configs/refresh_token_prod.txt',
+        'qa': 'configs/refresh_token_qa.txt',
+        'dev': 'configs/dev_token'}
+
+
+def test_cached_configs_are_rebuilt_when_the_file_changes(configs_ini, monkeypatch):
+    file_location = configs_ini({'Alation': {'host': 'https://first.example.com'}})
+    builds = []
+    alation_configs = ParseConfigs._alation_configs
+    monkeypatch.setattr(ParseConfigs, '_alation_configs',
+                        lambda self, section: builds.append(section.name) or alation_configs(self, section))
+
+    assert ParseConfigs().generate_configs(file_location)['alation_host'] == 'https://first.example.com'
+    assert ParseConfigs().generate_configs(file_location)['alation_host'] == 'https://first.example.com'
+    assert len(builds) == 1
+
+    modified_time = os.stat(file_location).st_mtime_ns
+    configs_ini({'Alation': {'host': 'https://second.example.com'}})
+    os.utime(file_location, ns=(modified_time + 10 ** 9, modified_time + 10 ** 9))
+
+    assert ParseConfigs().generate_configs(file_location)['alation_host'] == 'https://second.example.com'
+    assert len(builds) == 2
+
+
+def test_cached_configs_are_copies(configs_ini):
+    file_location = configs_ini({'Alation:prod': {'host': 'https://prod.example.com'}},
+                                custom_fields={'REPORT': 'Report Path:report_location'})
+
+    target_configs = ParseConfigs().generate_target_configs(file_location)
+    target_configs['prod']['alation_host'] = 'https://changed.example.com'
+    target_configs['prod']['alation_custom_fields']['REPORT'].clear()
+
+    reloaded_configs = ParseConfigs().generate_target_configs(file_location)
+
+    assert reloaded_configs['prod']['alation_host'] == 'https://prod.example.com'
+    assert list(reloaded_configs['prod']['alation_custom_fields']['REPORT'][0]) == ['Report Path']
+
+
+def test_plaintext_values_are_not_decrypted(tmp_path):
+    config_encryption = ConfigEncryption(str(tmp_path / 'missing.key'))
+
+    assert config_encryption.decrypt_values({'username': 'user', 'password': ''}) == {'username': 'user',
+                                                                                      'password': ''}
+    # Neither the key nor the cipher were needed
+    assert config_encryption._fernet is None
+    assert not (tmp_path / 'missing.key').exists()
+
+
+def test_encrypted_values_are_decrypted(tmp_path):
+    config_encryption = ConfigEncryption(str(tmp_path / 'configs.key'))
+    encrypted_password = config_encryption.encrypt_string('secret')
+
+    assert encrypted_password.startswith(ConfigEncryption.token_prefix)
+    assert ConfigEncryption(str(tmp_path / 'configs.key')).decrypt_values(
+        {'username': 'user', 'password': encrypted_password}) == {'username': 'user', 'password': 'secret'}
@@ -0,0 +1,54 @@
+"""Tests of the background resolution of the configured custom field IDs."""
+
+import threading
+
+from src.alation_rest import AlationRestAPI
+from src.configs import ParseConfigs
+
+CUSTOM_FIELD_PATH = '/integration/v2/custom_field/'
+CUSTOM_FIELD_IDS = {'Report Path': 11, 'Business Area': 12, 'Field Project Name': 13}
+
+
+def test_configured_custom_fields_are_resolved_once_before_the_upload(stub_alation, alation_configs, configs_ini):
+    lookups_released = threading.Event()
+
+    def custom_field(headers, body, query):
+        lookups_released.wait(5)
+        field_name = query['name_singular'][0]
+
+        if field_name == 'Broken Field':
+            return 500, {'detail': 'Internal error'}
+
+        return 200, [{'id': CUSTOM_FIELD_IDS[field_name], 'name_singular': field_name}]
+
+    stub_alation.route('GET', CUSTOM_FIELD_PATH, custom_field, with_query=True)
+    custom_fields = ParseConfigs().generate_configs(configs_ini(
+        {'Alation': {'host': stub_alation.host}},
+        custom_fields={'REPORT': 'Report Path:report_location, Business Area:business_area, Broken Field:broken',
+                       'REPORT FIELD': 'Field Project Name:project_name, Business Area:business_area'}))[
+        'alation_custom_fields']
+
+    alation_api = AlationRestAPI({**alation_configs, 'alation_custom_fields': custom_fields})
+    lookups = alation_api.resolve_custom_fields('token')
+
+    # The lookups run in the background until the first upload waits for them
+    assert len(lookups) == 4
+    assert not any(lookup.done() for lookup in lookups)
+    assert alation_api.resolve_custom_fields('token') is lookups
+
+    lookups_released.set()
+    resolved_fields = alation_api.api_query_custom_fields('token', 'REPORT')
+
+    assert all(lookup.done() for lookup in lookups)
+    assert {field_name: properties['properties']['f_oid'] for custom_field in resolved_fields['REPORT']
+            for field_name, properties in custom_field.items()} == {
+        'Report Path': 11, 'Business Area': 12, 'Broken Field': None}
+    assert {field_name: properties['properties']['f_oid'] for custom_field in resolved_fields['REPORT FIELD']
+            for field_name, properties in custom_field.items()} == {
+        'Field Project Name': 13, 'Business Area': 12}
+    assert sorted(request['path'] for request in stub_alation.requests) == sorted(
+        f'{CUSTOM_FIELD_PATH}?name_singular={field_name}'.replace(' ', '%20')
+        for field_name in ['Report Path', 'Business Area', 'Broken Field', 'Field Project Name'])
+    # The configured properties are copied per target, not resolved in place
+    assert all(properties['properties']['f_oid'] == '' for custom_field in custom_fields['REPORT']
+               for properties in custom_field.values())
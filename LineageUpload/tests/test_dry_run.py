@@ -0,0 +1,102 @@
+"""Tests of the offline compilation of the upload requests."""
+
+import json
+import os
+
+from src.dry_run import JOB_ENDPOINT, PayloadCompiler
+from src.metrics import RunMetrics
+from src.spool import SpooledPayloads, SpoolReader, SpoolWriter
+
+LINEAGE_ENDPOINT = 'POST /integration/v2/dataflow/'
+
+
+def target(tmp_path, host: str, **configs) -> dict:
+    return {'alation_host': f'https://{host}', 'alation_pool_size': 8,
+            'features_metrics_directory': str(tmp_path / 'metrics'),
+            'features_autotune_directory': str(tmp_path / 'autotune'),
+            'features_upload_request_size': 10, 'features_download_json_request_size': 1000,
+            'features_pipeline_workers': 2, **configs}
+
+
+def spooled_paths(tmp_path, records: int) -> SpooledPayloads:
+    with SpoolWriter(str(tmp_path / 'spool')) as spool_writer:
+        spool_writer.write_many([f'path-{record}'] for record in range(records))
+
+    return SpooledPayloads(SpoolReader(str(tmp_path / 'spool')), 10, lambda chunk: {'paths': chunk})
+
+
+def test_request_bodies_are_written_one_per_line(tmp_path):
+    compiler = PayloadCompiler(str(tmp_path / 'dry_run'))
+    request_bodies = [{'paths': ['a'] * size} for size in range(1, 11)]
+
+    compiler.add('lineage', LINEAGE_ENDPOINT, request_bodies)
+    summary = compiler.report({})['lineage']
+
+    with open(summary['file'], 'r') as ndjson_file:
+        assert [json.loads(line) for line in ndjson_file] == request_bodies
+
+    sizes = sorted(len(json.dumps(request_body)) for request_body in request_bodies)
+    assert summary['requests'] == summary['jobs'] == 10
+    assert summary['total_bytes'] == sum(sizes)
+    assert (summary['min_bytes'], summary['p50_bytes'], summary['p90_bytes'], summary['p99_bytes'],
+            summary['max_bytes']) == (sizes[0], sizes[4], sizes[8], sizes[9], sizes[9])
+
+
+def test_requests_without_jobs_are_not_counted_as_jobs(tmp_path):
+    compiler = PayloadCompiler(str(tmp_path / 'dry_run'))
+
+    compiler.add('custom_fields', 'PUT /api/v2/custom_field_value/', [{'value': 1}], creates_jobs=False)
+
+    assert compiler.report({})['custom_fields']['jobs'] == 0
+
+
+def test_runtime_is_projected_from_the_recorded_run(tmp_path, capsys):
+    configs = target(tmp_path, 'alation.example.com')
+    metrics = RunMetrics(os.path.join(configs['features_metrics_directory'], 'alation.example.com.json'))
+    metrics.record_request(LINEAGE_ENDPOINT, 0.5)
+    metrics.record_request(JOB_ENDPOINT, 0.1)
+    metrics.set('jobs_completed', 2)
+    metrics.set('job_polls', 6)
+    metrics.save()
+
+    compiler = PayloadCompiler(str(tmp_path / 'dry_run'))
+    compiler.add('lineage', LINEAGE_ENDPOINT, [{'paths': []}] * 4)
+    compiler.report({'prod': configs})
+
+    # 4 requests of 0.5 seconds and 4 jobs polled 3 times for 0.1 seconds, on 2 workers
+    assert "Target 'prod': projected runtime 1.6 seconds (3.0 polls per job)" in capsys.readouterr().out
+
+
+def test_unknown_endpoints_are_reported(tmp_path, capsys):
+    compiler = PayloadCompiler(str(tmp_path / 'dry_run'))
+    compiler.add('lineage', LINEAGE_ENDPOINT, [{'paths': []}])
+    compiler.report({'prod': target(tmp_path, 'alation.example.com')})
+
+    assert f'no recorded latency for {LINEAGE_ENDPOINT}' in capsys.readouterr().out
+
+
+def test_requests_are_chunked_with_the_auto_tuned_size(tmp_path):
+    tuned = target(tmp_path, 'tuned.example.com', features_autotune=True)
+    os.makedirs(tuned['features_autotune_directory'])
+    with open(os.path.join(tuned['features_autotune_directory'], 'tuned.example.com.json'), 'w') as settings_file:
+        json.dump({'concurrency': 4, 'chunk_sizes': {'upload': 25}}, settings_file)
+
+    compiler = PayloadCompiler(str(tmp_path / 'dry_run'))
+    compiler.add_chunked('lineage', LINEAGE_ENDPOINT, spooled_paths(tmp_path, 50),
+                         {'tuned': tuned, 'static': target(tmp_path, 'static.example.com')})
+    summary = compiler.report({})
+
+    assert {name: request_set['requests'] for name, request_set in summary.items()} == {'lineage_10': 5,
+                                                                                         'lineage_25': 2}
+    assert compiler.request_sets['lineage_10']['targets'] == ['static']
+    assert compiler.request_sets['lineage_25']['targets'] == ['tuned']
+
+
+def test_targets_sharing_a_chunk_size_share_the_request_set(tmp_path):
+    compiler = PayloadCompiler(str(tmp_path / 'dry_run'))
+    compiler.add_chunked('lineage', LINEAGE_ENDPOINT, spooled_paths(tmp_path, 15),
+                         {'prod': target(tmp_path, 'prod.example.com'),
+                          'qa': target(tmp_path, 'qa.example.com', features_autotune=True)})
+
+    assert list(compiler.request_sets) == ['lineage']
+    assert compiler.report({})['lineage']['requests'] == 2
@@ -0,0 +1,52 @@
+"""Tests of the parallel upload to several Alation targets."""
+
+from urllib.parse import parse_qs
+
+from src.configs import ParseConfigs
+from src.fanout import MultiTargetUploader
+
+REFRESH_TOKEN_PATH = '/integration/v1/createRefreshToken/'
+ACCESS_TOKEN_PATH = '/integration/v1/createAPIAccessToken/'
+LINEAGE_PATH = '/integration/v2/dataflow/'
+JOB_PATH = '/api/v1/bulk_metadata/job/'
+
+PAYLOAD = {'dataflow_objects': [{'external_id': 'api/T'}],
+           'paths': [[[{'otype': 'column', 'key': '1.S.a'}], [{'otype': 'dataflow', 'key': 'api/T'}],
+                      [{'otype': 'column', 'key': '1.T.a'}]]]}
+
+
+def refresh_token(headers, body) -> tuple:
+    username = parse_qs(body.decode())['username'][0]
+
+    if username == 'locked':
+        return 401, {'detail': 'Invalid credentials'}
+
+    return 201, {'refresh_token': f'refresh-{username}', 'user_id': 1, 'token_status': 'ACTIVE'}
+
+
+def test_failing_target_does_not_abort_the_others(tmp_path, monkeypatch, stub_alation, configs_ini):
+    # The refresh tokens and their encryption key are written relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'configs' / '.secrets').mkdir(parents=True)
+
+    stub_alation.route('POST', REFRESH_TOKEN_PATH, refresh_token)
+    stub_alation.respond('POST', ACCESS_TOKEN_PATH, 201, {'api_access_token': 'access', 'token_status': 'ACTIVE'})
+    stub_alation.respond('POST', LINEAGE_PATH, 202, {'job_id': 5})
+    stub_alation.respond('GET', JOB_PATH, 200, {'status': 'successful', 'msg': '', 'result': []})
+
+    target_configs = ParseConfigs().generate_target_configs(configs_ini(
+        {'Alation:prod': {'host': stub_alation.host, 'username': 'prod'},
+         'Alation:qa': {'host': stub_alation.host, 'username': 'locked'}}))
+
+    uploader = MultiTargetUploader(target_configs)
+    uploader.connect(resolve_custom_fields=False)
+    results = uploader.run(lambda alation_helper, alation_auth: alation_helper.upload_lineage(alation_auth,
+                                                                                             [PAYLOAD]))
+
+    assert results['prod']['status'] == 'SUCCESSFUL'
+    assert results['qa']['status'] == 'FAILED'
+    assert results['qa']['error']
+    assert (tmp_path / 'configs' / 'refresh_token_prod.txt').exists()
+    assert not (tmp_path / 'configs' / 'refresh_token_qa.txt').exists()
+    assert [request['path'] for request in stub_alation.requests if request['method'] == 'POST'].count(
+        LINEAGE_PATH) == 1
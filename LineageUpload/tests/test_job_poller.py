@@ -0,0 +1,58 @@
+"""Tests of the shared Alation Background Job poller against a stub Alation host."""
+
+from src.alation_rest import AlationRestAPI
+from src.job_poller import JobPoller
+from src.models.alation.auth import AlationAuth
+from src.models.alation.job import Job
+
+JOB_PATH = '/api/v1/bulk_metadata/job/'
+
+
+def auth(access_token: str) -> AlationAuth:
+    alation_auth = AlationAuth()
+    alation_auth.access_token = access_token
+
+    return alation_auth
+
+
+def test_unreadable_job_is_marked_failed(stub_alation, alation_configs):
+    stub_alation.respond('GET', JOB_PATH, 404, {'detail': 'Job not found'})
+    job_poller = JobPoller(AlationRestAPI(alation_configs), poll_interval=0, max_poll_interval=0,
+                           max_unknown_polls=3)
+    job = Job(7, object_type='LINEAGE')
+
+    job_poller.wait(auth('token'), job)
+
+    assert job.status == 'FAILED'
+    assert not job.success
+    assert len(stub_alation.requests) == 3
+
+
+def test_running_job_fails_at_its_deadline(stub_alation, alation_configs):
+    stub_alation.respond('GET', JOB_PATH, 200, {'status': 'RUNNING', 'msg': '', 'result': []})
+    job_poller = JobPoller(AlationRestAPI(alation_configs), poll_interval=0.01, max_poll_interval=0.01,
+                           job_timeout=0.2)
+    job = Job(8, object_type='LINEAGE')
+
+    job_poller.wait(auth('token'), job)
+
+    assert job.status == 'FAILED'
+    assert 'after 0.2 seconds' in job.message
+
+
+def test_polls_use_the_current_access_token(stub_alation, alation_configs):
+    alation_auth = auth('expired')
+    polled_tokens = []
+
+    def job_status(headers, body):
+        polled_tokens.append(headers['Token'])
+        alation_auth.access_token = 'fresh'
+        return 200, {'status': 'SUCCESSFUL' if len(polled_tokens) > 1 else 'RUNNING', 'msg': '', 'result': []}
+
+    stub_alation.route('GET', JOB_PATH, job_status)
+    job = Job(9, object_type='LINEAGE')
+
+    JobPoller(AlationRestAPI(alation_configs), poll_interval=0, max_poll_interval=0).wait(alation_auth, job)
+
+    assert job.success
+    assert polled_tokens == ['expired', 'fresh']
@@ -0,0 +1,81 @@
+"""Tests of the Alation Job result aggregation across re-submissions."""
+
+from src.models.alation.job import Job, JobResultAggregator
+from src.pipeline import merge_statistics
+
+
+def completed_job(job_id: int, status: str, payload: list, object_type: str = 'REPORT',
+                  result: list = None) -> Job:
+    return Job(job_id, {'status': status, 'msg': f'Job {job_id} {status}', 'result': result},
+               object_type=object_type, payload=payload)
+
+
+def test_resubmitted_objects_clear_their_failures():
+    job_results = JobResultAggregator()
+    reports = [{'external_id': 'r1'}, {'external_id': 'r2'}]
+
+    job_results.add(completed_job(1, 'PARTIAL', reports, result=[{'error_objects': [
+        {'external_id': 'r2', 'error': 'parent folder missing'}]}]))
+    assert job_results.failures['REPORT'] == [{'external_id': 'r2', 'error': 'parent folder missing'}]
+
+    job_results.add(completed_job(2, 'SUCCESSFUL', [reports[1]]))
+    assert job_results.failures['REPORT'] == []
+
+
+def test_failed_lineage_payload_is_resubmitted_whole():
+    job_results = JobResultAggregator()
+    payload = {'dataflow_objects': [], 'paths': [[[{'otype': 'column', 'key': 'a'}]]]}
+
+    failed_job = completed_job(1, 'FAILED', [payload], object_type='LINEAGE')
+    job_results.add(failed_job)
+    assert job_results.failed_objects(failed_job) == [payload]
+
+    job_results.add_failed_submission('LINEAGE', [dict(payload)], 'Lineage request failed')
+    job_results.add(completed_job(2, 'SUCCESSFUL', [dict(payload)], object_type='LINEAGE'))
+    assert job_results.failures['LINEAGE'] == []
+
+
+
+def test_successful_lineage_job_with_errors_is_failed_and_resubmitted():
+    job_results = JobResultAggregator()
+    payload = {'dataflow_objects': [], 'paths': [[[{'otype': 'column', 'key': 'a'}]]]}
+    errors = [{'error_objects': ['Column a not found', {'key': 'api/T', 'message': 'Dataflow rejected'}]}]
+
+    partial_job = completed_job(1, 'SUCCESSFUL', [payload], object_type='LINEAGE', result=errors)
+    job_results.add(partial_job)
+
+    assert job_results.failed_objects(partial_job) == [payload]
+    assert job_results.failed_count == 2
+    assert job_results.failures['LINEAGE'] == [{'external_id': None, 'error': 'Column a not found'},
+                                               {'external_id': 'api/T', 'error': 'Dataflow rejected'}]
+
+    # A failing resubmission replaces the failures of the first attempt
+    job_results.add(completed_job(2, 'SUCCESSFUL', [dict(payload)], object_type='LINEAGE',
+                                  result=[{'errors': ['Column a not found']}]))
+    assert job_results.failed_count == 1
+
+    job_results.add(completed_job(3, 'SUCCESSFUL', [dict(payload)], object_type='LINEAGE'))
+    assert job_results.failed_count == 0
+
+
+def test_unmatched_failures_of_a_partial_job_are_kept():
+    job_results = JobResultAggregator()
+    reports = [{'external_id': 'r1'}, {'external_id': 'r2'}]
+
+    partial_job = completed_job(1, 'PARTIAL', reports, result=[{'error_objects': [
+        {'external_id': 'r2', 'error': 'parent folder missing'}, {'external_id': 'f9', 'error': 'folder rejected'}]}])
+    job_results.add(partial_job)
+
+    assert job_results.failed_objects(partial_job) == [reports[1]]
+    assert job_results.failures['REPORT'] == [{'external_id': 'r2', 'error': 'parent folder missing'},
+                                              {'external_id': 'f9', 'error': 'folder rejected'}]
+
+    job_results.add(completed_job(2, 'SUCCESSFUL', [reports[1]]))
+    assert job_results.failed_count == 0
+
+
+def test_merge_statistics_sums_every_attempt():
+    merged = merge_statistics({'Create': {'processed': 4, 'errors': 1, 'busy_seconds': 0.5}},
+                              {'Create': {'processed': 1, 'errors': 0, 'busy_seconds': 0.25}})
+
+    assert merged == {'Create': {'processed': 5, 'errors': 1, 'busy_seconds': 0.75}}
@@ -0,0 +1,56 @@
+"""Tests of the JSON array response parsing."""
+
+import sys
+
+import pytest
+import requests
+
+from src import json_stream
+from src.alation_rest import AlationRestAPI
+
+
+def json_response(content: bytes) -> requests.Response:
+    api_response = requests.Response()
+    api_response.status_code = 200
+    api_response._content = content
+    api_response._content_consumed = True
+
+    return api_response
+
+
+def test_items_keep_only_the_requested_fields():
+    api_response = json_response(b'[{"id": 1, "external_id": "a", "name": "x"}, {"id": 2, "external_id": "b"}]')
+
+    assert list(json_stream.iter_json_array(api_response, ('id', 'external_id'))) == [
+        {'id': 1, 'external_id': 'a'}, {'id': 2, 'external_id': 'b'}]
+
+
+def test_items_are_parsed_across_body_chunks():
+    api_response = json_response(b'[{"id": 1, "title": "Tableau"}, {"id": 2, "title": "Power BI"}]')
+
+    assert list(json_stream.iter_json_array(api_response, ('id',), chunk_size=5)) == [{'id': 1}, {'id': 2}]
+
+
+def test_missing_ijson_fails_instead_of_buffering_the_body(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'ijson', None)
+
+    with pytest.raises(ImportError, match='requirements.txt'):
+        list(json_stream.iter_json_array(json_response(b'[1, 2]')))
+
+
+def test_bi_servers_are_streamed_from_the_host(stub_alation, alation_configs):
+    stub_alation.respond('GET', '/integration/v2/bi/server/', 200, [
+        {'id': 1, 'title': 'Lineage', 'uri': 'https://bi', 'external_id': None, 'last_updated': '2026-10-01'},
+        {'id': 2, 'title': 'Reports', 'uri': None, 'external_id': 'reports'}])
+
+    bi_servers = AlationRestAPI(alation_configs).api_query_bi_servers('token')
+
+    assert bi_servers == [{'id': 1, 'title': 'Lineage', 'uri': 'https://bi', 'external_id': None},
+                          {'id': 2, 'title': 'Reports', 'uri': None, 'external_id': 'reports'}]
+    assert stub_alation.requests[0]['headers']['Token'] == 'token'
+
+
+def test_failed_bi_server_query_returns_nothing(stub_alation, alation_configs):
+    stub_alation.respond('GET', '/integration/v2/bi/server/', 403, {'detail': 'Forbidden'})
+
+    assert AlationRestAPI(alation_configs).api_query_bi_servers('token') is None
@@ -0,0 +1,42 @@
+"""Tests of the lineage path compaction."""
+
+import pandas as pd
+
+from src.progress import ProgressReporter
+from src.spool import SpoolWriter
+from src.vds_parser import VDSParser
+
+
+def edges(*pairs: tuple) -> pd.DataFrame:
+    return pd.DataFrame(pairs, columns=['source_key', 'target_key'])
+
+
+def test_partitioned_compaction_yields_one_path_per_target_column():
+    pd_df_edges = edges(('schema_name.S.a', 'schema_name.T2.x'), ('schema_name.S.b', 'schema_name.T1.y'),
+                        ('schema_name.S.c', 'schema_name.T2.x'), ('schema_name.S.a', 'schema_name.T2.x'))
+
+    assert list(VDSParser({}).compact_lineage(pd_df_edges)) == [
+        [['schema_name.S.b'], 'api/T1', 'schema_name.T1.y'],
+        [['schema_name.S.a', 'schema_name.S.c'], 'api/T2', 'schema_name.T2.x']]
+
+
+def test_staging_hops_are_collapsed_across_target_tables():
+    pd_df_edges = edges(('schema_name.S.a', 'schema_name.STG_T.a'), ('schema_name.STG_T.a', 'schema_name.T.a'))
+
+    paths = list(VDSParser({'features_lineage_staging_patterns': ['^STG_']}).compact_lineage(pd_df_edges))
+
+    assert paths == [[['schema_name.S.a'], 'api/T', 'schema_name.T.a']]
+
+
+def test_parsed_paths_are_reported_while_spooling(tmp_path):
+    pd_df_mapfile_in = pd.DataFrame({"Object/Source Table Name": ['S'] * 5, "Source Field Name": list('abcde'),
+                                     "Target Database / Table Name": ['T'] * 5, "Target Field Name": list('abcde')})
+    progress = ProgressReporter()
+    reported = []
+    progress.increment = lambda stage, value=1: reported.append((stage, value))
+
+    with SpoolWriter(str(tmp_path / 'lineage')) as spool_writer:
+        spooled = VDSParser({}).spool_lineage_paths(pd_df_mapfile_in, spool_writer, progress, report_every=2)
+
+    assert spooled == 5
+    assert reported == [('parsed', 2), ('parsed', 2), ('parsed', 1)]
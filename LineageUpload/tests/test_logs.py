@@ -0,0 +1,43 @@
+"""Tests of the asynchronous JSON logging."""
+
+import io
+import json
+import logging
+import queue
+
+from src.logs import ExceptionQueueHandler, JsonFormatter, SamplingFilter
+
+
+def record(name: str, message: str, lineno: int = 1, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(name, level, f'/src/{name}.py', lineno, message, (), None)
+
+
+def test_sampling_only_applies_to_api_and_job_records():
+    sampling_filter = SamplingFilter(sample_rate=10)
+
+    api_records = [sampling_filter.filter(record('alation_rest', 'Successfully created lineage')) for _ in range(20)]
+    headers = [sampling_filter.filter(record('root', '===== Upload =====')) for _ in range(20)]
+
+    assert sum(api_records) == 2
+    assert all(headers)
+
+
+def test_exception_survives_the_queue():
+    log_queue = queue.SimpleQueue()
+    handler = ExceptionQueueHandler(log_queue)
+
+    try:
+        raise ValueError('boom')
+    except ValueError as error:
+        failed_record = record('root', 'upload failed', level=logging.ERROR)
+        failed_record.exc_info = (type(error), error, error.__traceback__)
+        handler.emit(failed_record)
+
+    stream = io.StringIO()
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JsonFormatter())
+    stream_handler.handle(log_queue.get())
+
+    document = json.loads(stream.getvalue())
+    assert document['message'] == 'upload failed'
+    assert 'ValueError: boom' in document['exception']
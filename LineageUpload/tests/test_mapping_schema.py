@@ -0,0 +1,76 @@
+"""Tests of the schema-driven mapping document loader."""
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from src.mapping_schema import MAPPING_COLUMNS, MappingDocumentLoader
+
+ROWS = [['DB.SALES', 'AMOUNT', 'NUMBER', '10', 'Y', 'STG.SALES', 'AMT', 'NUMBER', '10', 'ignored'],
+        ['DB.SALES', 'REGION', 'VARCHAR', '20', 'N', 'STG.SALES', 'REGION', 'VARCHAR', '20', 'ignored']]
+
+
+def write_workbook(file_location, header: list, rows: list, sheet_title: str = 'Mapping'):
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = sheet_title
+    worksheet.append(header)
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(file_location)
+
+
+def test_only_the_required_columns_are_loaded_with_their_dtypes(tmp_path):
+    file_location = tmp_path / 'mapping.xlsx'
+    write_workbook(file_location, list(MAPPING_COLUMNS) + ['Comments'], ROWS)
+
+    pd_df_mapfile_in = MappingDocumentLoader().load(str(file_location))
+
+    assert list(pd_df_mapfile_in.columns) == list(MAPPING_COLUMNS)
+    assert len(pd_df_mapfile_in) == 2
+    for column, dtype in MAPPING_COLUMNS.items():
+        if dtype == 'category':
+            assert isinstance(pd_df_mapfile_in[column].dtype, pd.CategoricalDtype), column
+        else:
+            assert not isinstance(pd_df_mapfile_in[column].dtype, pd.CategoricalDtype), column
+    assert list(pd_df_mapfile_in['Target Field Name']) == ['AMOUNT', 'REGION']
+    assert list(pd_df_mapfile_in['Target Database / Table Name'].cat.categories) == ['DB.SALES']
+
+
+def test_columns_are_found_by_name_in_any_order(tmp_path):
+    file_location = tmp_path / 'mapping.xlsx'
+    header = ['Comments'] + list(reversed(list(MAPPING_COLUMNS)))
+    write_workbook(file_location, header, [[row[-1]] + list(reversed(row[:-1])) for row in ROWS],
+                   sheet_title='Lineage')
+
+    pd_df_mapfile_in = MappingDocumentLoader().load(str(file_location), sheet_name='Lineage')
+
+    assert sorted(pd_df_mapfile_in.columns) == sorted(MAPPING_COLUMNS)
+    assert list(pd_df_mapfile_in['Source Field Name']) == ['AMT', 'REGION']
+
+
+def test_header_stops_at_the_filled_columns(tmp_path):
+    file_location = tmp_path / 'mapping.xlsx'
+    write_workbook(file_location, ['Target Field Name', None, 'Source Field Name'], [])
+
+    assert MappingDocumentLoader.read_header(str(file_location)) == ['Target Field Name', 'Source Field Name']
+
+
+def test_missing_required_columns_are_rejected(tmp_path):
+    file_location = tmp_path / 'mapping.xlsx'
+    write_workbook(file_location, [column for column in MAPPING_COLUMNS if column != 'Nullable'],
+                   [row[:4] + row[5:9] for row in ROWS])
+
+    with pytest.raises(ValueError, match='Nullable'):
+        MappingDocumentLoader().load(str(file_location))
+
+
+def test_custom_columns_replace_the_default_schema(tmp_path):
+    file_location = tmp_path / 'mapping.xlsx'
+    write_workbook(file_location, list(MAPPING_COLUMNS), [row[:9] for row in ROWS])
+
+    pd_df_mapfile_in = MappingDocumentLoader({'Nullable': 'category', 'Source Field Name': 'object'}).load(
+        str(file_location))
+
+    assert list(pd_df_mapfile_in.columns) == ['Nullable', 'Source Field Name']
+    assert isinstance(pd_df_mapfile_in['Nullable'].dtype, pd.CategoricalDtype)
@@ -0,0 +1,82 @@
+"""Tests of the registry of the GBMv2 object types."""
+
+import pytest
+
+from src.object_types import ObjectTypeRegistry
+
+BI_API_URL = 'https://alation.example.com/integration/v2/bi/server'
+
+
+class CountingName(str):
+    """Object type name counting how often it is upper cased."""
+
+    upper_calls = 0
+
+    def upper(self) -> str:
+        self.upper_calls += 1
+
+        return str.upper(self)
+
+
+class Report(object):
+
+    def __init__(self, external_id: str):
+        self._external_id = external_id
+
+    def external_id(self) -> str:
+        return self._external_id
+
+
+def test_alternate_spellings_resolve_to_the_registered_type():
+    registry = ObjectTypeRegistry(BI_API_URL, 7, batch_size=250)
+
+    report_field = registry.get('Report Field')
+
+    assert report_field is registry.get('REPORT FIELD') is registry.get('report field')
+    assert report_field.name == 'REPORT FIELD'
+    assert report_field.url == f'{BI_API_URL}/7/report/column/'
+    assert report_field.batch_size == 250
+    assert report_field.custom_field_otype == 'bi_report_column'
+
+
+def test_spellings_are_normalized_once():
+    registry = ObjectTypeRegistry(BI_API_URL, 7)
+    object_type = CountingName('Report')
+
+    for _ in range(3):
+        assert registry.get(object_type) is registry.get('REPORT')
+        assert registry.accepts(object_type)
+
+    assert object_type.upper_calls == 1
+
+
+def test_unknown_object_types_are_rejected():
+    registry = ObjectTypeRegistry(BI_API_URL, 7)
+
+    assert not registry.accepts('dashboard')
+    assert 'dashboard' not in registry._types
+    with pytest.raises(ValueError, match='Dashboard'):
+        registry.get('dashboard')
+
+
+def test_lookup_batches_fit_the_maximum_url_length():
+    registry = ObjectTypeRegistry(BI_API_URL, 7)
+    report_type = registry.get('REPORT')
+    reports = [Report(f'{index:036d}') for index in range(1000)]
+
+    batches = report_type.lookup_batches(reports)
+
+    assert [report for _, batch in batches for report in batch] == reports
+    assert all(len(lookup_url) <= 8192 for lookup_url, _ in batches)
+    assert len(batches) > 1
+    # Every batch but the last is filled up to the URL length
+    assert len(batches[0][0]) > 8192 - 37
+    assert batches[0][0].startswith(f'{report_type.url}?keyField=external_id&oids={reports[0].external_id()},')
+
+
+def test_long_external_ids_are_looked_up_one_by_one():
+    report_type = ObjectTypeRegistry(BI_API_URL, 7).get('REPORT')
+
+    batches = report_type.lookup_batches([Report('x' * 9000), Report('y' * 9000)])
+
+    assert [len(batch) for _, batch in batches] == [1, 1]
@@ -0,0 +1,15 @@
+"""Tests of the persistent Alation ID cache."""
+
+from src.oid_cache import OidCache
+
+
+def test_invalidated_oids_are_not_reloaded(tmp_path):
+    database_location = str(tmp_path / 'oid_cache.db')
+
+    oid_cache = OidCache(database_location, 'alation.example.com', 1)
+    oid_cache.put_many('report', {'r1': 10, 'r2': 20})
+    oid_cache.invalidate('REPORT', ['r2'])
+
+    reloaded_cache = OidCache(database_location, 'alation.example.com', 1)
+    assert reloaded_cache.get_many('REPORT', ['r1', 'r2']) == {'r1': 10}
+    assert (reloaded_cache.hits, reloaded_cache.misses) == (1, 1)
@@ -0,0 +1,45 @@
+"""Tests of the process-pool parser against the serial parser."""
+
+import filecmp
+
+import pandas as pd
+
+from benchmarks import synthetic_mapping_document
+from src.parallel_parser import ParallelVDSParser
+from src.vds_parser import VDSParser
+
+
+def parse(vds_parser, pd_df_mapfile_in, suffix: str) -> list:
+    """Write the target and source definitions and return the sorted lineage paths."""
+
+    vds_parser.output_filename = vds_parser.output_location(f'target_{suffix}')
+    vds_parser.parse_and_create_target(pd_df_mapfile_in)
+    vds_parser.output_filename = vds_parser.output_location(f'source_{suffix}')
+    vds_parser.parse_and_create_source(pd_df_mapfile_in)
+
+    return sorted(map(str, vds_parser.lineage_paths(pd_df_mapfile_in)))
+
+
+def test_parallel_parser_matches_serial_parser(tmp_path):
+    pd_df_mapfile_in = synthetic_mapping_document(300, tables=6)
+    # Repeated rows spread over several worker chunks must be removed once across all chunks
+    pd_df_mapfile_in = pd.concat([pd_df_mapfile_in, pd_df_mapfile_in.iloc[::7]], ignore_index=True)
+    configs = {'features_vds_output_directory': str(tmp_path)}
+
+    serial_parser = VDSParser(configs)
+    parallel_parser = ParallelVDSParser(configs, workers=2)
+
+    assert parse(parallel_parser, pd_df_mapfile_in, 'parallel') == parse(serial_parser, pd_df_mapfile_in, 'serial')
+
+    for name in ('target', 'source'):
+        serial_output = serial_parser.output_location(f'{name}_serial')
+        parallel_output = parallel_parser.output_location(f'{name}_parallel')
+
+        assert filecmp.cmp(serial_output, parallel_output, shallow=False), name
+        with open(parallel_output, 'r') as output_file:
+            rows = output_file.read().splitlines()
+        assert len(rows) == len(set(rows)), name
+
+
+def test_workers_are_not_forked():
+    assert ParallelVDSParser.process_context().get_start_method() in ('forkserver', 'spawn')
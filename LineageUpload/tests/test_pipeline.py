@@ -0,0 +1,148 @@
+"""Tests of the dependency-aware Upload Pipeline."""
+
+import threading
+import time
+
+import pytest
+
+from src.pipeline import UploadPipeline, merge_statistics
+
+
+def test_items_flow_downstream_through_several_workers():
+    received = []
+    lock = threading.Lock()
+
+    def collect(item):
+        with lock:
+            received.append(item)
+
+    pipeline = UploadPipeline(queue_size=2, workers=3)
+    pipeline.add_stage('double', lambda item: item * 2)
+    pipeline.add_stage('collect', collect, upstream='double', workers=4)
+
+    statistics = pipeline.run({'double': range(100)})
+
+    # Every worker of both stages saw the end of the stream, otherwise run() would not return
+    assert sorted(received) == [item * 2 for item in range(100)]
+    assert statistics['double']['processed'] == 100
+    assert statistics['collect']['processed'] == 100
+
+
+def test_none_results_are_not_passed_downstream():
+    received = []
+
+    pipeline = UploadPipeline()
+    pipeline.add_stage('filter', lambda item: item if item % 2 else None)
+    pipeline.add_stage('collect', received.append, upstream='filter')
+
+    pipeline.run({'filter': range(10)})
+
+    assert sorted(received) == [1, 3, 5, 7, 9]
+
+
+def test_stage_waits_for_its_dependencies():
+    order = []
+    lock = threading.Lock()
+
+    def record(name):
+        def handler(item):
+            time.sleep(0.01)
+            with lock:
+                order.append(name)
+
+        return handler
+
+    pipeline = UploadPipeline(workers=2)
+    pipeline.add_stage('folders', record('folders'))
+    pipeline.add_stage('reports', record('reports'), wait_for=['folders'])
+
+    pipeline.run({'folders': range(5), 'reports': range(5)})
+
+    assert order == ['folders'] * 5 + ['reports'] * 5
+
+
+def test_full_downstream_queue_applies_backpressure():
+    release = threading.Event()
+
+    def blocked(item):
+        release.wait(5)
+
+    pipeline = UploadPipeline(queue_size=1, workers=1)
+    upstream = pipeline.add_stage('upstream', lambda item: item)
+    pipeline.add_stage('downstream', blocked, upstream='upstream')
+
+    runner = threading.Thread(target=pipeline.run, args=({'upstream': range(50)},))
+    runner.start()
+    time.sleep(0.2)
+
+    # One item in the blocked handler, one in the full queue and one waiting to be put
+    assert upstream.processed <= 3
+    assert upstream.inbox.full()
+
+    release.set()
+    runner.join(5)
+
+    assert not runner.is_alive()
+    assert upstream.processed == 50
+
+
+def test_failing_items_are_counted_and_do_not_stop_the_pipeline():
+    received = []
+
+    def fail_on_odd(item):
+        if item % 2:
+            raise ValueError(f'odd item {item}')
+
+        return item
+
+    pipeline = UploadPipeline(workers=2)
+    pipeline.add_stage('validate', fail_on_odd)
+    pipeline.add_stage('collect', received.append, upstream='validate')
+
+    statistics = pipeline.run({'validate': range(10)})
+
+    assert statistics['validate']['processed'] == 5
+    assert statistics['validate']['errors'] == 5
+    assert all(isinstance(error, ValueError) for error in pipeline.stages['validate'].errors)
+    assert sorted(received) == [0, 2, 4, 6, 8]
+
+
+def test_failing_dependency_still_releases_waiting_stages():
+    received = []
+
+    def fail(item):
+        raise RuntimeError('create failed')
+
+    pipeline = UploadPipeline()
+    pipeline.add_stage('folders', fail)
+    pipeline.add_stage('reports', received.append, wait_for=['folders'])
+
+    statistics = pipeline.run({'folders': range(3), 'reports': range(3)})
+
+    assert statistics['folders']['errors'] == 3
+    assert received == [0, 1, 2]
+
+
+def test_invalid_stages_are_rejected():
+    pipeline = UploadPipeline()
+    pipeline.add_stage('create', lambda item: item)
+
+    with pytest.raises(ValueError):
+        pipeline.add_stage('create', print)
+    with pytest.raises(ValueError):
+        pipeline.add_stage('status', print, upstream='missing')
+    with pytest.raises(ValueError):
+        pipeline.add_stage('status', print, wait_for=['missing'])
+
+    pipeline.add_stage('status', print, upstream='create')
+    with pytest.raises(ValueError):
+        pipeline.run({'status': []})
+
+
+def test_merge_statistics_sums_every_stage():
+    merged = merge_statistics({'create': {'processed': 2, 'errors': 1, 'busy_seconds': 0.5}},
+                              {'create': {'processed': 1, 'errors': 0, 'busy_seconds': 0.25},
+                               'status': {'processed': 1, 'errors': 0, 'busy_seconds': 0.1}})
+
+    assert merged == {'create': {'processed': 3, 'errors': 1, 'busy_seconds': 0.75},
+                      'status': {'processed': 1, 'errors': 0, 'busy_seconds': 0.1}}
@@ -0,0 +1,62 @@
+"""Tests of the pre-flight connection probe against a stub Alation host."""
+
+from concurrent.futures import Future
+from pathlib import Path
+
+from src.alation_helpers import AlationHelpers
+from src.fanout import MultiTargetUploader
+from src.metrics import RunMetrics
+from src.models.alation.auth import AlationAuth
+from src.probe import ConnectionProbe
+
+
+def stub_probed_endpoints(stub_alation):
+    stub_alation.respond('GET', '/api/v1/bulk_metadata/job/', 404, {'detail': 'Not found'})
+    stub_alation.respond('GET', '/integration/v2/custom_field/', 200, [])
+    stub_alation.respond('GET', '/integration/v2/bi/server/', 200, [])
+
+
+def test_probe_measures_every_endpoint(stub_alation, alation_configs):
+    stub_probed_endpoints(stub_alation)
+
+    alation_auth = AlationAuth()
+    alation_auth.access_token = 'token'
+    probe = ConnectionProbe(AlationHelpers(alation_configs), samples=3)
+
+    results = probe.run(alation_auth)
+
+    assert results['job']['status_codes'] == {404: 3}
+    assert results['custom_field']['status_codes'] == {200: 3}
+    assert results['bi/server']['p50'] > 0
+    assert results['throughput']['throttled'] == 0
+    assert all(request['headers']['Token'] == 'token' for request in stub_alation.requests)
+
+    recommendations = probe.recommend(results)
+    assert 1 <= recommendations['Features']['pipeline_workers'] <= alation_configs['alation_pool_size']
+
+
+def test_probe_leaves_the_saved_metrics_unchanged(tmp_path, stub_alation, alation_configs):
+    stub_probed_endpoints(stub_alation)
+    configs = {**alation_configs, 'features_autotune': True, 'features_autotune_directory': str(tmp_path / 'autotune'),
+               'features_upload_request_size': 500, 'features_download_json_request_size': 1000}
+
+    alation_helper = AlationHelpers(configs)
+    alation_helper.metrics.record_request('POST /integration/v2/dataflow/', 1.5, 202)
+    alation_helper.metrics.save()
+    alation_helper.autotune.save()
+    saved_files = {location: Path(location).read_text()
+                   for location in (alation_helper.metrics.file_location, alation_helper.autotune.settings_location)}
+
+    alation_auth = AlationAuth()
+    alation_auth.access_token = 'token'
+    session = Future()
+    session.set_result((AlationHelpers(configs), alation_auth))
+    uploader = MultiTargetUploader({'stub': configs})
+    uploader.sessions = {'stub': session}
+
+    results = uploader.run(lambda helper, auth: ConnectionProbe(helper, samples=3).run(auth), save_metrics=False)
+
+    assert results['stub']['status'] == 'SUCCESSFUL'
+    assert {location: Path(location).read_text() for location in saved_files} == saved_files
+    assert list(RunMetrics(alation_helper.metrics.file_location).load().endpoints) == [
+        'POST /integration/v2/dataflow/']
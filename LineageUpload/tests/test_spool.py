@@ -0,0 +1,89 @@
+"""Tests of the on-disk NDJSON spool."""
+
+import json
+import os
+
+from src.spool import SpooledPayloads, SpoolReader, SpoolWriter
+
+RECORDS = [{'path': record, 'name': f'table_{record}'} for record in range(100)]
+
+
+def write_spool(directory: str, segment_bytes: int = 64 * 1024 * 1024) -> SpoolWriter:
+    with SpoolWriter(directory, segment_bytes) as spool_writer:
+        spool_writer.write_many(RECORDS)
+
+    return spool_writer
+
+
+def test_segments_roll_over_and_are_listed_in_the_manifest(tmp_path):
+    line_bytes = len(json.dumps(RECORDS[0])) + 1
+    spool_writer = write_spool(str(tmp_path), segment_bytes=line_bytes * 10)
+
+    with open(tmp_path / 'manifest.json', 'r') as manifest_file:
+        manifest = json.load(manifest_file)
+
+    assert manifest == {'records': 100, 'segments': spool_writer.segments}
+    assert len(manifest['segments']) > 1
+    assert sorted(os.listdir(tmp_path)) == sorted(manifest['segments'] + ['manifest.json'])
+    assert all(os.path.getsize(tmp_path / segment) <= line_bytes * 10 + 2 for segment in manifest['segments'])
+
+
+def test_records_are_read_back_across_segments(tmp_path):
+    write_spool(str(tmp_path), segment_bytes=100)
+
+    spool_reader = SpoolReader(str(tmp_path))
+
+    assert len(spool_reader) == 100
+    assert list(spool_reader) == RECORDS
+
+
+def test_existing_segments_are_replaced(tmp_path):
+    write_spool(str(tmp_path), segment_bytes=100)
+
+    with SpoolWriter(str(tmp_path)) as spool_writer:
+        spool_writer.write({'path': 'only'})
+
+    assert list(SpoolReader(str(tmp_path))) == [{'path': 'only'}]
+    assert sorted(os.listdir(tmp_path)) == ['manifest.json', 'segment_00000.ndjson']
+
+
+def test_empty_spool_has_no_records(tmp_path):
+    with SpoolWriter(str(tmp_path)):
+        pass
+
+    assert list(SpoolReader(str(tmp_path))) == []
+    assert list(SpoolReader(str(tmp_path)).chunks(10)) == []
+
+
+def test_chunk_size_function_is_called_for_every_chunk(tmp_path):
+    write_spool(str(tmp_path), segment_bytes=100)
+    chunk_sizes = iter([10, 20, 30, 40, 50])
+
+    chunks = list(SpoolReader(str(tmp_path)).chunks(lambda: next(chunk_sizes)))
+
+    assert [len(chunk) for chunk in chunks] == [10, 20, 30, 40]
+    assert [record for chunk in chunks for record in chunk] == RECORDS
+
+
+def test_spooled_payloads_can_be_iterated_again(tmp_path):
+    write_spool(str(tmp_path), segment_bytes=100)
+    payloads = SpooledPayloads(SpoolReader(str(tmp_path)), 30, lambda chunk: {'paths': chunk})
+
+    first_pass = list(payloads)
+
+    assert len(payloads) == 4
+    assert payloads.records == 100
+    assert [len(payload['paths']) for payload in first_pass] == [30, 30, 30, 10]
+    assert list(payloads) == first_pass
+
+
+def test_spooled_payloads_with_another_chunk_size_share_the_spool(tmp_path):
+    write_spool(str(tmp_path), segment_bytes=100)
+    payloads = SpooledPayloads(SpoolReader(str(tmp_path)), 30, lambda chunk: {'paths': chunk})
+
+    resized_payloads = payloads.with_chunk_size(lambda: 50)
+
+    assert resized_payloads.reader is payloads.reader
+    assert len(resized_payloads) == 2
+    assert [len(payload['paths']) for payload in resized_payloads] == [50, 50]
+    assert len(list(payloads)) == 4
@@ -0,0 +1,57 @@
+"""Regression tests of the CLI start-up imports."""
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous budget of the cumulative import time of main.py, it imports in about 10 ms without
+# pandas, requests and cryptography and in several hundred milliseconds with them
+IMPORT_BUDGET_MS = 250
+
+
+def run_python(*arguments: str) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter from the project directory.
+
+    Args:
+        *arguments (str): Arguments passed to the interpreter.
+
+    Returns:
+        subprocess.CompletedProcess: Completed interpreter process.
+
+    """
+    return subprocess.run([sys.executable, *arguments], cwd=PROJECT_DIRECTORY,
+                          capture_output=True, text=True, check=True)
+
+
+@pytest.mark.parametrize('module', ['main', 'src.vds_parser', 'src.configs', 'src.logs'])
+def test_import_does_not_load_heavy_modules(module):
+    process = run_python('-c', f'import sys, {module}; '
+                               f'print(",".join(name for name in ("pandas", "requests", "cryptography") '
+                               f'if name in sys.modules))')
+
+    assert process.stdout.strip() == ''
+
+
+def test_help_runs_without_heavy_modules():
+    process = run_python('-X', 'importtime', 'main.py', '--help')
+
+    assert 'usage:' in process.stdout
+    imported = {line.rsplit('|', 1)[-1].strip() for line in process.stderr.splitlines()
+                if line.startswith('import time:')}
+    assert not imported & {'pandas', 'requests', 'cryptography'}
+
+
+def test_import_time_of_main_is_within_budget():
+    process = run_python('-X', 'importtime', '-c', 'import main')
+
+    # import time: self [us] | cumulative | imported package (indented when nested)
+    imports = {match.group(2).strip(): int(match.group(1))
+               for match in re.finditer(r'import time:\s+\d+ \|\s+(\d+) \|(.*)', process.stderr)}
+
+    assert not imports.keys() & {'pandas', 'requests', 'cryptography'}
+    assert imports['main'] / 1000 < IMPORT_BUDGET_MS
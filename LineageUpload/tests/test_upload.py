@@ -0,0 +1,94 @@
+"""Tests of the lineage upload to a stub Alation host."""
+
+from concurrent.futures import Future
+
+from src.alation_helpers import AlationHelpers
+from src.daemon import DropFolderDaemon
+from src.fanout import MultiTargetUploader
+from src.models.alation.auth import AlationAuth
+
+LINEAGE_PATH = '/integration/v2/dataflow/'
+JOB_PATH = '/api/v1/bulk_metadata/job/'
+ACCESS_TOKEN_PATH = '/integration/v1/createAPIAccessToken/'
+
+PAYLOAD = {'dataflow_objects': [{'external_id': 'api/T'}],
+           'paths': [[[{'otype': 'column', 'key': '1.S.a'}], [{'otype': 'dataflow', 'key': 'api/T'}],
+                      [{'otype': 'column', 'key': '1.T.a'}]]]}
+
+
+def connected_helper(alation_configs: dict) -> tuple:
+    alation_helper = AlationHelpers(alation_configs)
+    alation_auth = AlationAuth()
+    alation_auth.access_token = 'expired'
+    alation_auth.refresh_token = 'refresh'
+    alation_helper.alation_auth = alation_auth
+
+    return alation_helper, alation_auth
+
+
+def test_expired_token_is_renewed_and_the_payload_uploaded(stub_alation, alation_configs):
+    stub_alation.respond('POST', ACCESS_TOKEN_PATH, 201, {'api_access_token': 'fresh', 'token_status': 'ACTIVE'})
+    stub_alation.route('POST', LINEAGE_PATH, lambda headers, body: (
+        (202, {'job_id': 5}) if headers['Token'] == 'fresh' else (401, {'detail': 'Token expired'})))
+    stub_alation.respond('GET', JOB_PATH, 200, {'status': 'successful', 'msg': '', 'result': []})
+
+    alation_helper, alation_auth = connected_helper(alation_configs)
+    alation_helper.upload_lineage(alation_auth, [PAYLOAD])
+
+    assert alation_auth.access_token == 'fresh'
+    assert alation_helper.job_results.failed_count == 0
+    assert [request['path'] for request in stub_alation.requests if request['method'] == 'POST'] == [
+        LINEAGE_PATH, ACCESS_TOKEN_PATH, LINEAGE_PATH]
+
+
+def test_rejected_payloads_fail_the_target(stub_alation, alation_configs):
+    stub_alation.respond('POST', ACCESS_TOKEN_PATH, 401, {'detail': 'Refresh token expired'})
+    stub_alation.respond('POST', LINEAGE_PATH, 401, {'detail': 'Token expired'})
+
+    session = connected_helper(alation_configs)
+    progress = session[0].progress
+    uploader = MultiTargetUploader({'stub': alation_configs})
+    uploader.sessions = {'stub': _done(session)}
+
+    results = uploader.run(lambda alation_helper, alation_auth: alation_helper.upload_lineage(alation_auth,
+                                                                                             [PAYLOAD]))
+
+    assert results['stub']['status'] == 'FAILED'
+    assert results['stub']['error'] == '1 objects or lineage payloads failed to upload'
+    assert progress.counts['submitted'] == 0
+    assert progress.counts['submit_failed'] == 2 * len(PAYLOAD['paths'])
+
+
+
+def test_lineage_errors_of_a_successful_job_are_resubmitted(stub_alation, alation_configs):
+    job_statuses = iter([{'status': 'successful', 'msg': '', 'result': [{'errors': ['Column 1.S.a not found']}]},
+                         {'status': 'successful', 'msg': '', 'result': []}])
+    job_ids = iter([5, 6])
+    stub_alation.route('POST', LINEAGE_PATH, lambda headers, body: (202, {'job_id': next(job_ids)}))
+    stub_alation.route('GET', JOB_PATH, lambda headers, body: (200, next(job_statuses)))
+
+    alation_helper, alation_auth = connected_helper(alation_configs)
+    alation_auth.access_token = 'fresh'
+    alation_helper.upload_lineage(alation_auth, [PAYLOAD])
+
+    assert [request['path'] for request in stub_alation.requests if request['method'] == 'POST'] == [
+        LINEAGE_PATH, LINEAGE_PATH]
+    assert alation_helper.job_results.failed_count == 0
+
+
+def test_workbooks_with_the_same_name_are_kept(tmp_path):
+    daemon = DropFolderDaemon(str(tmp_path), lambda file_location: True)
+    (tmp_path / 'processing').mkdir()
+
+    for content in ('first', 'second'):
+        (tmp_path / 'mapping.xlsx').write_text(content)
+        daemon._enqueue(str(tmp_path / 'mapping.xlsx'))
+
+    assert sorted(path.read_text() for path in (tmp_path / 'processing').iterdir()) == ['first', 'second']
+
+
+def _done(result) -> Future:
+    future = Future()
+    future.set_result(result)
+
+    return future
@@ -0,0 +1,37 @@
+"""Tests of the mapping document validation severities."""
+
+import pandas as pd
+
+from src.validation import MappingValidator
+
+
+def mapping_document(*rows: tuple) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["Target Database / Table Name", "Target Field Name", "Data Type Conformity",
+                                       "Data Length", "Nullable", "Object/Source Table Name", "Source Field Name",
+                                       "Source Data Type", "Source Field Length"])
+
+
+def rules(report: pd.DataFrame) -> set:
+    return set(zip(report['rule'], report['severity']))
+
+
+def test_warnings_do_not_fail_validation():
+    pd_df_mapfile_in = mapping_document(
+        ('DB/T', 'AMOUNT', 'NUMBER', '', 'Y', 'DB/S', 'AMOUNT', 'NUMBER', ''),
+        ('DB/T', 'AMOUNT', 'NUMBER', '', 'Y', 'DB/S', 'AMOUNT', 'NUMBER', ''),
+        ('DB/T', 'NOTE', 'VARCHAR', 'MAX', 'Y', '', '', '', ''))
+
+    report = MappingValidator().validate(pd_df_mapfile_in)
+
+    assert rules(report) == {('missing_length', 'warning'), ('duplicate_mapping', 'warning'),
+                             ('unbounded_length', 'warning'), ('dangling_lineage_endpoint', 'warning')}
+    assert MappingValidator().validate_and_report(pd_df_mapfile_in)
+
+
+def test_errors_fail_validation():
+    pd_df_mapfile_in = mapping_document(('DB/T', 'NAME', 'VARCHAR', '', 'MAYBE', 'DB/S', 'NAME', 'VARCHAR', '10'))
+
+    report = MappingValidator().validate(pd_df_mapfile_in)
+
+    assert rules(report) == {('missing_length', 'error'), ('malformed_nullable', 'error')}
+    assert not MappingValidator().validate_and_report(pd_df_mapfile_in)
@@ -0,0 +1,39 @@
+"""Tests of the VDS definition output."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.vds_parser import VDSParser, read_vds_definitions
+
+
+@pytest.fixture
+def vds_parser(tmp_path):
+    vds_parser = VDSParser({'features_vds_output_directory': str(tmp_path), 'features_vds_output_format': 'parquet'})
+    vds_parser.output_filename = vds_parser.output_location('target_output')
+
+    return vds_parser
+
+
+def test_partitioned_output_replaces_previous_run(vds_parser):
+    vds_parser.partition_output = True
+    vds_parser.write_output(pd.DataFrame({'name': ['a', 'b']}), ['DB/OLD', 'DB/TABLE'])
+    vds_parser.write_output(pd.DataFrame({'name': ['c']}), ['DB/TABLE'])
+
+    assert os.listdir(vds_parser.output_filename) == ['table_name=DB%2FTABLE']
+    assert read_vds_definitions(vds_parser.output_filename).to_pydict() == {'name': ['c'],
+                                                                            'table_name': ['DB/TABLE']}
+
+
+def test_output_switches_between_file_and_partitions(vds_parser):
+    pd_df_out = pd.DataFrame({'name': ['a']})
+
+    vds_parser.write_output(pd_df_out, ['TABLE'])
+    vds_parser.partition_output = True
+    vds_parser.write_output(pd_df_out, ['TABLE'])
+    assert os.path.isdir(vds_parser.output_filename)
+
+    vds_parser.partition_output = False
+    vds_parser.write_output(pd_df_out, ['TABLE'])
+    assert os.path.isfile(vds_parser.output_filename)